@@ -6,6 +6,8 @@ import json
 import os
 from threading import Lock
 
+from cdu120kw.config.json_loader import load_json_file
+
 
 class Config:
     """
@@ -47,9 +49,7 @@ class Config:
         从json文件加载配置
         """
         if os.path.exists(self._config_path):
-            with open(self._config_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self._config.update(data)
+            self._config.update(load_json_file(self._config_path))
 
     def save(self):
         """
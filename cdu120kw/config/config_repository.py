@@ -3,11 +3,12 @@
 """
 
 
-import json
 import os
 import threading
 from typing import Dict, Any, List, Optional, Tuple
 
+from cdu120kw.config.json_loader import load_json_file
+
 def _pick_range_from_config(cfg: dict, key: str) -> Tuple[Optional[int], Optional[int]]:
     """
     从配置提取当前写入字段的范围(min, max)，支持多种常见命名。
@@ -141,8 +142,7 @@ class ConfigRepository:
 
     def __init__(self, abs_path: str):
         self.path = abs_path
-        with open(self.path, "r", encoding="utf-8-sig") as f:
-            self._raw = json.load(f)
+        self._raw = load_json_file(self.path)
         self.tasks: List[Dict[str, Any]] = list(self._raw.get("tasks", []))
         self.low_frequency_tasks: List[Dict[str, Any]] = list(self._raw.get("low_frequency_tasks", []))
         self.component_params = ComponentTaskParamManager(self._raw)
@@ -0,0 +1,20 @@
+"""
+JSON配置文件读取工具
+"""
+
+import json
+
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def load_json_file(path: str):
+    """
+    一次性读入整个文件再解析，兼容带 BOM 的 UTF-8 文件（与 utf-8-sig 编码读取结果一致）
+    :param path: 配置文件路径
+    :return: 解析后的对象
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data.startswith(_UTF8_BOM):
+        data = data[len(_UTF8_BOM):]
+    return json.loads(data)
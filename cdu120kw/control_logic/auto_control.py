@@ -11,7 +11,7 @@ from cdu120kw.control_logic.device_data_manipulation import (
     CONTROL_MODE_TARGET_TEMP_REGISTER, CONTROL_MODE_TARGET_PRESSUREDIFF_REGISTER,
     FLOW_VALUE_START, TEMP_VALUE_START, PRESS_DIFF_START,
     batch_write_pump_duty, batch_write_pv_duty, COIL_WRITE_ENABLE, CONFIG_CACHE, PUMP_CURRENT_START,
-    PUMP_DUTY_READ_START, PUMP_SPEED_START
+    PUMP_DUTY_READ_START, PUMP_SPEED_START, auto_control_write
 )
 from cdu120kw.control_logic.pid_helper import PidHelper
 
@@ -358,7 +358,8 @@ class AutoControlManager:
             else:
                 # print("[AutoControl] INFO: Pump duty <= 5% - setting minimum duty cycle (5%)")
                 # 批量写入所有水泵最低占空比
-                success = batch_write_pump_duty(1000, force=True)  # 1000 = 10%
+                with auto_control_write():
+                    success = batch_write_pump_duty(1000, force=True)  # 1000 = 10%
                 if success:
                     with self._pump_startup_lock:
                         self._pump_startup_state = "starting"
@@ -627,7 +628,8 @@ class AutoControlManager:
                 print(f"[AutoControl] DEBUG: Skip pump duty write - stop requested")
                 return
 
-            success = batch_write_pump_duty(duty * 100, force=False)
+            with auto_control_write():
+                success = batch_write_pump_duty(duty * 100, force=False)
 
         except Exception as e:
             print(f"[AutoControl] ERROR: Apply pump duty error: {e}")
@@ -642,7 +644,8 @@ class AutoControlManager:
                 print(f"[AutoControl] DEBUG: Skip PV duty write - stop requested")
                 return
 
-            success = batch_write_pv_duty(duty * 100, force=False)
+            with auto_control_write():
+                success = batch_write_pv_duty(duty * 100, force=False)
 
         except Exception as e:
             print(f"[AutoControl] ERROR: Apply PV duty error: {e}")
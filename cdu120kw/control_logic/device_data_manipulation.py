@@ -2,28 +2,66 @@
 处理原始寄存器数据，进行状态判定和数据转换，所有参数均从配置文件读取
 """
 
-import inspect
+import array
+import logging
 import os
 import threading
 import time
+from bisect import bisect_right
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Dict, Any, Optional
 
 from cdu120kw.config.config_repository import ConfigRepository
 
+logger = logging.getLogger(__name__)
+
 # 基于当前文件位置构造绝对路径，保证在任意工作目录下都能找到配置
 _BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 _CONFIG_PATH = os.path.normpath(os.path.join(_BASE_DIR, "..", "config/cdu_120kw_component.json"))
 
 # 使用集中式仓库加载
-CONFIG_CACHE = ConfigRepository.load(_CONFIG_PATH).to_dict()
+_CONFIG_REPO = ConfigRepository.load(_CONFIG_PATH)
+CONFIG_CACHE = _CONFIG_REPO.to_dict()
+
+# 各类设备数量，配置加载后固定不变，避免热路径重复取列表长度
+_FAN_COUNT = len(CONFIG_CACHE.get("fans", []))
+_PUMP_COUNT = len(CONFIG_CACHE.get("pumps", []))
+_PV_COUNT = len(CONFIG_CACHE.get("proportional_valve", []))
+_OUTPUT_COUNT = len(CONFIG_CACHE.get("output", []))
+
+
+def _resolve_write_fields(kind_key: str, write_type: str) -> list:
+    """
+    配置加载时为每个组件解析一次可写字段，写入路径直接按索引取用
+    Returns:
+        list: [(组件名, 第一个 write_type 类型的可写字段名或None), ...]
+    """
+    resolved = []
+    for item in CONFIG_CACHE.get(kind_key, []):
+        name = item.get("name")
+        param = _CONFIG_REPO.component_params.get_param(name) if name else None
+        field = None
+        if param:
+            field = next((k for k, v in param.writable_fields.items() if v[0] == write_type), None)
+        resolved.append((name, field))
+    return resolved
+
+
+# 各组件可写字段（风扇/IO输出为线圈，水泵/比例阀为保持寄存器）
+_FAN_WRITE_FIELDS = _resolve_write_fields("fans", "coil")
+_PUMP_WRITE_FIELDS = _resolve_write_fields("pumps", "register")
+_PV_WRITE_FIELDS = _resolve_write_fields("proportional_valve", "register")
+_OUTPUT_WRITE_FIELDS = _resolve_write_fields("output", "coil")
 
 # 增加同步线程启动保护标志
 _sync_thread_started = False
 _sync_thread_lock = threading.Lock()
 
-# 风扇停机定时器
-_fan_shutdown_timer: Optional[threading.Timer] = None
-_fan_shutdown_timer_lock = threading.Lock()
+# 风扇延迟停机调度：单个常驻线程 + 条件变量，截止时间为None表示没有待执行的停机
+_fan_shutdown_deadline: Optional[float] = None
+_fan_shutdown_cond = threading.Condition()
+_fan_shutdown_thread: Optional[threading.Thread] = None
 
 # 初始化时同步所有写入寄存器的值，为其增加标志和锁
 _first_sync_flag = False  # 第一次同步标志
@@ -32,6 +70,23 @@ _first_sync_lock = threading.Lock()  # 第一次同步锁
 # 防止重入标志
 _we_guard = threading.local()
 
+
+class _BatchWriteGuard(threading.local):
+    """批量写入重入保护标志（线程局部），类属性提供各线程的默认值"""
+    in_pump_batch = False
+    in_pv_batch = False
+    in_io_batch = False
+
+
+_batch_guard = _BatchWriteGuard()
+
+# 写入使能缓存：订阅写入使能线圈的值变化（含不触发回调的写入和 reset），
+# 并在 apply_write_enable_effect 中同步更新，写入路径的使能判定只需比较整数
+_WRITE_ENABLE_CACHED = 0
+
+# 自动控制写入标记：由自动控制模块在其写入期间置位，HMI写入回调据此放行自动模式下的水泵写入
+_AUTO_CONTROL_WRITE: ContextVar[bool] = ContextVar("auto_control_write", default=False)
+
 # 用于记录各类设备故障状态的持续时间
 _fault_time = {
     "fan": {},
@@ -41,6 +96,11 @@ _fault_time = {
 }
 
 
+# 处理后寄存器表容量：线圈 0-378，保持寄存器 0-65535
+COIL_COUNT = 379
+REGISTER_COUNT = 65536
+
+
 # 线圈区（Coils）读写规划 - 基于排他性结束地址计算（END表示范围的下一个地址）
 
 # 写入使能线圈：0（单个线圈）
@@ -240,6 +300,13 @@ ENVIRONMENT_STATUS_START = ENVIRONMENT_VALUE_END     # 起始地址：1152
 ENVIRONMENT_STATUS_END = ENVIRONMENT_STATUS_START + 16  # 结束地址：1168（排他性，实际范围1144-1167）
 
 
+class _BulkUpdateState(threading.local):
+    """bulk_update 的线程局部状态：嵌套深度与延迟分发的 (地址, 值) 列表"""
+    depth = 0
+    coils = None
+    registers = None
+
+
 class ProcessedRegisterMap:
     """
     存储处理后数据的寄存器表，分为线圈(coils)和保持寄存器(registers)
@@ -248,13 +315,13 @@ class ProcessedRegisterMap:
     def __init__(self):
         """
         初始化寄存器映射表
-        线圈范围：0-379，保持寄存器范围：0-65535
+        线圈范围：0-378，保持寄存器范围：0-65535
         """
-        # 线圈初始化：使用字典推导式预初始化 0-379
-        self.coils = {c: 0 for c in range(0, 379)}
+        # 线圈初始化：连续字节数组存储 0-378，每个地址一个字节（0/1）
+        self.coils = bytearray(COIL_COUNT)
 
-        # 保持寄存器初始化：使用字典推导式预初始化 0-65535，避免动态添加地址导致KeyError
-        self.registers = {r: 0 for r in range(0, 65536)}
+        # 保持寄存器初始化：U16 连续数组存储 0-65535，按下标直接访问，无需哈希
+        self.registers = array.array("H", bytes(2 * REGISTER_COUNT))
 
         # 设置目标值寄存器初始值
         self.registers[CONTROL_MODE] = 1                             # 控制模式初始值 1 (手动模式)
@@ -267,9 +334,19 @@ class ProcessedRegisterMap:
         for i in range(pv_count):
             self.registers[PV_DUTY_WRITE_START + i] = 10000
 
+        # 批量操作锁，保证区间拷贝等批量操作的原子性
+        self._lock = threading.RLock()
+
         # 回调函数列表初始化
         self._write_coil_callbacks = []
         self._write_register_callbacks = []
+        # 批量写入回调：bulk_update 结束时以 cb(addresses, values) 一次性送达，存在时取代逐地址回调
+        self._write_bulk_callbacks = []
+        self._bulk_state = _BulkUpdateState()
+
+        # 按地址订阅的变化通知：{地址: [cb(address, value), ...]}，值发生变化时触发
+        self._coil_subscribers = {}
+        self._register_subscribers = {}
 
         # 定义所有需要初始化的寄存器范围组，便于统一管理和扩展
         self._register_range_groups = [
@@ -397,21 +474,96 @@ class ProcessedRegisterMap:
             trigger_callback: 是否触发回调（默认为True）
         """
         # 检查地址是否在有效范围内
-        if address not in self.coils:
+        if not 0 <= address < COIL_COUNT:
             return
 
         # 设置线圈值，确保值为0或1
-        self.coils[address] = 1 if value else 0
+        new_val = 1 if value else 0
+        old_val = self.coils[address]
+        self.coils[address] = new_val
+
+        # 值变化时通知该地址的订阅者
+        if new_val != old_val and self._coil_subscribers:
+            self._notify_subscribers(self._coil_subscribers, address, new_val)
 
         # 如果没有回调函数或地址不在写入范围内，直接返回
         if not trigger_callback or not self._write_coil_callbacks or (not force and not self._in_ranges(address, self._coil_write_ranges)):
             return
 
-        # 获取设置后的值并触发所有回调函数
+        # 获取设置后的值并触发所有回调函数（bulk_update 期间暂存，退出时统一分发）
         val = self.coils[address]
+        bulk = self._bulk_state
+        if bulk.depth:
+            bulk.coils.append((address, val))
+            return
         for cb in self._write_coil_callbacks:
             cb(address, val)
 
+    def set_coils(self, addresses, values, force=False, trigger_callback=True):
+        """
+        批量设置多个（不要求连续）线圈值：加锁一次写入存储，再统一通知订阅者并触发回调
+        Args:
+            addresses: 线圈地址序列
+            values: 与地址一一对应的值序列（非0即1）
+            force: 是否强制触发回调，忽略写入范围检查（默认为False）
+            trigger_callback: 是否触发回调（默认为True）
+        """
+        coils = self.coils
+        with self._lock:
+            pairs = [(a, 1 if v else 0) for a, v in zip(addresses, values) if 0 <= a < COIL_COUNT]
+            old_vals = [coils[a] for a, _ in pairs]
+            for a, v in pairs:
+                coils[a] = v
+        self._dispatch_coil_writes(pairs, old_vals, force, trigger_callback)
+
+    def set_coils_range(self, address: int, count: int, value: int, force=False, trigger_callback=True):
+        """
+        将一段连续线圈统一设置为同一值：一次切片写入存储，再统一通知订阅者并触发回调
+        Args:
+            address: 起始地址
+            count: 线圈数量
+            value: 要设置的值（0或1）
+            force: 是否强制触发回调，忽略写入范围检查（默认为False）
+            trigger_callback: 是否触发回调（默认为True）
+        """
+        if address < 0:
+            return
+        count = min(count, COIL_COUNT - address)
+        if count <= 0:
+            return
+
+        val = 1 if value else 0
+        coils = self.coils
+        with self._lock:
+            old_vals = list(coils[address:address + count])
+            coils[address:address + count] = bytes((val,)) * count
+        self._dispatch_coil_writes([(a, val) for a in range(address, address + count)], old_vals, force, trigger_callback)
+
+    def _dispatch_coil_writes(self, pairs, old_vals, force, trigger_callback):
+        """
+        批量线圈写入后的统一分发：值变化的地址通知订阅者，写入范围内（或强制）的地址触发回调
+        """
+        subscribers = self._coil_subscribers
+        if subscribers:
+            for (addr, val), old_val in zip(pairs, old_vals):
+                if val != old_val and addr in subscribers:
+                    self._notify_subscribers(subscribers, addr, val)
+
+        if not trigger_callback or not self._write_coil_callbacks:
+            return
+
+        ranges = self._coil_write_ranges
+        writes = [(addr, val) for addr, val in pairs if force or self._in_ranges(addr, ranges)]
+        bulk = self._bulk_state
+        if bulk.depth:
+            bulk.coils.extend(writes)
+            return
+
+        callbacks = tuple(self._write_coil_callbacks)
+        for addr, val in writes:
+            for cb in callbacks:
+                cb(addr, val)
+
     def set_register(self, address: int, value: int, trigger_callback=True):
         """
         设置寄存器值，如果地址在写入范围内且存在回调函数，则触发回调
@@ -421,21 +573,77 @@ class ProcessedRegisterMap:
             trigger_callback: 是否触发回调（默认为True）
         """
         # 检查地址是否在有效范围内
-        if address not in self.registers:
+        if not 0 <= address < REGISTER_COUNT:
             return
 
-        # 直接写入，统一转换为整数
-        self.registers[address] = int(value)
+        # 直接写入，统一转换为U16
+        new_val = int(value) & 0xFFFF
+        old_val = self.registers[address]
+        self.registers[address] = new_val
+
+        # 值变化时通知该地址的订阅者
+        if new_val != old_val and self._register_subscribers:
+            self._notify_subscribers(self._register_subscribers, address, new_val)
 
         # 如果没有回调函数或地址不在写入范围内，直接返回
         if not trigger_callback or not self._write_register_callbacks or not self._in_ranges(address, self._register_write_ranges):
             return
 
-        # 获取设置后的值并触发所有回调函数
+        # 获取设置后的值并触发所有回调函数（bulk_update 期间暂存，退出时统一分发）
         val = self.registers[address]
+        bulk = self._bulk_state
+        if bulk.depth:
+            bulk.registers.append((address, val))
+            return
         for cb in self._write_register_callbacks:
             cb(address, val)
 
+    def set_registers(self, address: int, values, trigger_callback=True):
+        """
+        批量设置连续寄存器值：一次切片写入存储，再统一对写入范围内的地址触发回调
+        Args:
+            address: 起始地址
+            values: 要设置的值序列，也可直接传入 array('H')
+            trigger_callback: 是否触发回调（默认为True）
+        """
+        if address < 0:
+            return
+        count = min(len(values), REGISTER_COUNT - address)
+        if count <= 0:
+            return
+
+        regs = self.registers
+        subscribers = self._register_subscribers
+        with self._lock:
+            # 仅对区间内被订阅的地址记录旧值，用于写入后的变化通知
+            watched = [(a, regs[a]) for a in subscribers if address <= a < address + count] if subscribers else None
+            if isinstance(values, array.array) and values.typecode == "H":
+                # 已是 U16 数组（如 HMI 批量写入）时直接切片拷贝，无需逐个转换
+                regs[address:address + count] = values[:count]
+            else:
+                regs[address:address + count] = array.array("H", [int(v) & 0xFFFF for v in values[:count]])
+
+        if watched:
+            for addr, old_val in watched:
+                if regs[addr] != old_val:
+                    self._notify_subscribers(subscribers, addr, regs[addr])
+
+        if not trigger_callback or not self._write_register_callbacks:
+            return
+
+        # 统一回调分发（bulk_update 期间暂存，退出时统一分发）
+        ranges = self._register_write_ranges
+        writes = [(addr, regs[addr]) for addr in range(address, address + count) if self._in_ranges(addr, ranges)]
+        bulk = self._bulk_state
+        if bulk.depth:
+            bulk.registers.extend(writes)
+            return
+
+        callbacks = tuple(self._write_register_callbacks)
+        for addr, val in writes:
+            for cb in callbacks:
+                cb(addr, val)
+
     def write_coil_callback(self, cb):
         """
         添加线圈写入回调函数
@@ -454,6 +662,91 @@ class ProcessedRegisterMap:
         """
         self._write_register_callbacks.append(cb)
 
+    def write_bulk_callback(self, cb):
+        """
+        添加批量写入回调函数，bulk_update 结束时以一次调用送达期间累积的写入
+        （线圈与寄存器分别调用一次）；注册后 bulk_update 内的写入不再逐地址触发普通回调
+
+        Args:
+            cb: 回调函数，格式为 cb(addresses, values)
+        """
+        self._write_bulk_callbacks.append(cb)
+
+    @contextmanager
+    def bulk_update(self):
+        """
+        批量更新上下文：
+        - 期间只获取一次锁，内部 set_* 调用的锁为可重入获取
+        - 写入范围内的回调延迟到最外层退出时分发：有批量回调时一次性调用批量回调，
+          否则退回逐地址调用普通回调
+        - 支持嵌套，仅最外层退出时分发
+        """
+        bulk = self._bulk_state
+        outermost = bulk.depth == 0
+        if outermost:
+            bulk.coils = []
+            bulk.registers = []
+        bulk.depth += 1
+        try:
+            with self._lock:
+                yield self
+        finally:
+            bulk.depth -= 1
+            if outermost:
+                coils, registers = bulk.coils, bulk.registers
+                bulk.coils = bulk.registers = None
+                self._flush_bulk_writes(coils, self._write_coil_callbacks)
+                self._flush_bulk_writes(registers, self._write_register_callbacks)
+
+    def _flush_bulk_writes(self, writes, callbacks):
+        """
+        分发 bulk_update 期间累积的写入
+        """
+        if not writes:
+            return
+        bulk_callbacks = tuple(self._write_bulk_callbacks)
+        if bulk_callbacks:
+            addresses = [addr for addr, _ in writes]
+            values = [val for _, val in writes]
+            for cb in bulk_callbacks:
+                cb(addresses, values)
+            return
+        callbacks = tuple(callbacks)
+        for addr, val in writes:
+            for cb in callbacks:
+                cb(addr, val)
+
+    def subscribe_coil(self, address: int, cb):
+        """
+        订阅单个线圈的值变化（与写入范围和 trigger_callback 无关）
+
+        Args:
+            address: 线圈地址
+            cb: 回调函数，格式为 cb(address, value)，仅在值发生变化时调用
+        """
+        self._coil_subscribers.setdefault(address, []).append(cb)
+
+    def subscribe_register(self, address: int, cb):
+        """
+        订阅单个寄存器的值变化（与写入范围和 trigger_callback 无关）
+
+        Args:
+            address: 寄存器地址
+            cb: 回调函数，格式为 cb(address, value)，仅在值发生变化时调用
+        """
+        self._register_subscribers.setdefault(address, []).append(cb)
+
+    @staticmethod
+    def _notify_subscribers(subscribers: dict, address: int, value: int):
+        """
+        通知指定地址的订阅者，单个订阅者异常不影响写入与其他订阅者
+        """
+        for cb in subscribers.get(address, ()):
+            try:
+                cb(address, value)
+            except Exception:
+                logger.exception("Subscriber callback failed at address %s", address)
+
     def get_coil(self, address: int) -> int:
         """
         获取单个线圈的值
@@ -464,7 +757,7 @@ class ProcessedRegisterMap:
         Returns:
             int: 线圈值，如果地址不存在则返回0
         """
-        return self.coils.get(address, 0)
+        return self.coils[address] if 0 <= address < COIL_COUNT else 0
 
     def get_register(self, address: int) -> int:
         """
@@ -476,7 +769,7 @@ class ProcessedRegisterMap:
         Returns:
             int: 寄存器值，如果地址不存在则返回0
         """
-        return self.registers.get(address, 0)
+        return self.registers[address] if 0 <= address < REGISTER_COUNT else 0
 
     def get_coils(self, address: int, count: int) -> list:
         """
@@ -489,7 +782,7 @@ class ProcessedRegisterMap:
         Returns:
             list: 线圈值列表
         """
-        return [self.coils.get(a, 0) for a in range(address, address + count)]
+        return self._read_range(self.coils, address, count)
 
     def get_registers(self, address: int, count: int) -> list:
         """
@@ -502,19 +795,94 @@ class ProcessedRegisterMap:
         Returns:
             list: 寄存器值列表
         """
-        return [self.registers.get(a, 0) for a in range(address, address + count)]
+        # 常见情况整段在范围内：array 切片后 tolist() 在 C 层一次完成转换
+        if 0 <= address and 0 < count and address + count <= REGISTER_COUNT:
+            return self.registers[address:address + count].tolist()
+        return self._read_range(self.registers, address, count)
+
+    def get_registers_at(self, addresses) -> list:
+        """
+        一次获取多个任意（不要求连续）地址的寄存器值
+
+        Args:
+            addresses: 寄存器地址序列
+
+        Returns:
+            list: 与地址顺序一致的寄存器值列表，地址不存在的返回0
+        """
+        regs = self.registers
+        return [regs[a] if 0 <= a < REGISTER_COUNT else 0 for a in addresses]
+
+    @staticmethod
+    def _read_range(store, address: int, count: int) -> list:
+        """
+        按切片读取连续地址，超出存储范围的部分补0
+        """
+        if count <= 0:
+            return []
+        size = len(store)
+        if 0 <= address and address + count <= size:
+            return list(store[address:address + count])
+        return [store[a] if 0 <= a < size else 0 for a in range(address, address + count)]
+
+    def copy_register_range(self, src: int, dst: int, count: int):
+        """
+        将一段连续寄存器整体拷贝到另一段地址（不触发回调）
+
+        Args:
+            src: 源起始地址
+            dst: 目标起始地址
+            count: 拷贝数量
+        """
+        if src < 0 or dst < 0:
+            return
+        # 源、目标区间都截断到存储范围内，避免切片长度不一致导致存储被扩容或缩短
+        count = min(count, REGISTER_COUNT - src, REGISTER_COUNT - dst)
+        if count <= 0:
+            return
+        regs = self.registers
+        with self._lock:
+            regs[dst:dst + count] = regs[src:src + count]
+
+    def copy_coil_range(self, src: int, dst: int, count: int):
+        """
+        将一段连续线圈整体拷贝到另一段地址（不触发回调）
+
+        Args:
+            src: 源起始地址
+            dst: 目标起始地址
+            count: 拷贝数量
+        """
+        if src < 0 or dst < 0:
+            return
+        # 源、目标区间都截断到存储范围内，避免切片长度不一致导致存储被扩容或缩短
+        count = min(count, COIL_COUNT - src, COIL_COUNT - dst)
+        if count <= 0:
+            return
+        coils = self.coils
+        with self._lock:
+            coils[dst:dst + count] = coils[src:src + count]
 
     def reset(self):
         """
-        重置所有线圈和寄存器值为0
+        重置所有线圈和寄存器值为0，并通知值发生变化的订阅者
         """
-        # 重置所有线圈值为0
-        for k in self.coils:
-            self.coils[k] = 0
+        coils, regs = self.coils, self.registers
+        with self._lock:
+            # 记录被订阅且当前非0的地址，清零后这些地址的值发生变化
+            changed_coils = [a for a in self._coil_subscribers if 0 <= a < COIL_COUNT and coils[a]]
+            changed_regs = [a for a in self._register_subscribers if 0 <= a < REGISTER_COUNT and regs[a]]
+
+            # 重置所有线圈值为0
+            coils[:] = bytes(COIL_COUNT)
+
+            # 重置所有寄存器值为0
+            regs[:] = array.array("H", bytes(2 * REGISTER_COUNT))
 
-        # 重置所有寄存器值为0
-        for k in self.registers:
-            self.registers[k] = 0
+        for addr in changed_coils:
+            self._notify_subscribers(self._coil_subscribers, addr, 0)
+        for addr in changed_regs:
+            self._notify_subscribers(self._register_subscribers, addr, 0)
 
 # 全局处理后寄存器表实例，供外部访问
 processed_reg_map = ProcessedRegisterMap()
@@ -523,13 +891,21 @@ def to_u16(val):
     """负数转U16输出，两补码，正数不变"""
     return (val + 0x10000) & 0xFFFF if val < 0 else val
 
+# 以下 process_*_state 函数每个轮询周期都会按设备数量调用，
+# 通过仅限关键字的默认参数（_prm/_to_u16/_ft/_time）将常用全局对象绑定为局部变量，调用方无需传入
+
 # 风扇状态处理函数
 def process_fan_state(
         fan_cfg: dict,
         registers: dict,
         coils: dict,
         fan_index: int,
-        now=None):
+        now=None,
+        *,
+        _prm=processed_reg_map,
+        _to_u16=to_u16,
+        _ft=_fault_time["fan"],
+        _time=time.time):
     """
     风扇状态处理
     - 开关读取：线圈 COIL_FAN_SWITCH_READ_START + idx
@@ -543,7 +919,7 @@ def process_fan_state(
     - 故障判定保留 8 秒延迟确认机制。
     """
     if now is None:
-        now = time.time()
+        now = _time()
     status_coil_addr = COIL_FAN_SWITCH_READ_START + fan_index
     status_val = coils.get(status_coil_addr, 0)
 
@@ -573,25 +949,26 @@ def process_fan_state(
     if status_val == 1:
         if current > 100:
             state = 1
-            _fault_time["fan"][key] = 0
+            _ft[key] = 0
         else:
-            if _fault_time["fan"].get(key, 0) == 0:
-                _fault_time["fan"][key] = now
-            elif now - _fault_time["fan"][key] >= 8:
+            fault_start = _ft.get(key, 0)
+            if fault_start == 0:
+                _ft[key] = now
+            elif now - fault_start >= 8:
                 state = 2
             else:
                 state = 0
     else:
         state = 0
-        _fault_time["fan"][key] = 0
+        _ft[key] = 0
 
     # 写入到新地址分段
-    u16_current = to_u16(current)
-    processed_reg_map.set_coil(status_coil_addr, status_val)
-    processed_reg_map.set_register(FAN_DUTY_READ_START + fan_index, duty_cycle)
-    processed_reg_map.set_register(FAN_CURRENT_START + fan_index, u16_current)
-    processed_reg_map.set_register(FAN_SPEED_START + fan_index, speed)
-    processed_reg_map.set_register(FAN_STATUS_START + fan_index, state)
+    u16_current = _to_u16(current)
+    _prm.set_coil(status_coil_addr, status_val)
+    _prm.set_register(FAN_DUTY_READ_START + fan_index, duty_cycle)
+    _prm.set_register(FAN_CURRENT_START + fan_index, u16_current)
+    _prm.set_register(FAN_SPEED_START + fan_index, speed)
+    _prm.set_register(FAN_STATUS_START + fan_index, state)
 
     return {
         "status": status_val,
@@ -607,7 +984,12 @@ def process_pump_state(
         registers: dict,
         coils: dict,
         pump_index: int,
-        now=None):
+        now=None,
+        *,
+        _prm=processed_reg_map,
+        _to_u16=to_u16,
+        _ft=_fault_time["pump"],
+        _time=time.time):
     """
     水泵状态处理
     - 开关读取：线圈 COIL_PUMP_SWITCH_READ_START + idx
@@ -621,7 +1003,7 @@ def process_pump_state(
     - 故障判定保留 8 秒延迟确认机制。
     """
     if now is None:
-        now = time.time()
+        now = _time()
     name = pump_cfg.get("name", f"Pump{pump_index+1}")
 
     # 读取“开关”线圈（外部\*读\*区），仅用于状态判定与回显
@@ -663,27 +1045,28 @@ def process_pump_state(
     if switch_on == 1 and duty_cycle >= int(min_duty):
         if current >= 100:
             state = 1
-            _fault_time["pump"][key] = 0
+            _ft[key] = 0
         else:
-            if _fault_time["pump"].get(key, 0) == 0:
-                _fault_time["pump"][key] = now
-            elif now - _fault_time["pump"][key] >= 8:
+            fault_start = _ft.get(key, 0)
+            if fault_start == 0:
+                _ft[key] = now
+            elif now - fault_start >= 8:
                 state = 2
             else:
                 state = 0
     else:
         state = 0
-        _fault_time["pump"][key] = 0
+        _ft[key] = 0
 
     # 写入到新地址分段
-    u16_current = to_u16(current)
-    processed_reg_map.set_coil(coil_addr, switch_on)
-    processed_reg_map.set_register(PUMP_DUTY_READ_START + pump_index, int(duty_cycle * 100))
-    processed_reg_map.set_register(PUMP_CURRENT_START + pump_index, int(u16_current))
-    processed_reg_map.set_register(PUMP_SPEED_START + pump_index, int(speed))
-    processed_reg_map.set_register(PUMP_STATUS_START + pump_index, int(state))
-    processed_reg_map.set_register(PUMP_VOLTAGE_START + pump_index, int(voltage * 100))
-    processed_reg_map.set_register(PUMP_TEMPERATURE_START + pump_index, int(temperature * 10))
+    u16_current = _to_u16(current)
+    _prm.set_coil(coil_addr, switch_on)
+    _prm.set_register(PUMP_DUTY_READ_START + pump_index, int(duty_cycle * 100))
+    _prm.set_register(PUMP_CURRENT_START + pump_index, int(u16_current))
+    _prm.set_register(PUMP_SPEED_START + pump_index, int(speed))
+    _prm.set_register(PUMP_STATUS_START + pump_index, int(state))
+    _prm.set_register(PUMP_VOLTAGE_START + pump_index, int(voltage * 100))
+    _prm.set_register(PUMP_TEMPERATURE_START + pump_index, int(temperature * 10))
 
     return {
         "name": name,
@@ -702,6 +1085,11 @@ def process_proportional_valve_state(
     registers: dict,
     pv_index: int,
     now: Optional[float] = None,
+    *,
+    _prm=processed_reg_map,
+    _to_u16=to_u16,
+    _ft=_fault_time["pv"],
+    _time=time.time,
 ) -> Dict[str, Any]:
     """
     比例阀状态处理（地址已切换到新规划）:
@@ -714,7 +1102,7 @@ def process_proportional_valve_state(
     - 状态判定带 8 秒延时确认机制。
     """
     if now is None:
-        now = time.time()
+        now = _time()
     name = pv_cfg.get("name", f"Pv{pv_index+1}")
 
     # 占空比（U16）
@@ -737,9 +1125,10 @@ def process_proportional_valve_state(
     if voltage < 1990:
         # 电压明显偏低：若 duty 已经较高，持续低电压才判故障
         if duty_cycle >= 2000:
-            if _fault_time["pv"].get(key, 0) == 0:
-                _fault_time["pv"][key] = now
-            elif now - _fault_time["pv"][key] >= 12:
+            fault_start = _ft.get(key, 0)
+            if fault_start == 0:
+                _ft[key] = now
+            elif now - fault_start >= 12:
                 state = 2
             else:
                 state = 0
@@ -747,18 +1136,18 @@ def process_proportional_valve_state(
             state = 0
     elif duty_cycle < 2000 and 1990 <= voltage < 2050:
         state = 0
-        _fault_time["pv"][key] = 0
+        _ft[key] = 0
     elif duty_cycle >= 2000 and voltage >= 2050:
         state = 1
-        _fault_time["pv"][key] = 0
+        _ft[key] = 0
     else:
         state = 0
-        _fault_time["pv"][key] = 0
+        _ft[key] = 0
 
     # 写入“处理后寄存器映射”的新地址区间
-    processed_reg_map.set_register(PV_DUTY_READ_START + pv_index, int(duty_cycle))
-    processed_reg_map.set_register(PV_VOLTAGE_START + pv_index, int(voltage))
-    processed_reg_map.set_register(PV_STATUS_START + pv_index, int(state))
+    _prm.set_register(PV_DUTY_READ_START + pv_index, int(duty_cycle))
+    _prm.set_register(PV_VOLTAGE_START + pv_index, int(voltage))
+    _prm.set_register(PV_STATUS_START + pv_index, int(state))
 
     return {
         "name": name,
@@ -768,7 +1157,9 @@ def process_proportional_valve_state(
     }
 
 # 温度传感器状态处理
-def process_temperature_state(sensor_cfg, registers, sensor_index, now=None):
+def process_temperature_state(sensor_cfg, registers, sensor_index, now=None,
+                              *, _prm=processed_reg_map, _to_u16=to_u16,
+                              _ft=_fault_time["sensor"], _time=time.time):
     """
     温度处理:
     - 温度值区: TEMP_VALUE_START + idx
@@ -776,7 +1167,7 @@ def process_temperature_state(sensor_cfg, registers, sensor_index, now=None):
     - 状态区: TEMP_STATUS_START + idx
     """
     if now is None:
-        now = time.time()
+        now = _time()
     raw_addr = sensor_cfg.get("r_d_temperature_address", {}).get("local")
     raw_val = registers.get(raw_addr, 0)
 
@@ -797,30 +1188,33 @@ def process_temperature_state(sensor_cfg, registers, sensor_index, now=None):
     key = f"T_{sensor_index}"
     state = 1
     if calc_val > 2000 or calc_val < -1000:
-        if _fault_time["sensor"].get(key, 0) == 0:
-            _fault_time["sensor"][key] = now
-        elif now - _fault_time["sensor"][key] >= 8:
+        fault_start = _ft.get(key, 0)
+        if fault_start == 0:
+            _ft[key] = now
+        elif now - fault_start >= 8:
             state = 0
     elif calc_val < min_v:
-        if _fault_time["sensor"].get(key, 0) == 0:
-            _fault_time["sensor"][key] = now
-        elif now - _fault_time["sensor"][key] >= 8:
+        fault_start = _ft.get(key, 0)
+        if fault_start == 0:
+            _ft[key] = now
+        elif now - fault_start >= 8:
             state = 2
     # 此处温度值为保留一位小数值的温度，因此需要缩放10倍
     elif calc_val > (max_v * 10**decimals):
-        if _fault_time["sensor"].get(key, 0) == 0:
-            _fault_time["sensor"][key] = now
-        elif now - _fault_time["sensor"][key] >= 8:
+        fault_start = _ft.get(key, 0)
+        if fault_start == 0:
+            _ft[key] = now
+        elif now - fault_start >= 8:
             state = 3
     else:
         state = 1
-        _fault_time["sensor"][key] = 0
+        _ft[key] = 0
 
     # 写入“处理后寄存器映射”的新地址区间
-    u16_calc_val_int = to_u16(calc_val_int)
-    processed_reg_map.set_register(TEMP_VALUE_START + sensor_index, u16_calc_val_int)
-    processed_reg_map.set_register(TEMP_DIFF_START + sensor_index, 0)
-    processed_reg_map.set_register(TEMP_STATUS_START + sensor_index, state)
+    u16_calc_val_int = _to_u16(calc_val_int)
+    _prm.set_register(TEMP_VALUE_START + sensor_index, u16_calc_val_int)
+    _prm.set_register(TEMP_DIFF_START + sensor_index, 0)
+    _prm.set_register(TEMP_STATUS_START + sensor_index, state)
 
     # print(f"Temp Sensor {sensor_index}: Raw={raw_val}, Calc={calc_val:.2f}, State={state}")
 
@@ -830,7 +1224,9 @@ def process_temperature_state(sensor_cfg, registers, sensor_index, now=None):
     }
 
 # 压力传感器状态处理
-def process_pressure_state(sensor_cfg, registers, sensor_index, now=None):
+def process_pressure_state(sensor_cfg, registers, sensor_index, now=None,
+                           *, _prm=processed_reg_map, _to_u16=to_u16,
+                           _ft=_fault_time["sensor"], _time=time.time):
     """
     压力传感器处理:
     - 数值（S16，建议按配置小数位缩放写入）-> PRESS_VALUE_START + idx
@@ -840,7 +1236,7 @@ def process_pressure_state(sensor_cfg, registers, sensor_index, now=None):
     故障延时：8 秒
     """
     if now is None:
-        now = time.time()
+        now = _time()
     name = sensor_cfg.get("name", f"P{sensor_index+1}")
     addr = sensor_cfg.get("r_d_pressure_address", {}).get("local")
     decimals = int(sensor_cfg.get("r_d_pressure_decimals", 2))  # 小数位，仅用于缩放
@@ -865,34 +1261,37 @@ def process_pressure_state(sensor_cfg, registers, sensor_index, now=None):
     key = f"P_{sensor_index}"
     if calc_val_int < -50:
         # 近零判为可能断线/故障，需 8s 确认
-        if _fault_time["sensor"].get(key, 0) == 0:
-            _fault_time["sensor"][key] = now
-        elif now - _fault_time["sensor"][key] >= 8:
+        fault_start = _ft.get(key, 0)
+        if fault_start == 0:
+            _ft[key] = now
+        elif now - fault_start >= 8:
             state = 0
         else:
             state = 1
     elif calc_val_int < min_v:
-        if _fault_time["sensor"].get(key, 0) == 0:
-            _fault_time["sensor"][key] = now
-        elif now - _fault_time["sensor"][key] >= 8:
+        fault_start = _ft.get(key, 0)
+        if fault_start == 0:
+            _ft[key] = now
+        elif now - fault_start >= 8:
             state = 2
         else:
             state = 1
     elif calc_val_int > (max_v * 10**decimals):
-        if _fault_time["sensor"].get(key, 0) == 0:
-            _fault_time["sensor"][key] = now
-        elif now - _fault_time["sensor"][key] >= 8:
+        fault_start = _ft.get(key, 0)
+        if fault_start == 0:
+            _ft[key] = now
+        elif now - fault_start >= 8:
             state = 3
         else:
             state = 1
     else:
         state = 1
-        _fault_time["sensor"][key] = 0
+        _ft[key] = 0
 
     # 写入“处理后寄存器映射”的新地址区间
-    u16_calc_val_int = to_u16(calc_val_int)
-    processed_reg_map.set_register(PRESS_VALUE_START + sensor_index, int(u16_calc_val_int))
-    processed_reg_map.set_register(PRESS_STATUS_START + sensor_index, int(state))
+    u16_calc_val_int = _to_u16(calc_val_int)
+    _prm.set_register(PRESS_VALUE_START + sensor_index, int(u16_calc_val_int))
+    _prm.set_register(PRESS_STATUS_START + sensor_index, int(state))
 
     # print(f"Pressure Sensor {sensor_index}: Raw={raw_val}, Calc={calc_val:.2f}, State={state}")
 
@@ -903,7 +1302,9 @@ def process_pressure_state(sensor_cfg, registers, sensor_index, now=None):
     }
 
 # 流量传感器状态处理
-def process_flow_state(sensor_cfg, registers, sensor_index, now=None):
+def process_flow_state(sensor_cfg, registers, sensor_index, now=None,
+                       *, _prm=processed_reg_map, _to_u16=to_u16,
+                       _ft=_fault_time["sensor"], _time=time.time):
     """
     流量传感器处理
     - 数值（S16，按配置小数位缩放写入）-> FLOW_VALUE_START + idx
@@ -912,7 +1313,7 @@ def process_flow_state(sensor_cfg, registers, sensor_index, now=None):
     故障延时：8 秒
     """
     if now is None:
-        now = time.time()
+        now = _time()
     name = sensor_cfg.get("name", f"F{sensor_index+1}")
     addr = sensor_cfg.get("r_d_flow_address", {}).get("local")
     decimals = int(sensor_cfg.get("r_d_flow_decimals", 1))  # 缩放小数位
@@ -936,34 +1337,37 @@ def process_flow_state(sensor_cfg, registers, sensor_index, now=None):
     state = 1
     key = f"F_{sensor_index}"
     if calc_val < -20:
-        if _fault_time["sensor"].get(key, 0) == 0:
-            _fault_time["sensor"][key] = now
-        elif now - _fault_time["sensor"][key] >= 8:
+        fault_start = _ft.get(key, 0)
+        if fault_start == 0:
+            _ft[key] = now
+        elif now - fault_start >= 8:
             state = 0
         else:
             state = 1
     elif calc_val < min_v:
-        if _fault_time["sensor"].get(key, 0) == 0:
-            _fault_time["sensor"][key] = now
-        elif now - _fault_time["sensor"][key] >= 8:
+        fault_start = _ft.get(key, 0)
+        if fault_start == 0:
+            _ft[key] = now
+        elif now - fault_start >= 8:
             state = 2
         else:
             state = 1
     elif calc_val > max_v:
-        if _fault_time["sensor"].get(key, 0) == 0:
-            _fault_time["sensor"][key] = now
-        elif now - _fault_time["sensor"][key] >= 8:
+        fault_start = _ft.get(key, 0)
+        if fault_start == 0:
+            _ft[key] = now
+        elif now - fault_start >= 8:
             state = 3
         else:
             state = 1
     else:
         state = 1
-        _fault_time["sensor"][key] = 0
+        _ft[key] = 0
 
     # 写入“处理后寄存器映射”的新地址区间
-    u16_calc_val_int = to_u16(calc_val_int)
-    processed_reg_map.set_register(FLOW_VALUE_START + sensor_index, int(u16_calc_val_int))
-    processed_reg_map.set_register(FLOW_STATUS_START + sensor_index, int(state))
+    u16_calc_val_int = _to_u16(calc_val_int)
+    _prm.set_register(FLOW_VALUE_START + sensor_index, int(u16_calc_val_int))
+    _prm.set_register(FLOW_STATUS_START + sensor_index, int(state))
 
     # print(f"Flow Sensor {sensor_index}: Raw={raw_val}, Calc={calc_val:.2f}, State={state}")
 
@@ -974,7 +1378,9 @@ def process_flow_state(sensor_cfg, registers, sensor_index, now=None):
     }
 
 # PH 传感器状态处理
-def process_ph_state(sensor_cfg: dict, registers: dict, sensor_index: int, now: float = None):
+def process_ph_state(sensor_cfg: dict, registers: dict, sensor_index: int, now: float = None,
+                     *, _prm=processed_reg_map, _to_u16=to_u16,
+                     _ft=_fault_time["sensor"], _time=time.time):
     """
     PH 传感器处理:
     - 数值（S16，按配置小数位缩放写入）-> PH_VALUE_START + idx
@@ -982,7 +1388,7 @@ def process_ph_state(sensor_cfg: dict, registers: dict, sensor_index: int, now:
     状态定义：0=异常，1=正常（边界值正常）
     """
     if now is None:
-        now = time.time()
+        now = _time()
 
     # 读取配置参数
     addr = sensor_cfg.get("r_d_ph_address", {}).get("local")
@@ -1011,20 +1417,21 @@ def process_ph_state(sensor_cfg: dict, registers: dict, sensor_index: int, now:
     key = f"PH_{sensor_index}"
     state = 1
     if calc_val < min_v or calc_val > max_v:
-        if _fault_time["sensor"].get(key, 0) == 0:
-            _fault_time["sensor"][key] = now
-        elif now - _fault_time["sensor"][key] >= 8:
+        fault_start = _ft.get(key, 0)
+        if fault_start == 0:
+            _ft[key] = now
+        elif now - fault_start >= 8:
             state = 0
         else:
             state = 1
     else:
         state = 1
-        _fault_time["sensor"][key] = 0
+        _ft[key] = 0
 
     # 写入处理后寄存器
-    u16_calc_val_int = to_u16(calc_val_int)
-    processed_reg_map.set_register(PH_VALUE_START + sensor_index, u16_calc_val_int)
-    processed_reg_map.set_register(PH_STATUS_START + sensor_index, state)
+    u16_calc_val_int = _to_u16(calc_val_int)
+    _prm.set_register(PH_VALUE_START + sensor_index, u16_calc_val_int)
+    _prm.set_register(PH_STATUS_START + sensor_index, state)
 
     # print(f"PH Sensor {sensor_index}: Raw={raw_val}, Calc={calc_val:.2f}, State={state}")
 
@@ -1035,7 +1442,9 @@ def process_ph_state(sensor_cfg: dict, registers: dict, sensor_index: int, now:
     }
 
 # 环境传感器状态处理
-def process_environment_state(sensor_cfg, registers, sensor_index, now=None):
+def process_environment_state(sensor_cfg, registers, sensor_index, now=None,
+                              *, _prm=processed_reg_map, _to_u16=to_u16,
+                              _ft=_fault_time["sensor"], _time=time.time):
     """
     环境传感器处理:
     - 数值区: ENVIRONMENT_VALUE_START + idx
@@ -1043,7 +1452,7 @@ def process_environment_state(sensor_cfg, registers, sensor_index, now=None):
     状态: 0=传感器故障，1=正常，2=低于下限，3=高于上限
     """
     if now is None:
-        now = time.time()
+        now = _time()
     raw_addr = sensor_cfg.get("r_d_pht_address", {}).get("local")
     raw_val = registers.get(raw_addr, 0)
 
@@ -1096,29 +1505,32 @@ def process_environment_state(sensor_cfg, registers, sensor_index, now=None):
 
     # 先做极端值的传感器故障保护（延时8秒确认）
     if calc_val > (extreme_high * 10**decimals) or calc_val < (extreme_low * 10**decimals):
-        if _fault_time["sensor"].get(key, 0) == 0:
-            _fault_time["sensor"][key] = now
-        elif now - _fault_time["sensor"][key] >= 8:
+        fault_start = _ft.get(key, 0)
+        if fault_start == 0:
+            _ft[key] = now
+        elif now - fault_start >= 8:
             state = 0
     else:
         # 各自的上下限报警（延时8秒确认），正常清零故障计时
         if calc_val < min_v:
-            if _fault_time["sensor"].get(key, 0) == 0:
-                _fault_time["sensor"][key] = now
-            elif now - _fault_time["sensor"][key] >= 8:
+            fault_start = _ft.get(key, 0)
+            if fault_start == 0:
+                _ft[key] = now
+            elif now - fault_start >= 8:
                 state = 2
         elif calc_val > (max_v * 10**decimals):
-            if _fault_time["sensor"].get(key, 0) == 0:
-                _fault_time["sensor"][key] = now
-            elif now - _fault_time["sensor"][key] >= 8:
+            fault_start = _ft.get(key, 0)
+            if fault_start == 0:
+                _ft[key] = now
+            elif now - fault_start >= 8:
                 state = 3
         else:
             state = 1
-            _fault_time["sensor"][key] = 0
+            _ft[key] = 0
 
-    u16_calc_val_int = to_u16(calc_val_int)
-    processed_reg_map.set_register(ENVIRONMENT_VALUE_START + sensor_index, u16_calc_val_int)
-    processed_reg_map.set_register(ENVIRONMENT_STATUS_START + sensor_index, state)
+    u16_calc_val_int = _to_u16(calc_val_int)
+    _prm.set_register(ENVIRONMENT_VALUE_START + sensor_index, u16_calc_val_int)
+    _prm.set_register(ENVIRONMENT_STATUS_START + sensor_index, state)
 
     # print(f"Environment Sensor {sensor_index}: Raw={raw_val}, Calc={calc_val:.2f}, State={state}")
 
@@ -1303,88 +1715,115 @@ def process_io_output_state(
         "index": iooutput_index,
     }
 
+# 传感器处理函数分派表：配置加载后只按地址字段分类一次，每个元素为 (处理函数, 配置, 同类序号)
+def _build_sensor_dispatch(sensors: list) -> list:
+    kinds = (
+        ("r_d_temperature_address", process_temperature_state),
+        ("r_d_pressure_address", process_pressure_state),
+        ("r_d_flow_address", process_flow_state),
+        ("r_d_ph_address", process_ph_state),
+        ("r_d_pht_address", process_environment_state),
+    )
+    counters = {}
+    dispatch = []
+    for item in sensors:
+        cfg = item.get("config", {})
+        for addr_key, handler in kinds:
+            if addr_key in cfg:
+                idx = counters.get(handler, 0)
+                counters[handler] = idx + 1
+                dispatch.append((handler, cfg, idx))
+                break
+        # 未知类型，跳过
+    return dispatch
+
+_SENSOR_DISPATCH = _build_sensor_dispatch(CONFIG_CACHE.get("sensor", []))
+
+# 以下 get_all_*_states 的 collect=False 供同步线程使用：只刷新处理后寄存器，不构建结果列表
+
 # 风扇寄存器值获取
-def get_all_fan_states(reg_map) -> list:
+def get_all_fan_states(reg_map, collect: bool = True) -> Optional[list]:
     fans = CONFIG_CACHE.get("fans", [])
     now = time.time()
+    registers, coils = reg_map.registers, reg_map.coils
+    if not collect:
+        for i, fan in enumerate(fans):
+            process_fan_state(fan["config"], registers, coils, i, now)
+        return None
     return [
-        process_fan_state(fan["config"], reg_map.registers, reg_map.coils, i, now)
+        process_fan_state(fan["config"], registers, coils, i, now)
         for i, fan in enumerate(fans)
     ]
 
 # 水泵寄存器值获取
-def get_all_pump_states(reg_map) -> list:
+def get_all_pump_states(reg_map, collect: bool = True) -> Optional[list]:
     pumps = CONFIG_CACHE.get("pumps", [])
     now = time.time()
+    registers, coils = reg_map.registers, reg_map.coils
+    if not collect:
+        for i, pump in enumerate(pumps):
+            process_pump_state(pump["config"], registers, coils, i, now)
+        return None
     return [
-        process_pump_state(pump["config"], reg_map.registers, reg_map.coils, i, now)
+        process_pump_state(pump["config"], registers, coils, i, now)
         for i, pump in enumerate(pumps)
     ]
 
 # 比例阀寄存器值获取
-def get_all_proportional_valve_states(reg_map) -> list:
+def get_all_proportional_valve_states(reg_map, collect: bool = True) -> Optional[list]:
     pvs = CONFIG_CACHE.get("proportional_valve", [])
     now = time.time()
+    registers = reg_map.registers
+    if not collect:
+        for i, pv in enumerate(pvs):
+            process_proportional_valve_state(pv["config"], registers, i, now)
+        return None
     return [
-        process_proportional_valve_state(pv["config"], reg_map.registers, i, now)
+        process_proportional_valve_state(pv["config"], registers, i, now)
         for i, pv in enumerate(pvs)
     ]
 
 # 传感器寄存器值获取(温度、压力、流量、PH， 温湿度传感器)
-def get_all_sensor_states(reg_map) -> list:
-    sensors = CONFIG_CACHE.get("sensor", [])
+def get_all_sensor_states(reg_map, collect: bool = True) -> Optional[list]:
     now = time.time()
-    results = []
-    temp_idx = 0
-    press_idx = 0
-    flow_idx = 0
-    ph_idx = 0
-    pht_idx = 0
-
-    for item in sensors:
-        cfg = item.get("config", {})
-        if "r_d_temperature_address" in cfg:
-            results.append(process_temperature_state(cfg, reg_map.registers, temp_idx, now))
-            temp_idx += 1
-        elif "r_d_pressure_address" in cfg:
-            results.append(process_pressure_state(cfg, reg_map.registers, press_idx, now))
-            press_idx += 1
-        elif "r_d_flow_address" in cfg:
-            results.append(process_flow_state(cfg, reg_map.registers, flow_idx, now))
-            flow_idx += 1
-        elif "r_d_ph_address" in cfg:
-            results.append(process_ph_state(cfg, reg_map.registers, ph_idx, now))
-            ph_idx += 1
-        elif "r_d_pht_address" in cfg:
-            results.append(process_environment_state(cfg, reg_map.registers, pht_idx, now))
-            pht_idx += 1
-        else:
-            # 未知类型，跳过
-            continue
-
-    return results
+    registers = reg_map.registers
+    if not collect:
+        for handler, cfg, idx in _SENSOR_DISPATCH:
+            handler(cfg, registers, idx, now)
+        return None
+    return [handler(cfg, registers, idx, now) for handler, cfg, idx in _SENSOR_DISPATCH]
 
 # IO Input线圈值获取
-def get_all_io_input_states(reg_map) -> list:
+def get_all_io_input_states(reg_map, collect: bool = True) -> Optional[list]:
     """
     获取所有Input的状态（只读）
     """
     inputs = CONFIG_CACHE.get("input", [])
     now = time.time()
+    coils = reg_map.coils
+    if not collect:
+        for i, input_cfg in enumerate(inputs):
+            process_io_input_state(input_cfg["config"], coils, i, now)
+        return None
     return [
-        process_io_input_state(input_cfg["config"], reg_map.coils, i, now)
+        process_io_input_state(input_cfg["config"], coils, i, now)
         for i, input_cfg in enumerate(inputs)
     ]
 
 # IO Output线圈值获取
-def get_all_io_output_states(reg_map) -> list:
+def get_all_io_output_states(reg_map, collect: bool = True) -> Optional[list]:
     """
     获取所有IO Output的状态
     """
     iooutputs = CONFIG_CACHE.get("output", [])
     now = time.time()
+    coils = reg_map.coils
+    if not collect:
+        for i, iooutput in enumerate(iooutputs):
+            process_io_output_state(iooutput["config"], coils, i, now)
+        return None
     return [
-        process_io_output_state(iooutput["config"], reg_map.coils, i, now)
+        process_io_output_state(iooutput["config"], coils, i, now)
         for i, iooutput in enumerate(iooutputs)
     ]
 
@@ -1404,58 +1843,28 @@ def _sync_read_to_write_registers_once():
     # print("[ControlLogic] INFO: First sync - copying read registers to write registers")
 
     try:
-        # 同步水泵占空比：读取寄存器600-631 -> 写入寄存器632-663
         pump_count = len(CONFIG_CACHE.get("pumps", []))
-        for i in range(pump_count):
-            read_addr = PUMP_DUTY_READ_START + i
-            write_addr = PUMP_DUTY_WRITE_START + i
-            read_value = processed_reg_map.get_register(read_addr)
-            # 将读取寄存器的值同步到写入寄存器
-            processed_reg_map.set_register(write_addr, read_value, trigger_callback=False)
-            # print(f"[ControlLogic] DEBUG: Sync pump duty - pump_index={i}, read_addr={read_addr}(value={read_value}) -> write_addr={write_addr}")
+        pv_count = len(CONFIG_CACHE.get("proportional_valve", []))
+        fan_count = len(CONFIG_CACHE.get("fans", []))
+        iooutput_count = len(CONFIG_CACHE.get("output", []))
+
+        # 同步水泵占空比：读取寄存器600-631 -> 写入寄存器632-663
+        processed_reg_map.copy_register_range(PUMP_DUTY_READ_START, PUMP_DUTY_WRITE_START, pump_count)
 
         # 同步比例阀占空比：读取寄存器800-807 -> 写入寄存器808-815
-        pv_count = len(CONFIG_CACHE.get("proportional_valve", []))
-        for i in range(pv_count):
-            read_addr = PV_DUTY_READ_START + i
-            write_addr = PV_DUTY_WRITE_START + i
-            read_value = processed_reg_map.get_register(read_addr)
-            processed_reg_map.set_register(write_addr, read_value, trigger_callback=False)
-            # print(f"[ControlLogic] DEBUG: Sync PV duty - pv_index={i}, read_addr={read_addr}(value={read_value}) -> write_addr={write_addr}")
+        processed_reg_map.copy_register_range(PV_DUTY_READ_START, PV_DUTY_WRITE_START, pv_count)
 
         # 同步风扇占空比：读取寄存器400-431 -> 写入寄存器432-463
-        fan_count = len(CONFIG_CACHE.get("fans", []))
-        for i in range(fan_count):
-            read_addr = FAN_DUTY_READ_START + i
-            write_addr = FAN_DUTY_WRITE_START + i
-            read_value = processed_reg_map.get_register(read_addr)
-            processed_reg_map.set_register(write_addr, read_value, trigger_callback=False)
-            # print(f"[ControlLogic] DEBUG: Sync fan duty - fan_index={i}, read_addr={read_addr}(value={read_value}) -> write_addr={write_addr}")
+        processed_reg_map.copy_register_range(FAN_DUTY_READ_START, FAN_DUTY_WRITE_START, fan_count)
 
         # 同步风扇开关：读取线圈1-31 -> 写入线圈33-63
-        for i in range(fan_count):
-            read_addr = COIL_FAN_SWITCH_READ_START + i
-            write_addr = COIL_FAN_SWITCH_WRITE_START + i
-            read_value = processed_reg_map.get_coil(read_addr)
-            processed_reg_map.set_coil(write_addr, read_value, trigger_callback=False)
-            # print(f"[ControlLogic] DEBUG: Sync fan switch - fan_index={i}, read_addr={read_addr}(value={read_value}) -> write_addr={write_addr}")
+        processed_reg_map.copy_coil_range(COIL_FAN_SWITCH_READ_START, COIL_FAN_SWITCH_WRITE_START, fan_count)
 
         # 同步水泵开关：读取线圈65-95 -> 写入线圈97-127
-        for i in range(pump_count):
-            read_addr = COIL_PUMP_SWITCH_READ_START + i
-            write_addr = COIL_PUMP_SWITCH_WRITE_START + i
-            read_value = processed_reg_map.get_coil(read_addr)
-            processed_reg_map.set_coil(write_addr, read_value, trigger_callback=False)
-            # print(f"[ControlLogic] DEBUG: Sync pump switch - pump_index={i}, read_addr={read_addr}(value={read_value}) -> write_addr={write_addr}")
+        processed_reg_map.copy_coil_range(COIL_PUMP_SWITCH_READ_START, COIL_PUMP_SWITCH_WRITE_START, pump_count)
 
         # 同步IO output：读取线圈233-265 -> 写入线圈266-297
-        iooutput_count = len(CONFIG_CACHE.get("output", []))
-        for i in range(iooutput_count):
-            read_addr = COIL_IO_OUTPUT_READ_START + i
-            write_addr = COIL_IO_OUTPUT_WRITE_START + i
-            read_value = processed_reg_map.get_coil(read_addr)
-            processed_reg_map.set_coil(write_addr, read_value, trigger_callback=False)
-            # print(f"[ControlLogic] DEBUG: Sync fan switch - iooutput_index={i}, read_addr={read_addr}(value={read_value}) -> write_addr={write_addr}")
+        processed_reg_map.copy_coil_range(COIL_IO_OUTPUT_READ_START, COIL_IO_OUTPUT_WRITE_START, iooutput_count)
 
         # print("[ControlLogic] INFO: First sync completed - all read to write registers synchronized")
 
@@ -1479,15 +1888,16 @@ def start_processed_register_sync(get_register_map_func, interval=0.15):
         # 第一次同步标志，确保只执行一次
         first_run = True
         data_ready_check_count = 0
+        processed_regs = processed_reg_map.registers
 
         while True:
             reg_map = get_register_map_func()
-            get_all_fan_states(reg_map)
-            get_all_pump_states(reg_map)
-            get_all_proportional_valve_states(reg_map)
-            get_all_sensor_states(reg_map)
-            get_all_io_output_states(reg_map)
-            get_all_io_input_states(reg_map)
+            get_all_fan_states(reg_map, collect=False)
+            get_all_pump_states(reg_map, collect=False)
+            get_all_proportional_valve_states(reg_map, collect=False)
+            get_all_sensor_states(reg_map, collect=False)
+            get_all_io_output_states(reg_map, collect=False)
+            get_all_io_input_states(reg_map, collect=False)
             get_pressure_diff(processed_reg_map)
             get_temperature_diff(processed_reg_map)
             get_cooling_capacity(processed_reg_map)
@@ -1496,15 +1906,12 @@ def start_processed_register_sync(get_register_map_func, interval=0.15):
             if first_run:
                 data_ready_check_count += 1
 
-                # 检查是否有实际设备数据（非0值）
-                has_actual_data = False
-                # 简单检查几个关键设备
-                if processed_reg_map.get_register(PUMP_DUTY_READ_START) != 0:
-                    has_actual_data = True
-                elif processed_reg_map.get_register(FAN_DUTY_READ_START) != 0:
-                    has_actual_data = True
-                elif processed_reg_map.get_register(PV_DUTY_READ_START) != 0:
-                    has_actual_data = True
+                # 检查是否有实际设备数据（非0值），简单检查几个关键设备，直接按下标读取寄存器数组
+                has_actual_data = bool(
+                    processed_regs[PUMP_DUTY_READ_START]
+                    or processed_regs[FAN_DUTY_READ_START]
+                    or processed_regs[PV_DUTY_READ_START]
+                )
 
                 if has_actual_data or data_ready_check_count >= 10:
                     _sync_read_to_write_registers_once()
@@ -1514,6 +1921,79 @@ def start_processed_register_sync(get_register_map_func, interval=0.15):
     t = threading.Thread(target=sync_loop, daemon=True)
     t.start()
 
+# 风扇延迟停机调度线程
+def _fan_shutdown_scheduler():
+    """
+    常驻调度线程：等待截止时间到达后关闭全部风扇
+    截止时间被取消或刷新时通过条件变量唤醒重新计算等待时长
+    """
+    global _fan_shutdown_deadline
+
+    while True:
+        with _fan_shutdown_cond:
+            while True:
+                deadline = _fan_shutdown_deadline
+                if deadline is None:
+                    _fan_shutdown_cond.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    _fan_shutdown_deadline = None
+                    break
+                _fan_shutdown_cond.wait(remaining)
+
+        logger.info("Delayed fan shutdown triggered")
+        try:
+            batch_write_fan_switches([0] * _FAN_COUNT, force=True)
+        except Exception as e:
+            logger.error("Delayed fan shutdown failed: %s", e)
+
+# 设置/刷新风扇延迟停机
+def _schedule_fan_shutdown(delay: float) -> bool:
+    """
+    设置风扇延迟停机截止时间，首次调用时启动调度线程
+    Returns:
+        bool: 是否替换了尚未执行的停机
+    """
+    global _fan_shutdown_deadline, _fan_shutdown_thread
+
+    with _fan_shutdown_cond:
+        replaced = _fan_shutdown_deadline is not None
+        _fan_shutdown_deadline = time.monotonic() + delay
+        if _fan_shutdown_thread is None:
+            _fan_shutdown_thread = threading.Thread(target=_fan_shutdown_scheduler, daemon=True)
+            _fan_shutdown_thread.start()
+        _fan_shutdown_cond.notify()
+    return replaced
+
+# 取消风扇延迟停机
+def _cancel_fan_shutdown() -> bool:
+    """
+    取消尚未执行的风扇延迟停机
+    Returns:
+        bool: 是否存在被取消的停机
+    """
+    global _fan_shutdown_deadline
+
+    with _fan_shutdown_cond:
+        pending = _fan_shutdown_deadline is not None
+        _fan_shutdown_deadline = None
+        _fan_shutdown_cond.notify()
+    return pending
+
+# 自动控制写入上下文
+@contextmanager
+def auto_control_write():
+    """
+    标记当前上下文中的写入由自动控制模块发起，自动模式下HMI写入回调不再拒绝其水泵控制
+    用法：with auto_control_write(): batch_write_pump_duty(...)
+    """
+    token = _AUTO_CONTROL_WRITE.set(True)
+    try:
+        yield
+    finally:
+        _AUTO_CONTROL_WRITE.reset(token)
+
 # 写入使能寄存器绑定业务逻辑
 def apply_write_enable_effect(enable: int):
     """
@@ -1522,84 +2002,69 @@ def apply_write_enable_effect(enable: int):
     - 如果写入使能写1，设置比例阀占空比为10000（100%）
     - 如果切换到手动模式，只停止自动控制线程，保持当前设备状态
     """
-    global _fan_shutdown_timer
+    global _WRITE_ENABLE_CACHED
+    _WRITE_ENABLE_CACHED = 1 if enable else 0
 
     # 保存上一次的状态，防止重复执行
     prev = getattr(apply_write_enable_effect, "last", None)
     if prev == enable:
-        print(f"[ControlLogic] INFO: Write enable unchanged: {enable}")
+        logger.info("Write enable unchanged: %s", enable)
         return
 
-    fans = CONFIG_CACHE.get("fans", [])
-    pumps = CONFIG_CACHE.get("pumps", [])
-    pvs = CONFIG_CACHE.get("proportional_valve", [])
-
     # 获取当前控制模式
     control_mode = processed_reg_map.get_register(CONTROL_MODE)
 
-    # 记录是否存在待执行关停定时器
-    had_pending_timer = False
-    replaced_timer = False
-
     if enable == 1:
         # 取消延迟关停
-        with _fan_shutdown_timer_lock:
-            if _fan_shutdown_timer is not None:
-                had_pending_timer = True
-                try:
-                    _fan_shutdown_timer.cancel()
-                finally:
-                    _fan_shutdown_timer = None
+        _cancel_fan_shutdown()
 
         # 启动全部风扇（force=True 跳过写使能判定）
-        for i in range(len(fans)):
-            write_fan_switch(i, 1, force=True)
+        batch_write_fan_switches([1] * _FAN_COUNT, force=True)
 
         # 设置比例阀占空比为10000（100%）
-        for i in range(len(pvs)):
+        if _PV_COUNT:
             batch_write_pv_duty(10000, force=True)
 
         # print(f"[ControlLogic] INFO: Write enable=1 - starting all fans, setting PV duty to 10000, control_mode={control_mode}")
 
     else:
         # 写入使能为0：立即停止水泵与比例阀（占空比置 0），风扇延迟关闭
-        print(f"[ControlLogic] INFO: Write enable=0 - immediate stop pumps & PVs, schedule fan delayed stop, control_mode={control_mode}")
+        logger.info("Write enable=0 - immediate stop pumps & PVs, schedule fan delayed stop, control_mode=%s", control_mode)
 
         # 立即停止自动控制线程
         from cdu120kw.control_logic.auto_control import auto_control_manager
         auto_control_manager.stop_auto_control()
 
         # 停止水泵和比例阀
-        for i in range(len(pumps)):
-            write_pump_duty(i, 0, force=True)
+        batch_write_pump_duties([0] * _PUMP_COUNT, force=True)
 
         # for i in range(len(pvs)):
         #     write_pv_duty(i, 0, force=True)
 
-        # 创建/替换风扇延迟关停定时器
-        def delayed_shutdown():
-            print("[ControlLogic] INFO: Delayed fan shutdown triggered")
-            for idx in range(len(fans)):
-                write_fan_switch(idx, 0, force=True)
-
-        with _fan_shutdown_timer_lock:
-            if _fan_shutdown_timer is not None:
-                try:
-                    _fan_shutdown_timer.cancel()
-                finally:
-                    replaced_timer = True
-            _fan_shutdown_timer = threading.Timer(15.0, delayed_shutdown)
-            _fan_shutdown_timer.start()
+        # 设置/刷新风扇延迟关停截止时间
+        _schedule_fan_shutdown(15.0)
 
     apply_write_enable_effect.last = enable
 
+def _sync_write_enable_cache(_address: int, value: int):
+    """
+    写入使能线圈值变化时同步缓存（reset、trigger_callback=False 等不经过 apply_write_enable_effect 的写入）
+    """
+    global _WRITE_ENABLE_CACHED
+    _WRITE_ENABLE_CACHED = 1 if value else 0
+
+
+processed_reg_map.subscribe_coil(COIL_WRITE_ENABLE, _sync_write_enable_cache)
+_WRITE_ENABLE_CACHED = processed_reg_map.get_coil(COIL_WRITE_ENABLE)
+
+
 # 风扇开关写入函数
 def write_fan_switch(fan_index: int, switch_on: int, slave: int = 1, priority: int = 0, force: bool = False):
     """
     写入风扇开关（线圈）到本地寄存器表，并同步写入到PCBA实际寄存器
     1. 先判断写入使能寄存器（COIL_WRITE_ENABLE）是否为1，若为0则禁止写入
     2. 写入本地寄存器表（COIL_FAN_SWITCH_WRITE_START + fan_index）
-    3. 查找风扇配置，获取可写线圈字段
+    3. 取配置加载时预解析的风扇可写线圈字段
     4. 调用ComponentOperationTaskManager写入PCBA
     """
 
@@ -1607,8 +2072,8 @@ def write_fan_switch(fan_index: int, switch_on: int, slave: int = 1, priority: i
     component_task_mgr = app_controller.component_task_manager
 
     # 步骤1：判断写入使能，延迟关停风扇时允许强制写入
-    if not force and processed_reg_map.get_coil(COIL_WRITE_ENABLE) != 1:
-        print("[ControlLogic] WARNING: Fan switch write denied: write enable=0")
+    if not force and _WRITE_ENABLE_CACHED != 1:
+        logger.warning("Fan switch write denied: write enable=0")
         return False
 
     # # 步骤2：写入本地寄存器
@@ -1616,25 +2081,13 @@ def write_fan_switch(fan_index: int, switch_on: int, slave: int = 1, priority: i
     # processed_reg_map.set_coil(coil_addr, switch_on)
     # print(f"[ControlLogic] INFO: Local fan switch written: addr={coil_addr}, value={switch_on}")
 
-    # 步骤3：查找风扇配置
-    fan_list = CONFIG_CACHE.get("fans", [])
-    if fan_index >= len(fan_list):
-        print(f"[ControlLogic] WARNING: Fan index {fan_index} out of range")
-        return False
-    fan_name = fan_list[fan_index]["name"]
-
-    param = component_task_mgr.param_mgr.get_param(fan_name)
-    if not param:
-        print(f"[ControlLogic] WARNING: Fan config not found: {fan_name}")
+    # 步骤3：取配置加载时预解析的可写线圈字段
+    if fan_index >= len(_FAN_WRITE_FIELDS):
+        logger.warning("Fan index %s out of range", fan_index)
         return False
-
-    field = None
-    for k, v in param.writable_fields.items():
-        if v[0] == "coil":
-            field = k
-            break
+    fan_name, field = _FAN_WRITE_FIELDS[fan_index]
     if not field:
-        print(f"[ControlLogic] WARNING: No writable coil field for fan: {fan_name}")
+        logger.warning("No writable coil field for fan: %s", fan_name)
         return False
 
     # 步骤4：写入PCBA
@@ -1647,21 +2100,25 @@ def write_fan_switch(fan_index: int, switch_on: int, slave: int = 1, priority: i
     # print(f"[ControlLogic] INFO: Fan switch submit (force={force}): {fan_name}={switch_on}, result={result}")
     return result
 
+def _pump_duty_to_raw(duty: int) -> int:
+    """水泵占空比（放大100倍）转换为PCBA写入值"""
+    return int(duty / 100)
+
 # 水泵占空比写入函数
 def write_pump_duty(pump_index: int, duty: int, slave: int = 1, priority: int = 0, force: bool = False):
     """
     写入水泵占空比到本地寄存器表，并同步写入到PCBA实际寄存器
     1. 判断写入使能
     2. 写入本地寄存器（PUMP_DUTY_WRITE_START + pump_index）
-    3. 查找水泵配置，获取可写保持寄存器字段
+    3. 取配置加载时预解析的水泵可写保持寄存器字段
     4. 调用ComponentOperationTaskManager写入PCBA
     """
     from cdu120kw.service_function.controller_app import app_controller
     component_task_mgr = app_controller.component_task_manager
 
     # 步骤1：判断写入使能， 延迟关停水泵时允许强制写入
-    if not force and processed_reg_map.get_coil(COIL_WRITE_ENABLE) != 1:
-        print("[ControlLogic] WARNING: Pump duty write denied: write enable=0")
+    if not force and _WRITE_ENABLE_CACHED != 1:
+        logger.warning("Pump duty write denied: write enable=0")
         return False
 
     # # 步骤2：写入本地寄存器
@@ -1669,32 +2126,19 @@ def write_pump_duty(pump_index: int, duty: int, slave: int = 1, priority: int =
     # processed_reg_map.set_register(reg_addr, duty)
     # print(f"[ControlLogic] INFO: Local pump duty written: addr={reg_addr}, value={duty}")
 
-    # 步骤3：查找水泵配置
-    pump_list = CONFIG_CACHE.get("pumps", [])
-    if pump_index >= len(pump_list):
-        print(f"[ControlLogic] WARNING: Pump index {pump_index} out of range")
-        return False
-    pump_name = pump_list[pump_index]["name"]
-
-    param = component_task_mgr.param_mgr.get_param(pump_name)
-    if not param:
-        print(f"[ControlLogic] WARNING: Pump config not found: {pump_name}")
+    # 步骤3：取配置加载时预解析的可写保持寄存器字段
+    if pump_index >= len(_PUMP_WRITE_FIELDS):
+        logger.warning("Pump index %s out of range", pump_index)
         return False
-
-    # 找到可写保持寄存器字段
-    field = None
-    for k, v in param.writable_fields.items():
-        if v[0] == "register":
-            field = k
-            break
+    pump_name, field = _PUMP_WRITE_FIELDS[pump_index]
     if not field:
-        print(f"[ControlLogic] WARNING: No writable register field for pump: {pump_name}")
+        logger.warning("No writable register field for pump: %s", pump_name)
         return False
 
     # 步骤4：写入PCBA
     result = component_task_mgr.operate_component(
         name=pump_name,
-        value_dict={field: int(duty / 100)},
+        value_dict={field: _pump_duty_to_raw(duty)},
         slave=slave,
         priority=priority
     )
@@ -1707,7 +2151,7 @@ def write_pv_duty(pv_index: int, duty: int, slave: int = 1, priority: int = 0, f
     写入比例阀占空比到本地寄存器表，并同步写入到PCBA实际寄存器
     1. 判断写入使能
     2. 写入本地寄存器（PV_DUTY_WRITE_START + pv_index）
-    3. 查找比例阀配置，获取可写保持寄存器字段
+    3. 取配置加载时预解析的比例阀可写保持寄存器字段
     4. 调用ComponentOperationTaskManager写入PCBA
     """
 
@@ -1715,8 +2159,8 @@ def write_pv_duty(pv_index: int, duty: int, slave: int = 1, priority: int = 0, f
     component_task_mgr = app_controller.component_task_manager
 
     # 步骤1：判断写入使能， 延迟关停比例阀时允许强制写入
-    if not force and processed_reg_map.get_coil(COIL_WRITE_ENABLE) != 1:
-        print("[ControlLogic] WARNING: PV duty write denied: write enable=0")
+    if not force and _WRITE_ENABLE_CACHED != 1:
+        logger.warning("PV duty write denied: write enable=0")
         return False
 
     # # 步骤2：写入本地寄存器
@@ -1724,25 +2168,13 @@ def write_pv_duty(pv_index: int, duty: int, slave: int = 1, priority: int = 0, f
     # processed_reg_map.set_register(reg_addr, duty)
     # print(f"Local proportional valve duty written: addr={reg_addr}, value={duty}")
 
-    # 步骤3：查找比例阀配置
-    pv_list = CONFIG_CACHE.get("proportional_valve", [])
-    if pv_index >= len(pv_list):
-        print(f"[ControlLogic] WARNING: PV index {pv_index} out of range")
-        return False
-    pv_name = pv_list[pv_index]["name"]
-
-    param = component_task_mgr.param_mgr.get_param(pv_name)
-    if not param:
-        print(f"[ControlLogic] WARNING: PV config not found: {pv_name}")
+    # 步骤3：取配置加载时预解析的可写保持寄存器字段
+    if pv_index >= len(_PV_WRITE_FIELDS):
+        logger.warning("PV index %s out of range", pv_index)
         return False
-
-    field = None
-    for k, v in param.writable_fields.items():
-        if v[0] == "register":
-            field = k
-            break
+    pv_name, field = _PV_WRITE_FIELDS[pv_index]
     if not field:
-        print(f"[ControlLogic] WARNING: No writable register field for PV: {pv_name}")
+        logger.warning("No writable register field for PV: %s", pv_name)
         return False
 
     # 步骤4：写入PCBA
@@ -1761,7 +2193,7 @@ def write_io_output(iooutput_index: int, switch_on: int, slave: int = 1, priorit
     写入IO Output输出（线圈）到本地寄存器表，并同步写入到PCBA实际寄存器
     1. 先判断写入使能寄存器（COIL_WRITE_ENABLE）是否为1，若为0则禁止写入
     2. 写入本地寄存器表（COIL_IO_OUTPUT_WRITE_START + iooutput_index）
-    3. 查找iooutput配置，获取可写线圈字段
+    3. 取配置加载时预解析的IO Output可写线圈字段
     4. 调用ComponentOperationTaskManager写入PCBA
     """
 
@@ -1769,8 +2201,8 @@ def write_io_output(iooutput_index: int, switch_on: int, slave: int = 1, priorit
     component_task_mgr = app_controller.component_task_manager
 
     # 步骤1：判断写入使能，延迟关停风扇时允许强制写入
-    if not force and processed_reg_map.get_coil(COIL_WRITE_ENABLE) != 1:
-        print("[ControlLogic] WARNING: IO Output write denied: write enable=0")
+    if not force and _WRITE_ENABLE_CACHED != 1:
+        logger.warning("IO Output write denied: write enable=0")
         return False
 
     # # 步骤2：写入本地寄存器
@@ -1778,25 +2210,13 @@ def write_io_output(iooutput_index: int, switch_on: int, slave: int = 1, priorit
     # processed_reg_map.set_coil(coil_addr, switch_on)
     # print(f"[ControlLogic] INFO: Local IO Output written: addr={coil_addr}, value={switch_on}")
 
-    # 步骤3：查找IO Output配置
-    iooutput_list = CONFIG_CACHE.get("output", [])
-    if iooutput_index >= len(iooutput_list):
-        print(f"[ControlLogic] WARNING: IO Output index {iooutput_index} out of range")
-        return False
-    iooutput_name = iooutput_list[iooutput_index]["name"]
-
-    param = component_task_mgr.param_mgr.get_param(iooutput_name)
-    if not param:
-        print(f"[ControlLogic] WARNING: IO Output config not found: {iooutput_name}")
+    # 步骤3：取配置加载时预解析的可写线圈字段
+    if iooutput_index >= len(_OUTPUT_WRITE_FIELDS):
+        logger.warning("IO Output index %s out of range", iooutput_index)
         return False
-
-    field = None
-    for k, v in param.writable_fields.items():
-        if v[0] == "coil":
-            field = k
-            break
+    iooutput_name, field = _OUTPUT_WRITE_FIELDS[iooutput_index]
     if not field:
-        print(f"[ControlLogic] WARNING: No writable coil field for IO Output: {iooutput_name}")
+        logger.warning("No writable coil field for IO Output: %s", iooutput_name)
         return False
 
     # 步骤4：写入PCBA
@@ -1809,6 +2229,60 @@ def write_io_output(iooutput_index: int, switch_on: int, slave: int = 1, priorit
     # print(f"[ControlLogic] INFO: IO Output submit (force={force}): {iooutput_name}={switch_on}, result={result}")
     return result
 
+# 风扇开关批量写入函数
+def batch_write_fan_switches(states: list, slave: int = 1, priority: int = 0, force: bool = False):
+    """
+    批量写入风扇开关到PCBA实际寄存器
+    1. 判断写入使能
+    2. 使用配置加载时预解析的风扇可写线圈字段
+    3. 调用ComponentOperationTaskManager批量写入，连续地址合并为一次多线圈写入（FC15）
+    states: 按风扇索引排列的开关值列表
+    """
+    from cdu120kw.service_function.controller_app import app_controller
+    component_task_mgr = app_controller.component_task_manager
+
+    if not force and _WRITE_ENABLE_CACHED != 1:
+        logger.warning("Fan batch switch write denied: write enable=0")
+        return False
+
+    items = []
+    for (fan_name, field), switch_on in zip(_FAN_WRITE_FIELDS, states):
+        if not field:
+            logger.warning("No writable coil field for fan: %s", fan_name)
+            continue
+        items.append((fan_name, {field: int(switch_on)}))
+
+    if not items:
+        return False
+    return component_task_mgr.batch_operate(items, slave=slave, priority=priority)
+
+# 水泵占空比批量写入函数
+def batch_write_pump_duties(duties: list, slave: int = 1, priority: int = 0, force: bool = False):
+    """
+    批量写入水泵占空比到PCBA实际寄存器
+    1. 判断写入使能
+    2. 使用配置加载时预解析的水泵可写保持寄存器字段
+    3. 调用ComponentOperationTaskManager批量写入，连续地址合并为一次多寄存器写入（FC16）
+    duties: 按水泵索引排列的占空比列表
+    """
+    from cdu120kw.service_function.controller_app import app_controller
+    component_task_mgr = app_controller.component_task_manager
+
+    if not force and _WRITE_ENABLE_CACHED != 1:
+        logger.warning("Pump batch duty write denied: write enable=0")
+        return False
+
+    items = []
+    for (pump_name, field), duty in zip(_PUMP_WRITE_FIELDS, duties):
+        if not field:
+            logger.warning("No writable register field for pump: %s", pump_name)
+            continue
+        items.append((pump_name, {field: _pump_duty_to_raw(duty)}))
+
+    if not items:
+        return False
+    return component_task_mgr.batch_operate(items, slave=slave, priority=priority)
+
 # 水泵批量占空比写入函数
 def batch_write_pump_duty(duty: int, slave: int = 1, priority: int = 0, force: bool = False):
     """
@@ -1816,39 +2290,34 @@ def batch_write_pump_duty(duty: int, slave: int = 1, priority: int = 0, force: b
     通过设置所有水泵的单个写入寄存器来触发回调，实现批量写入
     """
     # 重入保护
-    if getattr(batch_write_pump_duty, '_executing', False):
-        print("[ControlLogic] WARNING: Batch write reentrancy detected")
+    if _batch_guard.in_pump_batch:
+        logger.warning("Batch write reentrancy detected")
         return False
 
-    batch_write_pump_duty._executing = True
+    _batch_guard.in_pump_batch = True
 
     try:
         # 检查写入使能
-        if not force and processed_reg_map.get_coil(COIL_WRITE_ENABLE) != 1:
-            print("[ControlLogic] WARNING: Pump batch duty write denied: write enable=0")
+        if not force and _WRITE_ENABLE_CACHED != 1:
+            logger.warning("Pump batch duty write denied: write enable=0")
             return False
 
-        # 获取水泵列表
-        pump_list = CONFIG_CACHE.get("pumps", [])
-        if not pump_list:
-            print("[ControlLogic] INFO: No pumps configured for batch duty write")
+        if not _PUMP_COUNT:
+            logger.info("No pumps configured for batch duty write")
             return False
 
         # 批量设置所有水泵的写入寄存器
-        # print(f"[ControlLogic] INFO: Starting batch duty write for {len(pump_list)} pumps, duty={duty}")
+        # print(f"[ControlLogic] INFO: Starting batch duty write for {_PUMP_COUNT} pumps, duty={duty}")
 
-        for pump_index in range(len(pump_list)):
-            write_addr = PUMP_DUTY_WRITE_START + pump_index
-            processed_reg_map.set_register(write_addr, duty)
+        # 单次批量更新，回调在退出时合并为一次提交
+        with processed_reg_map.bulk_update():
+            processed_reg_map.set_registers(PUMP_DUTY_WRITE_START, [duty] * _PUMP_COUNT)
 
-        # print(f"[ControlLogic] INFO: Batch duty write completed - {len(pump_list)} registers updated")
+        # print(f"[ControlLogic] INFO: Batch duty write completed - {_PUMP_COUNT} registers updated")
         return True
 
     finally:
-        batch_write_pump_duty._executing = False
-
-# 初始化重入保护标志
-batch_write_pump_duty._executing = False
+        _batch_guard.in_pump_batch = False
 
 # 比例阀批量占空比写入函数
 def batch_write_pv_duty(duty: int, slave: int = 1, priority: int = 0, force: bool = False):
@@ -1857,39 +2326,37 @@ def batch_write_pv_duty(duty: int, slave: int = 1, priority: int = 0, force: boo
     通过设置所有比例阀的单个写入寄存器来触发回调，实现批量写入
     """
     # 重入保护
-    if getattr(batch_write_pv_duty, '_executing', False):
-        print("[ControlLogic] WARNING: Batch write reentrancy detected")
+    if _batch_guard.in_pv_batch:
+        logger.warning("Batch write reentrancy detected")
         return False
 
-    batch_write_pv_duty._executing = True
+    _batch_guard.in_pv_batch = True
 
     try:
         # 检查写入使能
-        if not force and processed_reg_map.get_coil(COIL_WRITE_ENABLE) != 1:
-            print("[ControlLogic] WARNING: Pump batch duty write denied: write enable=0")
+        if not force and _WRITE_ENABLE_CACHED != 1:
+            logger.warning("Pump batch duty write denied: write enable=0")
             return False
 
-        # 获取比例阀列表
-        pv_list = CONFIG_CACHE.get("proportional_valve", [])
-        if not pv_list:
-            print("[ControlLogic] INFO: No pv configured for batch duty write")
+        if not _PV_COUNT:
+            logger.info("No pv configured for batch duty write")
             return False
 
         # 批量设置所有比例阀的写入寄存器
-        # print(f"[ControlLogic] INFO: Starting batch duty write for {len(pv_list)} pvs, duty={duty}")
+        # print(f"[ControlLogic] INFO: Starting batch duty write for {_PV_COUNT} pvs, duty={duty}")
 
-        for pv_index in range(len(pv_list)):
-            write_addr = PV_DUTY_WRITE_START + pv_index
-            processed_reg_map.set_register(write_addr, duty)
+        # 单次批量更新，回调在退出时合并为一次提交
+        with processed_reg_map.bulk_update():
+            processed_reg_map.set_registers(PV_DUTY_WRITE_START, [duty] * _PV_COUNT)
 
-        # print(f"[ControlLogic] INFO: Batch duty write completed - {len(pv_list)} registers updated")
+        # print(f"[ControlLogic] INFO: Batch duty write completed - {_PV_COUNT} registers updated")
         return True
 
     finally:
-        batch_write_pv_duty._executing = False
+        _batch_guard.in_pv_batch = False
 
-# 比例阀初始化重入保护标志
-batch_write_pv_duty._executing = False
+# IO Output索引 -> 写入线圈地址，配置加载时一次性生成
+_IO_OUTPUT_ADDR = array.array("I", range(COIL_IO_OUTPUT_WRITE_START, COIL_IO_OUTPUT_WRITE_START + _OUTPUT_COUNT))
 
 # IO Output批量写入函数
 def batch_write_io_outputs(output_dict: dict, slave: int = 1, priority: int = 0, force: bool = False):
@@ -1898,42 +2365,96 @@ def batch_write_io_outputs(output_dict: dict, slave: int = 1, priority: int = 0,
     通过设置多个IO Output的单个写入寄存器来触发回调，实现批量写入
     """
     # 重入保护
-    if getattr(batch_write_io_outputs, '_executing', False):
-        print("[ControlLogic] WARNING: IO Output batch write reentrancy detected")
+    if _batch_guard.in_io_batch:
+        logger.warning("IO Output batch write reentrancy detected")
         return False
 
-    batch_write_io_outputs._executing = True
+    _batch_guard.in_io_batch = True
 
     try:
         # 检查写入使能
-        if not force and processed_reg_map.get_coil(COIL_WRITE_ENABLE) != 1:
-            print("[ControlLogic] WARNING: IO Output batch write denied: write enable=0")
+        if not force and _WRITE_ENABLE_CACHED != 1:
+            logger.warning("IO Output batch write denied: write enable=0")
             return False
 
-        # 获取IO Output列表
-        iooutput_list = CONFIG_CACHE.get("output", [])
-        if not iooutput_list:
-            print("[ControlLogic] INFO: No IO Outputs configured for batch write")
+        if not _OUTPUT_COUNT:
+            logger.info("No IO Outputs configured for batch write")
             return False
 
         # print(f"[ControlLogic] INFO: Starting batch write for {len(output_dict)} IO Outputs")
 
-        for iooutput_index, switch_on in output_dict.items():
-            if iooutput_index >= len(iooutput_list):
-                print(f"[ControlLogic] WARNING: IO Output index {iooutput_index} out of range")
-                continue
+        # 先过滤越界索引并查表得到写入地址，再一次性批量写入线圈
+        items = [
+            (_IO_OUTPUT_ADDR[iooutput_index], 1 if switch_on else 0)
+            for iooutput_index, switch_on in output_dict.items()
+            if 0 <= iooutput_index < _OUTPUT_COUNT
+        ]
+        if len(items) != len(output_dict):
+            out_of_range = [i for i in output_dict if not 0 <= i < _OUTPUT_COUNT]
+            logger.warning("IO Output index %s out of range", out_of_range)
 
-            write_addr = COIL_IO_OUTPUT_WRITE_START + iooutput_index
-            processed_reg_map.set_coil(write_addr, 1 if switch_on else 0)
+        if items:
+            # 单次批量更新，回调在退出时合并为一次提交
+            with processed_reg_map.bulk_update():
+                processed_reg_map.set_coils(*zip(*items))
 
         # print(f"[ControlLogic] INFO: Batch write completed - {len(output_dict)} registers updated")
         return True
 
     finally:
-        batch_write_io_outputs._executing = False
+        _batch_guard.in_io_batch = False
+
+# IO Output批量开关：所有IO Output置为同一状态
+def batch_set_all_io_outputs(value: int, force: bool = False):
+    """
+    IO Output批量开关函数
+    IO Output写入线圈地址连续，直接对整段区间一次写入并触发回调，无需逐个构建索引字典
+    """
+    # 重入保护（与 batch_write_io_outputs 共用标志）
+    if _batch_guard.in_io_batch:
+        logger.warning("IO Output batch write reentrancy detected")
+        return False
+
+    _batch_guard.in_io_batch = True
+
+    try:
+        # 检查写入使能
+        if not force and _WRITE_ENABLE_CACHED != 1:
+            logger.warning("IO Output batch write denied: write enable=0")
+            return False
+
+        if not _OUTPUT_COUNT:
+            logger.info("No IO Outputs configured for batch write")
+            return False
+
+        # 单次批量更新，回调在退出时合并为一次提交
+        with processed_reg_map.bulk_update():
+            processed_reg_map.set_coils_range(COIL_IO_OUTPUT_WRITE_START, _OUTPUT_COUNT, value)
+        return True
 
-# IO Output初始化重入保护标志
-batch_write_io_outputs._executing = False
+    finally:
+        _batch_guard.in_io_batch = False
+
+# HMI写入分派表（线圈与保持寄存器地址互不重叠，共用一张表）
+# 单台设备写入区：(起始地址, 结束地址（排他）, 处理函数(设备索引, 值), 可写字段表, 写入值转换)，按起始地址排序
+# 可写字段表与写入值转换供批量写入回调合并提交时使用，与对应处理函数保持一致
+_HMI_RANGE_HANDLERS = sorted(
+    [
+        (COIL_FAN_SWITCH_WRITE_START, COIL_FAN_SWITCH_WRITE_END, write_fan_switch, _FAN_WRITE_FIELDS, int),             # 风扇开关写入区
+        (PUMP_DUTY_WRITE_START, PUMP_DUTY_WRITE_END, write_pump_duty, _PUMP_WRITE_FIELDS, _pump_duty_to_raw),          # 水泵占空比写入区
+        (PV_DUTY_WRITE_START, PV_DUTY_WRITE_END, write_pv_duty, _PV_WRITE_FIELDS, int),                                # 比例阀占空比写入区
+        (COIL_IO_OUTPUT_WRITE_START, COIL_IO_OUTPUT_WRITE_END, write_io_output, _OUTPUT_WRITE_FIELDS, int),            # IO Output写入区
+    ],
+    key=lambda item: item[0],
+)
+_HMI_RANGE_STARTS = [item[0] for item in _HMI_RANGE_HANDLERS]
+
+# 批量控制地址：地址 -> 处理函数(值)
+_HMI_EXACT_HANDLERS = {
+    PUMP_BATCH_DUTY_REGISTER: batch_write_pump_duty,            # 水泵批量占空比写入寄存器
+    PV_BATCH_DUTY_REGISTER: batch_write_pv_duty,                # 比例阀批量占空比写入寄存器
+    IO_OUTPUT_BATCH_SWITCH_COIL: batch_set_all_io_outputs,      # IO Output批量开关线圈
+}
 
 # HMI写入触发回调函数
 def hmi_write_trigger(address: int, value: int):
@@ -1942,7 +2463,7 @@ def hmi_write_trigger(address: int, value: int):
     处理所有HMI写入操作，包括新增的水泵批量控制
     """
 
-    write_enable = processed_reg_map.get_coil(COIL_WRITE_ENABLE)
+    write_enable = _WRITE_ENABLE_CACHED
 
     # 写使能线圈
     if address == COIL_WRITE_ENABLE:
@@ -1959,13 +2480,8 @@ def hmi_write_trigger(address: int, value: int):
 
     # 自动控制模式时拒绝手动控制水泵
     if control_mode in [2, 3, 4]:  # 2=流量温度模式, 3=流量模式, 4=压差温度模式
-        # 检查调用栈，确定是否来自自动控制模块
-        stack = inspect.stack()
-        is_auto_control = any(
-            'auto_control' in frame.filename.lower() or
-            'AutoControlManager' in str(frame.frame.f_locals.get('self', ''))
-            for frame in stack
-        )
+        # 检查写入是否由自动控制模块发起
+        is_auto_control = _AUTO_CONTROL_WRITE.get()
 
         # 如果不是自动控制系统发起的写入，则拒绝水泵控制
         if not is_auto_control:
@@ -1979,61 +2495,68 @@ def hmi_write_trigger(address: int, value: int):
                 # print(f"[ControlLogic] WARNING: Manual batch pump control rejected in auto mode {control_mode}")
                 return
 
-    # 风扇开关写入区
-    if COIL_FAN_SWITCH_WRITE_START <= address < COIL_FAN_SWITCH_WRITE_END:
-        fan_index = address - COIL_FAN_SWITCH_WRITE_START
-        write_fan_switch(fan_index, value)
-        # print("[ControlLogic] INFO: Fan switch: idx=%s addr=%s value=%s",
-        #             fan_index, address, int(value))
-        return
-
-    # 水泵占空比写入区
-    if PUMP_DUTY_WRITE_START <= address < PUMP_DUTY_WRITE_END:
-        pump_index = address - PUMP_DUTY_WRITE_START
-        write_pump_duty(pump_index, value)
-        # print("[ControlLogic] INFO: Pump duty: idx=%s addr=%s duty=%s",
-        #             pump_index, address, int(value))
+    # 批量控制寄存器/线圈：直接查表
+    handler = _HMI_EXACT_HANDLERS.get(address)
+    if handler is not None:
+        handler(value)
         return
 
-    # 比例阀占空比写入区
-    if PV_DUTY_WRITE_START <= address < PV_DUTY_WRITE_END:
-        pv_index = address - PV_DUTY_WRITE_START
-        write_pv_duty(pv_index, value)
-        # print("[ControlLogic] INFO: PV duty: idx=%s addr=%s duty=%s",
-        #             pv_index, address, int(value))
-        return
+    # 单台设备写入区：二分查找所在区间，按区间内偏移作为设备索引
+    pos = bisect_right(_HMI_RANGE_STARTS, address) - 1
+    if pos >= 0:
+        start, end, handler, _fields, _convert = _HMI_RANGE_HANDLERS[pos]
+        if address < end:
+            handler(address - start, value)
+            # print("[ControlLogic] INFO: HMI write: idx=%s addr=%s value=%s", address - start, address, int(value))
 
-    # IO Output写入区
-    if COIL_IO_OUTPUT_WRITE_START <= address < COIL_IO_OUTPUT_WRITE_END:
-        iooutput_index = address - COIL_IO_OUTPUT_WRITE_START
-        write_io_output(iooutput_index, value)
-        # print("[ControlLogic] INFO: IO Output: idx=%s addr=%s value=%s",
-        #             iooutput_index, address, int(value))
-        return
+# HMI批量写入回调函数
+def hmi_bulk_write_trigger(addresses, values):
+    """
+    HMI批量写入回调函数（processed_reg_map.bulk_update 结束时触发）
+    全部地址都位于单台设备写入区时，合并为一次 batch_operate 提交，连续地址合并为一次多线圈/多寄存器写入；
+    否则按原顺序逐个交由 hmi_write_trigger 处理
+    """
+    located = []
+    for address in addresses:
+        pos = bisect_right(_HMI_RANGE_STARTS, address) - 1
+        if pos < 0 or address >= _HMI_RANGE_HANDLERS[pos][1]:
+            located = None
+            break
+        located.append(_HMI_RANGE_HANDLERS[pos])
 
-    # 水泵批量占空比写入寄存器
-    if address == PUMP_BATCH_DUTY_REGISTER:
-        batch_write_pump_duty(value)
-        # print("[ControlLogic] INFO: Pump batch duty triggered: addr=%s duty=%s", address, int(value))
+    if located is None:
+        for address, value in zip(addresses, values):
+            hmi_write_trigger(address, value)
         return
 
-    # 比例阀批量占空比写入寄存器
-    if address == PV_BATCH_DUTY_REGISTER:
-        batch_write_pv_duty(value)
-        # print("[ControlLogic] INFO: Pump batch duty triggered: addr=%s duty=%s", address, int(value))
+    # 写使能关闭时直接拒绝
+    if _WRITE_ENABLE_CACHED != 1:
         return
 
-    if address == IO_OUTPUT_BATCH_SWITCH_COIL:
-        iooutput_list = CONFIG_CACHE.get("output", [])
-        output_dict = {}
+    # 自动控制模式（2/3/4）下拒绝非自动控制模块发起的水泵写入
+    reject_pump = processed_reg_map.get_register(CONTROL_MODE) in (2, 3, 4) and not _AUTO_CONTROL_WRITE.get()
 
-        for i in range(len(iooutput_list)):
-            output_dict[i] = 1 if value else 0
+    items = []
+    for address, value, (start, _end, _handler, fields, convert) in zip(addresses, values, located):
+        if reject_pump and start == PUMP_DUTY_WRITE_START:
+            continue
+        index = address - start
+        if index >= len(fields):
+            logger.warning("Device index %s out of range at address %s", index, address)
+            continue
+        name, field = fields[index]
+        if not field:
+            logger.warning("No writable field for device: %s", name)
+            continue
+        items.append((name, {field: convert(value)}))
 
-        batch_write_io_outputs(output_dict)
-        # print(f"[ControlLogic] INFO: IO Output batch switch triggered: addr={address}, value={value}, {len(output_dict)} outputs")
+    if not items:
         return
 
+    from cdu120kw.service_function.controller_app import app_controller
+    app_controller.component_task_manager.batch_operate(items)
+
 # 注册写入回调
 processed_reg_map.write_coil_callback(hmi_write_trigger)
 processed_reg_map.write_register_callback(hmi_write_trigger)
+processed_reg_map.write_bulk_callback(hmi_bulk_write_trigger)
@@ -4,7 +4,6 @@ IO控制功能类 - 独立模块，自动启动更新线程
 """
 
 import threading
-import time
 from typing import Dict, Any
 
 
@@ -14,24 +13,38 @@ class IOControl:
     专门用于控制输出IO的特殊功能，如LED指示灯
     """
 
-    # 类变量，确保单例和线程安全
-    _instance = None
-    _instance_lock = threading.Lock()
-    _update_thread = None
-    _running = False
-
-    def __new__(cls, *args, **kwargs):
-        """单例模式，确保全局只有一个IOControl实例"""
-        with cls._instance_lock:
-            if cls._instance is None:
-                cls._instance = super().__new__(cls)
-        return cls._instance
+    # 固定实例属性集合，以槽位代替实例字典
+    __slots__ = (
+        "_config_cache",
+        "_processed_reg_map",
+        "_coil_write_enable",
+        "_pump_duty_read_start",
+        "_pump_speed_start",
+        "_pump_current_start",
+        "_coil_io_output_write_start",
+        "_batch_write_io_outputs",
+        "led_indices",
+        "_led_states_by_mask",
+        "last_led_state",
+        "_last_led_mask",
+        "pump_index",
+        "_changed",
+        "_thread_lock",
+        "_update_thread",
+        "_running",
+        "_initialized",
+    )
 
     def __init__(self):
-        """初始化IO控制类"""
-        if hasattr(self, '_initialized') and self._initialized:
+        """初始化IO控制类（模块导入时只构建一次，之后 IOControl() 直接返回该实例）"""
+        if getattr(self, "_initialized", False):
             return
 
+        # 更新线程状态，启停操作由 _thread_lock 保护
+        self._thread_lock = threading.Lock()
+        self._update_thread = None
+        self._running = False
+
         # 导入必要的模块（延迟导入，避免循环导入）
         from cdu120kw.control_logic.device_data_manipulation import (
             CONFIG_CACHE,
@@ -56,16 +69,39 @@ class IOControl:
 
         # LED灯的IO输出索引映射
         self.led_indices = self._find_led_indices()
+        # 按LED状态位掩码预先生成的写入字典表，运行时直接查表
+        self._led_states_by_mask = self._build_led_states_table()
 
         # 上次的LED状态，用于避免重复写入
         self.last_led_state = {}
+        # 上次的LED状态位掩码（bit0=红灯，bit1=绿灯），-1 表示尚未写入
+        self._last_led_mask = -1
 
         # 水泵索引（默认为第一个水泵）
         self.pump_index = 0
 
+        # 状态变化事件：订阅LED判定所依赖的地址，值变化时唤醒更新线程，取代固定周期轮询
+        self._changed = threading.Event()
+        self._subscribe_led_inputs()
+
         self._initialized = True
         print(f"[IOControl] INFO: Initialized with LED indices: {self.led_indices}")
 
+    def _subscribe_led_inputs(self) -> None:
+        """
+        订阅写入使能线圈及水泵占空比、转速、电流寄存器的变化
+        """
+        notify = self._on_led_input_changed
+        reg_map = self._processed_reg_map
+        reg_map.subscribe_coil(self._coil_write_enable, notify)
+        reg_map.subscribe_register(self._pump_duty_read_start + self.pump_index, notify)
+        reg_map.subscribe_register(self._pump_speed_start + self.pump_index, notify)
+        reg_map.subscribe_register(self._pump_current_start + self.pump_index, notify)
+
+    def _on_led_input_changed(self, address: int, value: int) -> None:
+        """LED相关输入变化回调，仅置位事件，实际更新在更新线程中执行"""
+        self._changed.set()
+
     def _find_led_indices(self) -> Dict[str, int]:
         """
         从配置文件中查找Y0、Y1、Y2对应的索引
@@ -94,6 +130,27 @@ class IOControl:
 
         return led_indices
 
+    def _build_led_states_table(self) -> list:
+        """
+        LED索引在初始化后不再变化，预先为4种位掩码（bit0=红灯，bit1=绿灯）生成
+        {IO输出索引: 状态} 字典，只包含已配置的LED，黄灯固定为0
+        """
+        red_idx = self.led_indices.get("red")
+        green_idx = self.led_indices.get("green")
+        yellow_idx = self.led_indices.get("yellow")
+
+        table = []
+        for mask in range(4):
+            led_states = {}
+            if red_idx is not None:
+                led_states[red_idx] = mask & 1
+            if green_idx is not None:
+                led_states[green_idx] = (mask >> 1) & 1
+            if yellow_idx is not None:
+                led_states[yellow_idx] = 0
+            table.append(led_states)
+        return table
+
     def is_pump_running(self, pump_index: int = None) -> bool:
         """
         判断水泵是否正在运行
@@ -102,17 +159,12 @@ class IOControl:
             # 使用传入的索引或默认索引
             index = pump_index if pump_index is not None else self.pump_index
 
-            # 读取水泵占空比（放大100倍的值）
-            duty_addr = self._pump_duty_read_start + index
-            duty_cycle = self._processed_reg_map.get_register(duty_addr)
-
-            # 读取水泵转速
-            speed_addr = self._pump_speed_start + index
-            speed = self._processed_reg_map.get_register(speed_addr)
-
-            # 读取水泵电流（单位：mA）
-            current_addr = self._pump_current_start + index
-            current = self._processed_reg_map.get_register(current_addr)
+            # 一次读取水泵占空比（放大100倍的值）、转速、电流（单位：mA）
+            duty_cycle, speed, current = self._processed_reg_map.get_registers_at((
+                self._pump_duty_read_start + index,
+                self._pump_speed_start + index,
+                self._pump_current_start + index,
+            ))
 
             # 判断条件：占空比为0，转速小于500rpm，电流小于100mA
             # 注意：duty_cycle是放大100倍的值，所以0对应0%
@@ -144,39 +196,24 @@ class IOControl:
             pump_running = self.is_pump_running()
 
             # 根据逻辑确定LED状态
-            led_states = {}
+            # 红灯：写入使能为0（系统待机）或水泵未启动时亮
+            red = 1 if (not write_enabled or not pump_running) else 0
+            # 绿灯：写入使能为1（系统启动）时亮
+            green = 1 if write_enabled else 0
+            # 黄灯：常灭
+
+            # 将LED状态打包为整数位掩码，状态未变化时直接返回，避免构建字典与重复写入
+            led_mask = red | (green << 1)
+            if led_mask == self._last_led_mask:
+                return
+
+            led_states = self._led_states_by_mask[led_mask]
 
-            # 红灯逻辑
-            if "red" in self.led_indices:
-                # 写入使能为0（系统待机）或水泵未启动时，红灯亮
-                if not write_enabled or not pump_running:
-                    led_states[self.led_indices["red"]] = 1
-                else:
-                    led_states[self.led_indices["red"]] = 0
-
-            # 绿灯逻辑
-            if "green" in self.led_indices:
-                # 写入使能为1（系统启动）时，绿灯亮
-                if write_enabled:
-                    led_states[self.led_indices["green"]] = 1
-                else:
-                    led_states[self.led_indices["green"]] = 0
-
-            # 黄灯逻辑
-            if "yellow" in self.led_indices:
-                led_states[self.led_indices["yellow"]] = 0
-
-            # 检查LED状态是否有变化，避免重复写入
-            state_changed = False
-            for idx, state in led_states.items():
-                if idx not in self.last_led_state or self.last_led_state[idx] != state:
-                    state_changed = True
-                    break
-
-            # 如果状态有变化，使用批量写入函数更新LED
-            if state_changed and led_states:
+            # 状态有变化，使用批量写入函数更新LED
+            if led_states:
                 self._batch_write_io_outputs(led_states, force=True)
-                self.last_led_state = led_states.copy()
+                self.last_led_state = led_states
+                self._last_led_mask = led_mask
 
                 # print(f"[IOControl] INFO: Updated LEDs - WriteEnable={write_enabled}, "
                 #       f"PumpRunning={pump_running}")
@@ -189,12 +226,13 @@ class IOControl:
         启动IO控制更新线程
 
         Args:
-            interval: 更新间隔，单位秒
+            interval: 最长刷新间隔，单位秒；相关状态变化时会立即刷新，
+                      无变化时按此间隔兜底刷新一次
 
         Returns:
             bool: 是否成功启动
         """
-        with self._instance_lock:
+        with self._thread_lock:
             if self._running:
                 print("[IOControl] WARNING: Update thread already running")
                 return False
@@ -203,14 +241,15 @@ class IOControl:
 
             def update_loop():
                 """IO控制更新循环"""
+                # 循环外绑定方法引用，避免每次迭代重复属性查找；
+                # update_leds 内部已捕获并记录异常，循环体无需再包一层 try/except
+                update = self.update_leds
+                changed = self._changed
                 while self._running:
-                    try:
-                        self.update_leds()
-                    except Exception as e:
-                        print(f"[IOControl] ERROR in update loop: {e}")
-
-                    # 等待指定间隔
-                    time.sleep(interval)
+                    update()
+                    # 等待状态变化事件，最长等待指定间隔
+                    changed.wait(timeout=interval)
+                    changed.clear()
 
                 print("[IOControl] INFO: Update thread stopped")
 
@@ -229,11 +268,13 @@ class IOControl:
         """
         停止IO控制更新线程
         """
-        with self._instance_lock:
+        with self._thread_lock:
             if not self._running:
                 return
 
             self._running = False
+            # 唤醒更新线程，使其尽快退出等待
+            self._changed.set()
 
             # 等待线程结束
             if self._update_thread and self._update_thread.is_alive():
@@ -265,6 +306,14 @@ class IOControl:
 io_control = IOControl()
 
 
+def _return_io_control(cls, *args, **kwargs):
+    """单例：后续 IOControl() 直接返回全局实例，无需加锁判断"""
+    return io_control
+
+
+IOControl.__new__ = _return_io_control
+
+
 def start_io_control(interval: float = 0.5) -> bool:
     """
     启动IO控制模块
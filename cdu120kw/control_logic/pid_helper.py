@@ -2,10 +2,11 @@
 PID算法实现与配置加载模块
 """
 
-import json
 import os
 from typing import Dict, Any
 
+from cdu120kw.config.json_loader import load_json_file
+
 # 配置文件默认相对路径(相对当前文件上一层目录)
 _PID_SETTINGS_PATH = "config/settings.json"
 
@@ -20,8 +21,7 @@ def _load_pid_config(config_path: str = _PID_SETTINGS_PATH) -> Dict[str, Any]:
     """
     base_dir = os.path.dirname(os.path.abspath(__file__))
     abs_path = os.path.normpath(os.path.join(base_dir, "..", config_path))
-    with open(abs_path, "r", encoding="utf-8-sig") as f:
-        return json.load(f)
+    return load_json_file(abs_path)
 
 
 # 模块导入即读取配置, 形成一次性缓存; 若文件不存在会直接抛出异常
@@ -46,13 +46,21 @@ class PidHelper:
         dt: 离散时间步长 (采样周期)
         output_min/output_max: 输出限幅上下界
         previous_error: 上一次误差, 用于计算微分
-        integral: 积分累积项
+        integral: 积分累积项(误差累加和, dt 折算进 ki)
         previous_measured_value: 预留字段
     使用:
         1. pid = PidHelper.create_from_cache()
         2. output = pid.calculate(target_value, measured_value)
         3. 根据需要调用 set_pid_var 动态调参
     """
+    # 固定属性集合, 以槽位代替实例字典, 减小实例体积并加快 calculate 中的属性访问
+    __slots__ = (
+        "kp", "ki", "kd", "dt",
+        "previous_error", "integral", "previous_measured_value",
+        "output_min", "output_max",
+        "_inv_dt", "_ki_dt", "_i_min", "_i_max",
+    )
+
     def __init__(
         self,
         kp=None,
@@ -96,6 +104,27 @@ class PidHelper:
         self.previous_error = 0.0
         self.integral = 0.0
 
+        # 预计算 1/dt 与 ki*dt, 避免每次 calculate 做除法
+        self._update_cached_terms()
+
+    def _update_cached_terms(self):
+        """
+        根据当前 ki/dt/限幅刷新缓存:
+        - _inv_dt: 1/dt, 微分项改用乘法
+        - _ki_dt: ki*dt, 积分累积只加误差, dt 折算进系数
+        - _i_min/_i_max: 积分限幅(抗积分饱和), 使积分项幅度不超过输出范围宽度
+        积分项是叠加在 last_set_var 上的偏移量而非完整输出, 因此按对称区间
+        ±(output_max - output_min)/|ki*dt| 限幅, 既可正向也可负向积分
+        dt 为 0 时微分项与积分项均视为 0; ki 为 0 时积分不限幅
+        """
+        self._inv_dt = 1.0 / self.dt if self.dt else 0.0
+        self._ki_dt = self.ki * self.dt
+        if self._ki_dt:
+            bound = abs(self.output_max - self.output_min) / abs(self._ki_dt)
+            self._i_min, self._i_max = -bound, bound
+        else:
+            self._i_min, self._i_max = float("-inf"), float("inf")
+
     @classmethod
     def create_from_cache(cls, pid_type="pid"):
         """
@@ -124,24 +153,27 @@ class PidHelper:
 
     def set_pid_var(self, kp, ki, kd, *args):
         """
-        动态更新 PID 参数
+        动态更新 PID 参数:
+        - kp/ki/kd 直接覆盖(与 __init__ 一致统一转为 float)
+        - 额外传入 (output_min, output_max, dt) 三个值时同时更新限幅与采样周期
         """
-        if self.kp != kp:
-            self.kp = kp
-        if self.ki != kp:
-            self.ki = ki
-        if self.kd != kp:
-            self.kd = kd
+        self.kp = float(kp)
+        self.ki = float(ki)
+        self.kd = float(kd)
 
         # 附加更新(三个值都提供才处理)
         if len(args) == 3:
             output_min, output_max, dt = args
-            if self.output_min != output_min:
-                self.output_min = output_min
-            if self.output_max != output_max:
-                self.output_max = output_max
-            if self.dt != dt:
-                self.dt = dt
+            self.output_min = float(output_min)
+            self.output_max = float(output_max)
+            new_dt = float(dt)
+            # 积分存的是误差累加和(dt 折算在 ki*dt 中), dt 变化时按 旧dt/新dt 折算,
+            # 保持已累积的 误差*时间 不变, 避免输出跳变
+            if new_dt and self.dt and new_dt != self.dt:
+                self.integral *= self.dt / new_dt
+            self.dt = new_dt
+
+        self._update_cached_terms()
 
     def calculate(
         self,
@@ -159,7 +191,7 @@ class PidHelper:
             is_add: True -> 误差 = 目标 - 测量; False -> 误差 = 测量 - 目标 (反向控制时使用)
         步骤:
             1. 误差计算
-            2. 积分项累积 (未做限幅或抗积分饱和处理)
+            2. 积分项累积 (按输出范围宽度对称限幅, 抗积分饱和)
             3. 微分项 = 当前误差 - 上一误差 / dt (未滤波, 噪声较大会放大)
             4. PID 合成 + 外加偏置
             5. 限幅输出到 [output_min, output_max]
@@ -168,24 +200,34 @@ class PidHelper:
             限幅后的控制输出值
         """
         # 1. 误差
-        error = target_value - measured_value if is_add else measured_value - target_value
+        if is_add:
+            error = target_value - measured_value
+        else:
+            error = measured_value - target_value
 
         # 2. 比例项
         proportional = self.kp * error
 
-        # 3. 积分项累加(若长时间偏差大可能导致积分飘逸)
-        self.integral += error * self.dt
-        integral_term = self.ki * self.integral
+        # 3. 积分项累加(dt 已折算进 _ki_dt), 并限幅防止长时间偏差导致积分饱和
+        integral = self.integral + error
+        if integral > self._i_max:
+            integral = self._i_max
+        elif integral < self._i_min:
+            integral = self._i_min
+        self.integral = integral
+        integral_term = self._ki_dt * integral
 
-        # 4. 微分项(基于误差变化率)
-        derivative = (error - self.previous_error) / self.dt
-        derivative_term = self.kd * derivative
+        # 4. 微分项(基于误差变化率, 乘 1/dt 代替除法)
+        derivative_term = self.kd * (error - self.previous_error) * self._inv_dt
 
         # 5. PID 合成 + 外部偏置量
         output = proportional + integral_term + derivative_term + last_set_var
 
-        # 6. 限幅处理(防止输出超出执行器能力范围)
-        output = max(self.output_min, min(self.output_max, output))
+        # 6. 限幅处理(防止输出超出执行器能力范围), 比较代替 max/min 函数调用
+        if output > self.output_max:
+            output = self.output_max
+        if output < self.output_min:
+            output = self.output_min
 
         # 7. 存储误差用于下一周期微分计算
         self.previous_error = error
@@ -5,11 +5,14 @@
 
 import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import re
 import signal
 import sys
 import tempfile
-import time
+import threading
 from typing import Optional, TextIO
 
 import portalocker
@@ -17,17 +20,55 @@ import portalocker
 
 # 配置日志系统，忽略pymodbus库中的特定噪音日志，以减少日志污染
 class IgnorePymodbusNoise(logging.Filter):
+    # 噪音日志匹配模式，导入时编译一次
+    _NOISE_RE = re.compile(r"failed: timed out|could not open port")
+
+    def _is_noise(self, msg: str) -> bool:
+        # 先做廉价子串预检，未命中（常见情况）直接返回，命中后再做精确匹配
+        if "timed out" not in msg and "could not open port" not in msg:
+            return False
+        return self._NOISE_RE.search(msg) is not None
+
     def filter(self, record):
-        msg = record.getMessage()
-        if "failed: timed out" in msg:
+        # 先匹配原始格式串，命中则无需做参数格式化
+        if isinstance(record.msg, str) and self._is_noise(record.msg):
             return False
-        if "could not open port" in msg:
+        # 只有带参数时噪音内容才可能出现在格式化结果中
+        if record.args and self._is_noise(record.getMessage()):
             return False
         return True
 
 logging.getLogger("pymodbus").addFilter(IgnorePymodbusNoise())
 logging.getLogger("pymodbus.logging").addFilter(IgnorePymodbusNoise())
 
+# 日志经队列转交后台监听线程输出：业务线程只负责入队，格式化写出的 I/O 不阻塞控制/HMI 回调线程
+_log_queue = queue.SimpleQueue()
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging(level: int = logging.INFO):
+    """
+    初始化根日志：根日志器只挂 QueueHandler，由 QueueListener 在后台线程中调用控制台处理器输出
+    输出格式与 print 日志保持一致：[模块名] 级别: 消息
+    本项目模块输出 INFO 及以上级别；pymodbus 自身只输出 WARNING 及以上，避免其调试信息刷屏
+    """
+    global _log_listener
+
+    if _log_listener is not None:
+        return
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter("[%(name)s] %(levelname)s: %(message)s"))
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    logging.getLogger("pymodbus").setLevel(max(level, logging.WARNING))
+    root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+
+    _log_listener = logging.handlers.QueueListener(_log_queue, console_handler, respect_handler_level=True)
+    _log_listener.start()
+    # 退出时停止监听线程，确保队列中剩余日志全部输出
+    atexit.register(_log_listener.stop)
+
 def get_resource_path(relative_path):
     """获取资源的绝对路径，兼容开发环境和打包环境"""
     try:
@@ -83,6 +124,8 @@ def cleanup_lock_file():
 # 全局变量，用于跟踪清理状态
 is_cleaning_up = False
 interrupt_count = 0
+# 退出事件：信号处理器置位后主线程结束等待并执行清理
+shutdown_event = threading.Event()
 
 def signal_handler(sig, frame):
     """
@@ -103,12 +146,17 @@ def signal_handler(sig, frame):
     is_cleaning_up = True
     print("[Main] INFO: Received interrupt signal, start cleaning resources...")
     print("[Main] INFO: Please wait for the cleaning to complete and do not press again Ctrl+C")
+    shutdown_event.set()
 
 if __name__ == "__main__":
     controller = None
 
-    # 注册信号处理器
+    setup_logging()
+
+    # 注册信号处理器（SIGTERM 为 systemd 停止服务时发送的信号）
     signal.signal(signal.SIGINT, signal_handler)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, signal_handler)
 
     if is_already_running_with_lock():
         print("[Main] ERROR: The program is already running and cannot open multiple instances。")
@@ -121,9 +169,14 @@ if __name__ == "__main__":
         controller = AppController()
         controller.start_service()
 
-        # 主循环
-        while True:
-            time.sleep(0.1)  # 更短的睡眠时间，以便更快响应信号
+        # 主线程阻塞等待退出事件：POSIX 下锁等待可被信号中断，无需超时；
+        # Windows 下无超时等待无法响应 Ctrl+C，保留 1 秒分段等待
+        wait_timeout = None if os.name == "posix" else 1.0
+        while not shutdown_event.wait(timeout=wait_timeout):
+            pass
+
+        controller.cleanup()
+        print("[Main] INFO: Resource cleaning completed, program exit")
 
     except KeyboardInterrupt:
         # 这里应该不会被执行，因为信号处理器已经接管了中断
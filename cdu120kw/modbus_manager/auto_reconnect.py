@@ -2,11 +2,15 @@
 Modbus自动重连管理器，支持线程池异步回调，TCP和RTU功能分离，公共逻辑抽象为基类
 """
 
+import logging
+import random
 import threading
 from typing import Callable, Optional
 
 from cdu120kw.task.task_thread_pool import ThreadPoolManager
 
+logger = logging.getLogger(__name__)
+
 
 class BaseAutoReconnectManager:
     """
@@ -21,15 +25,24 @@ class BaseAutoReconnectManager:
         thread_pool: Optional[ThreadPoolManager] = None,
     ):
         self.conn_manager = connection_manager
-        self.reconnect_interval = 1  # 重连间隔秒
+        # 回填到连接管理器，供安全调用判断是否已在重连中
+        connection_manager.reconnect_manager = self
+        self.reconnect_interval_min = 1   # 重连间隔下限（秒），首次失败后的等待时间
+        self.reconnect_interval_max = 30  # 重连间隔上限（秒），长时间断线后的最大等待时间
         self.active = False
         self.stop_requested = False
         self.reconnect_attempts = 0
         self.is_reconnecting = False
-        self.reconnect_timer = None
         self.reconnect_callback = reconnect_callback
         self.has_logged_disconnect = False  # 标记是否已输出断开日志
         self.thread_pool = thread_pool
+        # 重连循环：断线期间按间隔重试，避免每次重试新建 Timer 线程
+        # 有线程池时循环作为线程池任务运行、重连成功即归还工作线程；无线程池时使用常驻重连线程
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._worker_name = logger_name
+        self._loop_running = False
 
     def start(self):
         """
@@ -43,11 +56,11 @@ class BaseAutoReconnectManager:
         self.reconnect_attempts = 0
         self.is_reconnecting = False
         self.has_logged_disconnect = False
-        print("[AutoReconnect] INFO: Auto reconnection monitoring started")
+        logger.info("Auto reconnection monitoring started")
         # 启动时如果未连接，立即进入重连循环
         if not self.conn_manager.is_connected():
             self.is_reconnecting = True
-            self._start_reconnect_timer()
+            self._wake_reconnect_worker()
 
     def stop(self):
         """
@@ -60,9 +73,9 @@ class BaseAutoReconnectManager:
         self.is_reconnecting = False
         self.reconnect_attempts = 0
         self.has_logged_disconnect = False
-        if self.reconnect_timer:
-            self.reconnect_timer.cancel()
-        print("[AutoReconnect] INFO: Auto reconnection monitoring stopped")
+        # 唤醒重连线程使其退出等待并结束
+        self._wake.set()
+        logger.info("Auto reconnection monitoring stopped")
 
     def is_active(self):
         """
@@ -79,22 +92,74 @@ class BaseAutoReconnectManager:
     def trigger_reconnect(self):
         """
         由轮询任务调用，触发重连流程
+        多个轮询线程可能同时触发，检查与置位 is_reconnecting 在锁内原子完成，只有一个调用者继续
         """
-        if not self.active or self.stop_requested or self.is_reconnecting:
-            return
-        self.is_reconnecting = True
-        # 只在第一次断开时输出断开日志
-        if not self.has_logged_disconnect:
-            print("[AutoReconnect] INFO: Connection lost, start reconnecting...")
+        with self._worker_lock:
+            if not self.active or self.stop_requested or self.is_reconnecting:
+                return
+            self.is_reconnecting = True
+            first_disconnect = not self.has_logged_disconnect
             self.has_logged_disconnect = True
-        self._start_reconnect_timer()
+        # 只在第一次断开时输出断开日志
+        if first_disconnect:
+            logger.info("Connection lost, start reconnecting...")
+        self._wake_reconnect_worker()
 
-    def _start_reconnect_timer(self):
+    def _wake_reconnect_worker(self):
         """
-        启动重连定时器
+        唤醒重连循环立即尝试重连，循环未运行时启动：
+        有线程池时提交到线程池，否则创建常驻重连线程
         """
-        self.reconnect_timer = threading.Timer(0, self._attempt_reconnect)
-        self.reconnect_timer.start()
+        with self._worker_lock:
+            if self._loop_running:
+                self._wake.set()
+                return
+            self._loop_running = True
+
+        if self.thread_pool:
+            self.thread_pool.submit(self._reconnect_loop)
+        else:
+            self._worker = threading.Thread(
+                target=self._reconnect_loop,
+                daemon=True,
+                name=self._worker_name,
+            )
+            self._worker.start()
+
+    def _reconnect_loop(self):
+        """
+        重连循环：
+        - 处于重连状态时执行一次重连，失败则等待重连间隔后再试
+        - 重连成功后：线程池模式直接结束并归还工作线程；常驻线程模式无限期等待 trigger_reconnect 唤醒
+        - stop 后退出
+        """
+        try:
+            while self.active and not self.stop_requested:
+                timeout = None
+                if self.is_reconnecting:
+                    self._attempt_reconnect()
+                    if self.is_reconnecting:
+                        timeout = self._next_reconnect_delay()
+                if timeout is None and self.thread_pool:
+                    break
+                self._wake.wait(timeout)
+                self._wake.clear()
+        finally:
+            with self._worker_lock:
+                self._loop_running = False
+
+        # 退出期间若又被触发重连（唤醒信号已被忽略），重新启动循环
+        if self.is_reconnecting and self.active and not self.stop_requested:
+            self._wake_reconnect_worker()
+
+    def _next_reconnect_delay(self) -> float:
+        """
+        计算下一次重连等待时间：按失败次数指数退避（封顶 reconnect_interval_max），
+        并叠加 ±20% 随机抖动，避免多台设备同时重连
+        """
+        exponent = min(max(self.reconnect_attempts - 1, 0), 5)
+        delay = min(self.reconnect_interval_max, self.reconnect_interval_min * (2 ** exponent))
+        return delay * random.uniform(0.8, 1.2)
 
     def _run_callback_async(self):
         """
@@ -103,10 +168,10 @@ class BaseAutoReconnectManager:
         if self.reconnect_callback:
             if self.thread_pool:
                 self.thread_pool.submit(self.reconnect_callback)
-                print("[AutoReconnect] INFO: Reconnect callback submitted to thread pool")
+                logger.info("Reconnect callback submitted to thread pool")
             else:
                 self.reconnect_callback()
-                print("[AutoReconnect] INFO: Reconnect callback executed synchronously")
+                logger.info("Reconnect callback executed synchronously")
 
     def _attempt_reconnect(self):
         """
@@ -132,45 +197,41 @@ class TcpAutoReconnectManager(BaseAutoReconnectManager):
             logger_name="auto_reconnect.tcp",
             thread_pool=thread_pool,
         )
+        # 连接管理器是否支持按 ip/port 重连，只在初始化时判断一次
+        self._has_ip_port = hasattr(connection_manager, "ip") and hasattr(connection_manager, "port")
 
     def _attempt_reconnect(self):
         """
         执行TCP重连操作
         """
         if not self.active or self.stop_requested:
-            print("[AutoReconnect] INFO: TCP _attempt_reconnect aborted: inactive/stopped")
+            logger.info("TCP _attempt_reconnect aborted: inactive/stopped")
             self.is_reconnecting = False
             return
 
         self.reconnect_attempts += 1
         success = False
         try:
-            ip = getattr(self.conn_manager, "ip", None)
-            port = getattr(self.conn_manager, "port", None)
-            self.conn_manager.disconnect()
-            if ip and port:
-                success = self.conn_manager.start_tcpconnect(ip, port)
+            conn_manager = self.conn_manager
+            conn_manager.disconnect()
+            if self._has_ip_port and conn_manager.ip and conn_manager.port:
+                success = conn_manager.start_tcpconnect(conn_manager.ip, conn_manager.port)
             else:
-                success = self.conn_manager.connect()
+                success = conn_manager.connect()
 
             if success:
-                print("[AutoReconnect] INFO: TCP reconnect successfully")
+                logger.info("TCP reconnect successfully")
                 self.reconnect_attempts = 0
                 self.is_reconnecting = False
                 self.has_logged_disconnect = False
                 self._run_callback_async()  # 用线程池异步执行回调
                 return
         except Exception as e:
-            print(f"[AutoReconnect] ERROR: TCP reconnect attempt exception: {str(e)}")
+            logger.error("TCP reconnect attempt exception: %s", e)
 
-        # 重连失败后持续调度下一次重连
-        if self.active and not self.stop_requested:
-            self.reconnect_timer = threading.Timer(
-                self.reconnect_interval, self._attempt_reconnect
-            )
-            self.reconnect_timer.start()
-        else:
-            print("[AutoReconnect] INFO: TCP _attempt_reconnect exit: inactive/stopped")
+        # 重连失败后由重连线程等待重连间隔后再次调度
+        if not self.active or self.stop_requested:
+            logger.info("TCP _attempt_reconnect exit: inactive/stopped")
             self.is_reconnecting = False
 
 
@@ -197,7 +258,7 @@ class RtuAutoReconnectManager(BaseAutoReconnectManager):
         执行RTU重连操作
         """
         if not self.active or self.stop_requested:
-            print("[AutoReconnect] INFO: RTU _attempt_reconnect aborted: inactive/stopped")
+            logger.info("RTU _attempt_reconnect aborted: inactive/stopped")
             self.is_reconnecting = False
             return
 
@@ -208,21 +269,16 @@ class RtuAutoReconnectManager(BaseAutoReconnectManager):
             success = self.conn_manager.start_rtuconnect()
             if success:
                 self.conn_manager.connected = True
-                print("[AutoReconnect] INFO: RTU connection re-established successfully")
+                logger.info("RTU connection re-established successfully")
                 self.reconnect_attempts = 0
                 self.is_reconnecting = False
                 self.has_logged_disconnect = False
                 self._run_callback_async()  # 用线程池异步执行回调
                 return
         except Exception as e:
-            print(f"[AutoReconnect] ERROR: RTU reconnect attempt exception: {str(e)}")
+            logger.error("RTU reconnect attempt exception: %s", e)
 
-        # 重连失败后持续调度下一次重连
-        if self.active and not self.stop_requested:
-            self.reconnect_timer = threading.Timer(
-                self.reconnect_interval, self._attempt_reconnect
-            )
-            self.reconnect_timer.start()
-        else:
-            print("[AutoReconnect] INFO: RTU _attempt_reconnect exit: inactive/stopped")
+        # 重连失败后由重连线程等待重连间隔后再次调度
+        if not self.active or self.stop_requested:
+            logger.info("RTU _attempt_reconnect exit: inactive/stopped")
             self.is_reconnecting = False
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+按工作模式共享的批量读取器/写入器，读写器本身无状态，可跨线程共享
+"""
+
+from modbus_manager.batch_reader import ModbusBatchReader
+from modbus_manager.batch_writer import ModbusBatchWriter
+from modbus_manager.modbusrtu_manager import modbusrtu_manager
+from modbus_manager.modbustcp_manager import modbustcp_manager
+
+_READERS = {
+    "tcp": ModbusBatchReader(modbustcp_manager),
+    "rtu": ModbusBatchReader(modbusrtu_manager),
+}
+_WRITERS = {
+    "tcp": ModbusBatchWriter(modbustcp_manager),
+    "rtu": ModbusBatchWriter(modbusrtu_manager),
+}
+
+
+def get_reader(mode: str) -> ModbusBatchReader:
+    """
+    根据模式获取批量读取器，非 tcp 模式均使用 rtu
+    """
+    return _READERS["tcp"] if mode == "tcp" else _READERS["rtu"]
+
+
+def get_writer(mode: str) -> ModbusBatchWriter:
+    """
+    根据模式获取批量写入器，非 tcp 模式均使用 rtu
+    """
+    return _WRITERS["tcp"] if mode == "tcp" else _WRITERS["rtu"]
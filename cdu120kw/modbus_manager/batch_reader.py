@@ -25,7 +25,7 @@ class ModbusBatchReader:
         client = self.client_manager.get_client()
         if not client:
             return None, "ConnectionError"
-        last_error = None
+        last_exc = None
         for attempt in range(self.max_retry):
             try:
                 result = client.read_holding_registers(address=start_address, count=count, slave=slave)
@@ -33,8 +33,9 @@ class ModbusBatchReader:
                     continue
                 return result.registers, None
             except Exception as e:
-                last_error = f"Error: {str(e)}"
-        return None, last_error
+                # 只保存异常对象，失败返回时再格式化
+                last_exc = e
+        return None, (f"Error: {last_exc}" if last_exc is not None else None)
 
     def read_coils(self, start_address: int, count: int, slave: int = 1):
         """
@@ -44,7 +45,7 @@ class ModbusBatchReader:
         client = self.client_manager.get_client()
         if not client:
             return None, "ConnectionError"
-        last_error = None
+        last_exc = None
         for attempt in range(self.max_retry):
             try:
                 result = client.read_coils(address=start_address, count=count, slave=slave)
@@ -52,5 +53,6 @@ class ModbusBatchReader:
                     continue
                 return result.bits, None
             except Exception as e:
-                last_error = f"Error: {str(e)}"
-        return None, last_error
+                # 只保存异常对象，失败返回时再格式化
+                last_exc = e
+        return None, (f"Error: {last_exc}" if last_exc is not None else None)
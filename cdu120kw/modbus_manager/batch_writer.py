@@ -25,7 +25,7 @@ class ModbusBatchWriter:
         client = self.client_manager.get_client()
         if not client:
             return "ConnectionError"
-        last_error = None
+        last_exc = None
         for attempt in range(self.max_retry):
             try:
                 result = client.write_registers(address=start_address, values=values, slave=slave)
@@ -33,8 +33,9 @@ class ModbusBatchWriter:
                     continue
                 return None
             except Exception as e:
-                last_error = f"Error: {str(e)}"
-        return last_error
+                # 只保存异常对象，失败返回时再格式化
+                last_exc = e
+        return f"Error: {last_exc}" if last_exc is not None else None
 
     def write_coils(self, start_address: int, values: list[bool], slave: int = 1):
         """
@@ -44,7 +45,7 @@ class ModbusBatchWriter:
         client = self.client_manager.get_client()
         if not client:
             return "ConnectionError"
-        last_error = None
+        last_exc = None
         for attempt in range(self.max_retry):
             try:
                 result = client.write_coils(address=start_address, values=values, slave=slave)
@@ -52,5 +53,72 @@ class ModbusBatchWriter:
                     continue
                 return None
             except Exception as e:
-                last_error = f"Error: {str(e)}"
-        return last_error
+                # 只保存异常对象，失败返回时再格式化
+                last_exc = e
+        return f"Error: {last_exc}" if last_exc is not None else None
+
+    def write_register(self, address: int, value: int, slave: int = 1):
+        """
+        写入单个保持寄存器
+        :return: 错误信息或None
+        """
+        client = self.client_manager.get_client()
+        if not client:
+            return "ConnectionError"
+        last_exc = None
+        for attempt in range(self.max_retry):
+            try:
+                result = client.write_register(address=address, value=value, slave=slave)
+                if result.isError():
+                    continue
+                return None
+            except Exception as e:
+                # 只保存异常对象，失败返回时再格式化
+                last_exc = e
+        return f"Error: {last_exc}" if last_exc is not None else None
+
+    def write_coil(self, address: int, value: bool, slave: int = 1):
+        """
+        写入单个线圈
+        :return: 错误信息或None
+        """
+        client = self.client_manager.get_client()
+        if not client:
+            return "ConnectionError"
+        last_exc = None
+        for attempt in range(self.max_retry):
+            try:
+                result = client.write_coil(address=address, value=value, slave=slave)
+                if result.isError():
+                    continue
+                return None
+            except Exception as e:
+                # 只保存异常对象，失败返回时再格式化
+                last_exc = e
+        return f"Error: {last_exc}" if last_exc is not None else None
+
+    def write_registers_multi(self, blocks, slave: int = 1):
+        """
+        按连续地址块批量写入保持寄存器，每个块发送一帧（FC16）
+        :param blocks: [(起始地址, 值序列), ...]
+        :return: 错误信息或None，某块失败时仍继续写入其余块
+        """
+        errors = []
+        for start_address, values in blocks:
+            err = self.write_registers(start_address, values, slave)
+            if err:
+                errors.append(f"{start_address}: {err}")
+        return "; ".join(errors) if errors else None
+
+    def write_coils_multi(self, blocks, slave: int = 1):
+        """
+        按连续地址块批量写入线圈，每个块发送一帧（FC15）
+        :param blocks: [(起始地址, 值序列), ...]
+        :return: 错误信息或None，某块失败时仍继续写入其余块
+        """
+        errors = []
+        for start_address, values in blocks:
+            err = self.write_coils(start_address, values, slave)
+            if err:
+                errors.append(f"{start_address}: {err}")
+        return "; ".join(errors) if errors else None
@@ -2,29 +2,52 @@
 Modbus连接管理器基类
 """
 
+import logging
 import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 
 class ModbusConnectionManagerBase:
     """
     Modbus连接管理器基类
     只封装通用连接、断开等功能，去除心跳和监控线程，连接状态由轮询任务判断
+    单例由各子类模块在导入时创建（模块导入本身已串行化），直接导入模块级的 modbustcp_manager/modbusrtu_manager 使用
     """
 
-    _instance = None
-    _lock = threading.Lock()
-
-    def __new__(cls, *args, **kwargs):
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super().__new__(cls)
-        return cls._instance
+    # 连接失败日志限频间隔（秒）：首次失败必打印，之后最多每个间隔打印一次
+    FAILURE_LOG_INTERVAL = 30.0
 
     def __init__(self):
         self.client = None
         self.connected = False
         self.connection_lock = threading.Lock()
         self.auto_reconnect = True
+        self._reconnect_attempts = 0
+        self._last_warn_ts = 0.0
+        # 关联的自动重连管理器，由 BaseAutoReconnectManager 创建时回填
+        self.reconnect_manager = None
+        # 最近一次已关闭的 client，保证同一 client 实例只 close 一次
+        self._closed_client = None
+
+    def _should_log_failure(self) -> bool:
+        """
+        连接失败日志限频：首次失败或距上次打印超过 FAILURE_LOG_INTERVAL 时返回 True 并记录时间
+        断线重连期间避免每次重试都输出日志
+        """
+        now = time.monotonic()
+        if self._reconnect_attempts <= 1 or now - self._last_warn_ts > self.FAILURE_LOG_INTERVAL:
+            self._last_warn_ts = now
+            return True
+        return False
+
+    def _reconnect_manager_is_active(self) -> bool:
+        """
+        关联的自动重连管理器是否正处于重连周期中
+        """
+        mgr = self.reconnect_manager
+        return mgr is not None and mgr.active and mgr.is_reconnecting
 
     def connect(self, *args, **kwargs) -> bool:
         """
@@ -37,17 +60,26 @@ class ModbusConnectionManagerBase:
         断开连接，释放资源
         """
         with self.connection_lock:
-            if self.client:
-                try:
-                    self.client.close()
-                    print("Connection closed")
-                except Exception as e:
-                    print(f"Close connection exception: {str(e)}")
-                finally:
-                    self.connected = False
-                    self.client = None
+            self._close_client()
+            self.connected = False
+            self.client = None
         return True
 
+    def _close_client(self):
+        """
+        关闭当前 client，调用方需持有 connection_lock
+        同一 client 实例已关闭过则直接跳过，避免重连期间重复 close 串口/套接字
+        """
+        client = self.client
+        if client is None or client is self._closed_client:
+            return
+        self._closed_client = client
+        try:
+            client.close()
+            logger.info("Connection closed")
+        except Exception as e:
+            logger.warning("Close connection exception: %s", e)
+
     def get_client(self):
         """
         获取连接对象（抽象方法，需子类实现）
@@ -2,6 +2,7 @@
 Modbus RTU连接管理器
 """
 
+import logging
 import threading
 import time
 from typing import Optional
@@ -10,6 +11,8 @@ from pymodbus.client import ModbusSerialClient
 
 from cdu120kw.modbus_manager.modbusconnect_manager import ModbusConnectionManagerBase
 
+logger = logging.getLogger(__name__)
+
 
 class ModbusRTUConnectionManager(ModbusConnectionManagerBase):
     """
@@ -50,71 +53,75 @@ class ModbusRTUConnectionManager(ModbusConnectionManagerBase):
         建立RTU连接
         连接失败时不抛异常，返回False，由调用方决定后续动作
         连接成功后重置重连状态
+        打开串口可能阻塞较久，构建与 connect() 在锁外进行，锁内只做关闭旧连接和发布结果
         """
         with self.connection_lock:
             if self.connected:
                 return True
-            try:
-                if self.client:
-                    try:
-                        self.client.close()
-                    except Exception as e:
-                        print(f"[ModbusRTUConnection] ERROR: Error closing old RTU connection: {e}")
-                self.client = ModbusSerialClient(
-                    port=self.port,
-                    baudrate=self.baudrate,
-                    bytesize=self.bytesize,
-                    parity=self.parity,
-                    stopbits=self.stopbits,
-                    timeout=self.timeout,
-                )
-                if self.client.connect():
-                    self.connected = True
-                    print("[ModbusRTUConnection] INFO: RTU connection re-established successfully")
-                    self._has_logged_disconnect = False
-                    self._reconnect_attempts = 0
-                    self._last_connect_error = None
-                    return True
-                else:
-                    self.connected = False
-                    self.client = None
-                    self._reconnect_attempts += 1
-                    if not self._has_logged_disconnect:
-                        print("[ModbusRTUConnection] WARNING: RTU connection lost, start reconnecting...")
-                        self._has_logged_disconnect = True
-            except Exception as e:
+            # 旧 client 若已由 disconnect/安全调用关闭或已置空，则不再重复关闭
+            self._close_client()
+            self.client = None
+            params = dict(
+                port=self.port,
+                baudrate=self.baudrate,
+                bytesize=self.bytesize,
+                parity=self.parity,
+                stopbits=self.stopbits,
+                timeout=self.timeout,
+            )
+
+        try:
+            new_client = ModbusSerialClient(**params)
+            ok = new_client.connect()
+        except Exception as e:
+            with self.connection_lock:
+                self._reconnect_attempts += 1
                 err_str = str(e)
+                # 新的错误信息立即打印，重复错误按限频间隔打印
                 if self._last_connect_error != err_str:
-                    print(f"[ModbusRTUConnection] ERROR: RTU connection error: {err_str}")
+                    logger.error("RTU connection error: %s", err_str)
                     self._last_connect_error = err_str
-                else:
-                    print(f"[ModbusRTUConnection] ERROR: RTU connection error (repeat): {err_str}")
+                    self._last_warn_ts = time.monotonic()
+                elif self._should_log_failure():
+                    logger.error("RTU connection error (repeat, attempt=%s): %s", self._reconnect_attempts, err_str)
                 self.client = None
                 self.connected = False
-                return False
+            return False
 
-    def get_client(self) -> Optional[ModbusSerialClient]:
-        """
-        获取RTU客户端对象，判断socket属性
-        """
         with self.connection_lock:
-            if self.connected and self.client and getattr(self.client, "socket", None):
-                return self.client
-            return None
+            if self.connected:
+                # 并发的另一次连接已先完成，丢弃本次新建的 client
+                if ok:
+                    new_client.close()
+                return True
+            if ok:
+                self.client = new_client
+                self.connected = True
+                logger.info("RTU connection re-established successfully")
+                self._has_logged_disconnect = False
+                self._reconnect_attempts = 0
+                self._last_connect_error = None
+                return True
+            self.client = None
+            self.connected = False
+            self._reconnect_attempts += 1
+            if not self._has_logged_disconnect:
+                logger.warning("RTU connection lost, start reconnecting...")
+                self._has_logged_disconnect = True
+            elif self._should_log_failure():
+                logger.warning("RTU reconnect still failing, attempt=%s", self._reconnect_attempts)
+            return False
 
-    def disconnect(self):
+    def get_client(self) -> Optional[ModbusSerialClient]:
         """
-        断开RTU连接，彻底释放资源
+        获取RTU客户端对象，判断socket属性
+        轮询热路径无锁读取：先把 client/connected 读入局部变量再校验，
+        单个属性读取由 GIL 保证原子性，连接/断开等写操作仍持有 connection_lock
         """
-        with self.connection_lock:
-            if self.client:
-                try:
-                    self.client.close()
-                    print("[ModbusRTUConnection] INFO: RTU connection closed")
-                except Exception as e:
-                    print(f"[ModbusRTUConnection] WARNING: Error closing RTU connection: {e}")
-                self.client = None
-            self.connected = False
+        client = self.client
+        if self.connected and client and getattr(client, "socket", None):
+            return client
+        return None
 
     def is_connected(self):
         """
@@ -135,26 +142,33 @@ class ModbusRTUConnectionManager(ModbusConnectionManagerBase):
 def safe_modbusrtu_call(func, *args, **kwargs):
     """
     RTU安全调用，统一异常处理和重试机制
+    自动重连已在进行时不再等待重试，直接快速返回；否则仅在两次尝试之间短暂等待
     """
     max_retries = 2
     for attempt in range(max_retries):
         client = modbusrtu_manager.get_client()
         if not client:
-            print("[ModbusRTUConnection] ERROR: No available RTU connection")
+            logger.error("No available RTU connection")
             return None
         try:
             return func(client, *args, **kwargs)
         except Exception as e:
-            print(f"[ModbusRTUConnection] WARNING: RTU operation failed (attempt {attempt + 1}/{max_retries}): {str(e)}")
+            logger.warning("RTU operation failed (attempt %s/%s): %s", attempt + 1, max_retries, e)
             with modbusrtu_manager.connection_lock:
-                try:
-                    client.close()
-                except Exception as e:
-                    print(f"[ModbusRTUConnection] WARNING: Error closing RTU connection: {e}")
+                if client is modbusrtu_manager.client:
+                    modbusrtu_manager._close_client()
+                else:
+                    try:
+                        client.close()
+                    except Exception as e:
+                        logger.warning("Error closing RTU connection: %s", e)
                 modbusrtu_manager.connected = False
-            time.sleep(0.5)
-    print(f"[ModbusRTUConnection] ERROR: RTU operation failed after {max_retries} attempts")
+            if modbusrtu_manager._reconnect_manager_is_active():
+                break
+            if attempt + 1 < max_retries:
+                time.sleep(0.05)
+    logger.error("RTU operation failed after %s attempts", max_retries)
     return None
 
 
-modbusrtu_manager = ModbusRTUConnectionManager()
\ No newline at end of file
+modbusrtu_manager = ModbusRTUConnectionManager()
@@ -2,6 +2,7 @@
 Modbus TCP连接管理器
 """
 
+import logging
 import socket
 import time
 from typing import Optional
@@ -12,6 +13,11 @@ from pymodbus.client import ModbusTcpClient
 from cdu120kw.config.config_manager import get_config
 from cdu120kw.modbus_manager.modbusconnect_manager import ModbusConnectionManagerBase
 
+logger = logging.getLogger(__name__)
+
+# is_socket_open() 结果缓存有效期（秒），轮询热路径内复用，减少 socket 系统调用
+SOCKET_CHECK_TTL = 0.05
+
 
 class ModbusTCPConnectionManager(ModbusConnectionManagerBase):
     """
@@ -26,6 +32,30 @@ class ModbusTCPConnectionManager(ModbusConnectionManagerBase):
         self.port = config.get("port", 5000)
         self._has_logged_disconnect = False
         self._reconnect_attempts = 0
+        # socket 状态缓存：记录被检查的 client，连接重建后自动失效
+        self._socket_ok = False
+        self._socket_ok_ts = 0.0
+        self._socket_ok_client = None
+
+    def _socket_open(self, client: ModbusTcpClient) -> bool:
+        """
+        带短时缓存的 client.is_socket_open()
+        同一 client 在 SOCKET_CHECK_TTL 内直接返回上次结果
+        """
+        now = time.monotonic()
+        if client is self._socket_ok_client and now - self._socket_ok_ts < SOCKET_CHECK_TTL:
+            return self._socket_ok
+        ok = client.is_socket_open()
+        self._socket_ok = ok
+        self._socket_ok_client = client
+        self._socket_ok_ts = now
+        return ok
+
+    def invalidate_socket_cache(self):
+        """
+        通讯异常时立即作废 socket 状态缓存，避免在有效期内继续使用已损坏的连接
+        """
+        self._socket_ok = False
 
     def start_tcpconnect(self, ip: str = None, port: int = None) -> bool:
         """
@@ -40,54 +70,73 @@ class ModbusTCPConnectionManager(ModbusConnectionManagerBase):
         with self.connection_lock:
             if self.connected:
                 return True
-            try:
-                if self.client:
-                    try:
-                        self.client.close()
-                    except (ConnectionError, OSError) as e:
-                        print(f"[ModbusTCPConnection] ERROR: Error closing old connection: {e}")
-                # 加快失败返回
-                self.client = ModbusTcpClient(host=self.ip, port=self.port, retries=0, timeout=0.3)
-                if self.client.connect():
-                    self.connected = True
-                    self.auto_reconnect = True
-                    print("[ModbusTCPConnection] INFO: TCP connection re-established successfully")
-                    self._has_logged_disconnect = False
-                    self._reconnect_attempts = 0
-                    return True
-                else:
-                    self.client = None
-                    self.connected = False
-                    self._reconnect_attempts += 1
-                    if not self._has_logged_disconnect:
-                        print("[ModbusTCPConnection] WARNING: TCP connection lost, start reconnecting...")
-                        self._has_logged_disconnect = True
-            except (ConnectionRefusedError, TimeoutError, socket.gaierror, pymodbus.exceptions.ModbusException) as e:
-                print(f"[ModbusTCPConnection] ERROR: TCP connection exception: {str(e)}")
+            self._close_client()
+            self.client = None
+            host, port = self.ip, self.port
+
+        # 建立连接在锁外进行，避免 connect() 阻塞期间其他线程等待 connection_lock
+        try:
+            # 加快失败返回
+            new_client = ModbusTcpClient(host=host, port=port, retries=0, timeout=0.3)
+            ok = new_client.connect()
+        except (ConnectionRefusedError, TimeoutError, socket.gaierror, pymodbus.exceptions.ModbusException) as e:
+            with self.connection_lock:
+                self._reconnect_attempts += 1
+                if self._should_log_failure():
+                    logger.error("TCP connection exception (attempt=%s): %s", self._reconnect_attempts, e)
                 self.client = None
                 self.connected = False
-                return False
-            except OSError as e:
-                print(f"[ModbusTCPConnection] ERROR: Network anomaly: {str(e)}")
+            return False
+        except OSError as e:
+            with self.connection_lock:
+                self._reconnect_attempts += 1
+                if self._should_log_failure():
+                    logger.error("Network anomaly (attempt=%s): %s", self._reconnect_attempts, e)
                 self.client = None
                 self.connected = False
-                return False
+            return False
+
+        with self.connection_lock:
+            if self.connected:
+                # 并发的另一次连接已先完成，丢弃本次新建的 client
+                if ok:
+                    new_client.close()
+                return True
+            if ok:
+                self.client = new_client
+                self.connected = True
+                self.auto_reconnect = True
+                logger.info("TCP connection re-established successfully")
+                self._has_logged_disconnect = False
+                self._reconnect_attempts = 0
+                return True
+            self.client = None
+            self.connected = False
+            self._reconnect_attempts += 1
+            if not self._has_logged_disconnect:
+                logger.warning("TCP connection lost, start reconnecting...")
+                self._has_logged_disconnect = True
+            elif self._should_log_failure():
+                logger.warning("TCP reconnect still failing, attempt=%s", self._reconnect_attempts)
             return False
 
     def get_client(self) -> Optional[ModbusTcpClient]:
         """
         获取TCP客户端对象，判断socket是否打开
+        轮询热路径无锁读取：先把 client/connected 读入局部变量再校验，
+        单个属性读取由 GIL 保证原子性，连接/断开等写操作仍持有 connection_lock
         """
-        with self.connection_lock:
-            if self.connected and self.client and self.client.is_socket_open():
-                return self.client
-            return None
+        client = self.client
+        if self.connected and client and self._socket_open(client):
+            return client
+        return None
 
     def is_connected(self) -> bool:
         """
         只判断TCP底层连接对象是否存在，不主动发起读操作
         """
-        return self.connected and self.client and self.client.is_socket_open()
+        client = self.client
+        return self.connected and client and self._socket_open(client)
 
     def reset_reconnect_state(self):
         """
@@ -109,27 +158,28 @@ def safe_modbustcp_call(manager, func, *args, **kwargs):
     for attempt in range(max_retries):
         client = manager.get_client()
         if not client:
-            print("[ModbusTCPConnection] ERROR: No available TCP connection")
+            logger.error("No available TCP connection")
             return None
         try:
             return func(client, *args, **kwargs)
         except (ConnectionResetError, pymodbus.exceptions.ModbusException, OSError) as e:
-            print(f"[ModbusTCPConnection] WARNING: TCP operation failed {attempt + 1}/{max_retries}): {str(e)}")
+            logger.warning("TCP operation failed (attempt %s/%s): %s", attempt + 1, max_retries, e)
+            manager.invalidate_socket_cache()
             with manager.connection_lock:
                 try:
                     client.close()
                 except (ConnectionError, OSError) as e2:
-                    print(f"[ModbusTCPConnection] WARNING: Error closing TCP connection: {e2}")
+                    logger.warning("Error closing TCP connection: %s", e2)
                 manager.connected = False
             time.sleep(0.1)
         except (ValueError, TypeError) as e:
-            print(f"[ModbusTCPConnection] ERROR: TCP parameter error: {str(e)}")
+            logger.error("TCP parameter error: %s", e)
             return None
         except Exception as e:
-            print(f"[ModbusTCPConnection] ERROR: TCP unknown error: {str(e)}")
+            logger.error("TCP unknown error: %s", e)
             return None
-    print(f"[ModbusTCPConnection] ERROR: TCP operation retry {max_retries} still Failed")
+    logger.error("TCP operation retry %s still Failed", max_retries)
     return None
 
 # 实例化管理器
-modbustcp_manager = ModbusTCPConnectionManager()
\ No newline at end of file
+modbustcp_manager = ModbusTCPConnectionManager()
@@ -11,6 +11,10 @@ def create_app(controller=None):
     inner_app = Flask(__name__)
     CORS(inner_app)
 
+    # jsonify 不排序键、不缩进，减少每次响应的序列化开销
+    inner_app.json.sort_keys = False
+    inner_app.json.compact = True
+
     # 存储控制器实例以便路由访问
     inner_app.config["CONTROLLER"] = controller
 
@@ -14,6 +14,13 @@ from server.modbus_control.fan.write_fan import (
 
 logger = logging.getLogger(__name__)
 
+# 风扇数量及全开/全关状态表，模块级复用，避免每次请求重新构建
+_FAN_COUNT = 16
+_ALL_ON = (True,) * _FAN_COUNT
+_ALL_OFF = (False,) * _FAN_COUNT
+# Status 字符串到全体风扇状态的映射，一次查表完成校验与取值
+_STATUS_MAP = {"True": _ALL_ON, "False": _ALL_OFF}
+
 
 def control_all_fans():
     """
@@ -22,40 +29,37 @@ def control_all_fans():
 
     # 系统开关前置检查
     result = check_system_switch()
-    if result:
+    if result is not None:
         return result
 
-    if not request.is_json:
-        return jsonify({
-            "error": "Request must be JSON format",
-            "code": "Base.1.0.InvalidRequest"
-        }), 400
-
-    try:
-        data = request.get_json()
-    except Exception as e:
-        logger.error(f"Error parsing JSON: {str(e)}")
+    # 只解析一次请求体：非 JSON 内容类型或解析失败时返回 None，不抛异常
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        logger.warning("Invalid JSON body for all fans control")
         return jsonify({
-            "error": "Invalid JSON format",
+            "error": "Request must be a JSON object",
             "code": "Base.1.0.MalformedJSON"
         }), 400
 
     response_messages = []
     errors = []
 
-    if "Status" not in data and "DutyCycle" not in data:
+    has_status = "Status" in data
+    has_duty_cycle = "DutyCycle" in data
+    if not has_status and not has_duty_cycle:
         return jsonify({
             "error": "Invalid request, must include Status or DutyCycle parameter",
             "code": "Base.1.0.PropertyMissing"
         }), 400
 
     # 批量处理风扇启停状态
-    if "Status" in data:
+    if has_status:
         status_value = data["Status"]
-        if status_value not in ["True", "False"]:
+        # JSON 中的列表/对象不可哈希，非字符串直接视为非法值
+        status_list = _STATUS_MAP.get(status_value) if isinstance(status_value, str) else None
+        if status_list is None:
             errors.append(f"Invalid Status value: '{status_value}', must be 'True' or 'False'")
         else:
-            status_list = [status_value == "True"] * 16
             result = set_all_fan_statuses(status_list)
             if result is not None:
                 errors.append(f"Batch status error: {result}")
@@ -63,12 +67,12 @@ def control_all_fans():
                 response_messages.append(f"All fans status set to {status_value}")
 
     # 批量处理风扇占空比
-    if "DutyCycle" in data:
+    if has_duty_cycle:
         duty_cycle = data["DutyCycle"]
         if not isinstance(duty_cycle, (int, float)) or duty_cycle < 0 or duty_cycle > 100:
             errors.append(f"Invalid DutyCycle value: {duty_cycle}, must be number between 0-100")
         else:
-            duty_cycle_list = [duty_cycle] * 16
+            duty_cycle_list = (duty_cycle,) * _FAN_COUNT
             result = set_all_fan_duty_cycles(duty_cycle_list)
             if result is not None:
                 errors.append(f"Batch duty cycle error: {result}")
@@ -2,22 +2,16 @@
 获取单个风扇状态/控制单个风扇的路由，返回标准JSON格式
 """
 
-import json
 import logging
 import time
-from collections import OrderedDict
 
-from flask import Response, request, jsonify
+from flask import request, jsonify
 
-from server.modbus_control.fan.read_fan import (
-    get_all_fan_statuses,
-    get_all_fan_currents,
-    get_all_fan_speeds,
-    get_all_fan_duty_cycles
-)
+from server.json_response import dumps_json, json_response, static_json_response
+from server.modbus_control.fan.read_fan import get_fan_snapshot_cached
 from server.modbus_control.fan.write_fan import (
-    set_all_fan_statuses,
-    set_all_fan_duty_cycles
+    set_single_fan_status,
+    set_single_fan_duty_cycle
 )
 
 logger = logging.getLogger(__name__)
@@ -25,6 +19,14 @@ logger = logging.getLogger(__name__)
 # 用于记录风扇损坏状态的持续时间
 fan_fault_time_single: list[float] = [0.0] * 16
 
+# Status 字段允许的取值
+_VALID_STATUS = ("True", "False")
+
+# 固定错误响应内容，导入时序列化一次
+_ERR_NOT_JSON = dumps_json({"error": "Request must be JSON format", "code": "Base.1.0.InvalidRequest"})
+_ERR_MALFORMED_JSON = dumps_json({"error": "Invalid JSON format", "code": "Base.1.0.MalformedJSON"})
+_ERR_INVALID_ID = dumps_json({"error": "Invalid fan id", "code": "Base.1.0.PropertyValueError"})
+
 
 def get_single_fan(fan_id):
     """
@@ -33,23 +35,29 @@ def get_single_fan(fan_id):
     try:
         idx = int(fan_id) - 1
         if idx < 0 or idx >= 16:
-            result = OrderedDict([
-                ("code", 1),
-                ("message", "Invalid fan id"),
-                ("data", [])
-            ])
-            return Response(json.dumps(result, ensure_ascii=False), mimetype="application/json"), 400
-
-        statuses = get_all_fan_statuses()
-        currents = get_all_fan_currents()
-        speeds = get_all_fan_speeds()
-        duty_cycles = get_all_fan_duty_cycles()
+            result = {
+                "code": 1,
+                "message": "Invalid fan id",
+                "data": []
+            }
+            return json_response(result, 400)
+
+        bundle = get_fan_snapshot_cached()
+        statuses = bundle["statuses"]
+        currents = bundle["currents"]
+        speeds = bundle["speeds"]
+        duty_cycles = bundle["duty_cycles"]
 
         status = statuses[idx]  # "On" 或 "Off"
         current = currents[idx]
         speed = speeds[idx]
         duty_cycle = duty_cycles[idx]
 
+        # 读取失败时对应值为错误信息字符串，每项只判断一次类型
+        duty_ok = not isinstance(duty_cycle, str)
+        speed_ok = not isinstance(speed, str)
+        current_ok = not isinstance(current, str)
+
         now = time.time()
 
         # Status参数：0关，1开
@@ -61,14 +69,12 @@ def get_single_fan(fan_id):
         # 状态判断逻辑
         if status_val == 1:  # 开关为开
             # 正常运行：转速>500且电流>0.1A
-            if isinstance(speed, (int, float)) and speed > 500 and \
-                    isinstance(current, (int, float)) and current > 0.1:
+            if speed_ok and current_ok and speed > 500 and current > 0.1:
                 state = 1  # 正常运行
                 fan_fault_time_single[idx] = 0  # 清除故障计时
             # 损坏条件：占空比>5，转速<500，电流<0.1A，持续8秒
-            elif isinstance(duty_cycle, (int, float)) and duty_cycle > 5 and \
-                    isinstance(speed, (int, float)) and speed < 500 and \
-                    isinstance(current, (int, float)) and current < 0.1:
+            elif duty_ok and speed_ok and current_ok and \
+                    duty_cycle > 5 and speed < 500 and current < 0.1:
                 if fan_fault_time_single[idx] == 0:
                     fan_fault_time_single[idx] = now
                 elif now - fan_fault_time_single[idx] >= 8:
@@ -80,31 +86,31 @@ def get_single_fan(fan_id):
             fan_fault_time_single[idx] = 0  # 清除故障计时
 
         # 构造风扇数据，字段顺序严格固定
-        fan_data = OrderedDict([
-            ("Id", str(fan_id)),
-            ("Name", f"Fan {fan_id}"),
-            ("DutyCycle", duty_cycle if isinstance(duty_cycle, (int, float)) else 0.0),
-            ("Current", current if isinstance(current, (int, float)) else 0.0),
-            ("Speed", speed if isinstance(speed, (int, float)) else 0.0),
-            ("State", state),  # 状态（0未运行，1运行，4损坏）
-            ("Status", status_val)  # 开关状态（0关，1开）
-        ])
-
-        result = OrderedDict([
-            ("code", 0),
-            ("message", ""),
-            ("data", [fan_data])
-        ])
-        return Response(json.dumps(result, ensure_ascii=False), mimetype="application/json")
+        fan_data = {
+            "Id": str(fan_id),
+            "Name": f"Fan {fan_id}",
+            "DutyCycle": duty_cycle if duty_ok else 0.0,
+            "Current": current if current_ok else 0.0,
+            "Speed": speed if speed_ok else 0.0,
+            "State": state,  # 状态（0未运行，1运行，4损坏）
+            "Status": status_val  # 开关状态（0关，1开）
+        }
+
+        result = {
+            "code": 0,
+            "message": "",
+            "data": [fan_data]
+        }
+        return json_response(result)
 
     except Exception as e:
         logger.error(f"Failed to get fan {fan_id}: {str(e)}")
-        result = OrderedDict([
-            ("code", 1),
-            ("message", f"InternalError: {str(e)}"),
-            ("data", [])
-        ])
-        return Response(json.dumps(result, ensure_ascii=False), mimetype="application/json"), 500
+        result = {
+            "code": 1,
+            "message": f"InternalError: {str(e)}",
+            "data": []
+        }
+        return json_response(result, 500)
 
 
 def control_single_fan(fan_id):
@@ -112,55 +118,53 @@ def control_single_fan(fan_id):
     单个风扇写入
     """
     if not request.is_json:
-        return jsonify({
-            "error": "Request must be JSON format",
-            "code": "Base.1.0.InvalidRequest"
-        }), 400
+        return static_json_response(_ERR_NOT_JSON, 400)
 
     try:
         data = request.get_json()
     except Exception as e:
         logger.error(f"Error parsing JSON: {str(e)}")
-        return jsonify({
-            "error": "Invalid JSON format",
-            "code": "Base.1.0.MalformedJSON"
-        }), 400
+        return static_json_response(_ERR_MALFORMED_JSON, 400)
 
     idx = int(fan_id) - 1
     if idx < 0 or idx >= 16:
-        return jsonify({
-            "error": "Invalid fan id",
-            "code": "Base.1.0.PropertyValueError"
-        }), 400
+        return static_json_response(_ERR_INVALID_ID, 400)
 
     errors = []
     response_messages = []
+    # 先校验全部字段并收集待写入项：(写入函数, 值, 成功提示)
+    pending = []
 
     if "Status" in data:
         status_value = data["Status"]
-        if status_value not in ["True", "False"]:
+        if status_value not in _VALID_STATUS:
             errors.append(f"Invalid Status value: '{status_value}', must be 'True' or 'False'")
         else:
-            status_list = [False] * 16
-            status_list[idx] = (status_value == "True")
-            result = set_all_fan_statuses(status_list)
-            if result is not None:
-                errors.append(f"Fan {fan_id}: {result}")
-            else:
-                response_messages.append(f"Fan {fan_id} status set to {status_value}")
+            pending.append((
+                set_single_fan_status,
+                status_value == "True",
+                f"Fan {fan_id} status set to {status_value}",
+            ))
 
     if "DutyCycle" in data:
         duty_cycle = data["DutyCycle"]
         if not isinstance(duty_cycle, (int, float)) or duty_cycle < 0 or duty_cycle > 100:
             errors.append(f"Invalid DutyCycle value: {duty_cycle}, must be number between 0-100")
         else:
-            duty_cycle_list = [0] * 16
-            duty_cycle_list[idx] = duty_cycle
-            result = set_all_fan_duty_cycles(duty_cycle_list)
+            pending.append((
+                set_single_fan_duty_cycle,
+                duty_cycle,
+                f"Fan {fan_id} duty cycle set to {duty_cycle}%",
+            ))
+
+    # 任一字段校验失败则不下发任何写入；否则每个字段只写对应的单个线圈/寄存器
+    if not errors:
+        for write, value, message in pending:
+            result = write(idx, value)
             if result is not None:
                 errors.append(f"Fan {fan_id}: {result}")
             else:
-                response_messages.append(f"Fan {fan_id} duty cycle set to {duty_cycle}%")
+                response_messages.append(message)
 
     if errors:
         return jsonify({
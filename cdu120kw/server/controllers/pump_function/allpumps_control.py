@@ -10,6 +10,9 @@ from server.modbus_control.pump.write_pump import set_all_pump_statuses, set_all
 
 logger = logging.getLogger(__name__)
 
+# Status 字段允许的取值
+_VALID_STATUS = ("True", "False")
+
 
 def control_all_pumps():
     """
@@ -42,7 +45,7 @@ def control_all_pumps():
     # 批量处理水泵启停状态
     if "Status" in data:
         status_value = data["Status"]
-        if status_value not in ["True", "False"]:
+        if status_value not in _VALID_STATUS:
             errors.append(f"Invalid Status value: '{status_value}', must be 'True' or 'False'")
         else:
             status_list = [status_value == "True"] * 16
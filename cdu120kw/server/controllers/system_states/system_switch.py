@@ -3,32 +3,43 @@
 """
 
 import logging
+import threading
 
 from flask import request, jsonify
 
-from server.modbus_control.fan.write_fan import set_all_fan_statuses, set_all_fan_duty_cycles
-from server.modbus_control.pump.write_pump import set_all_pump_statuses, set_all_pump_duty_cycles
+from server.json_response import dumps_json, static_json_response
+
+from server.modbus_control.shutdown import shutdown_all
 
 logger = logging.getLogger(__name__)
 
-# 实时系统开关状态，默认0
-SYSTEM_SWITCH_STATUS = 0
+# 系统开关允许的取值
+_VALID_SWITCH_STATUS = (0, 1)
+
+# 实时系统开关状态，Event 置位表示开（1），默认关（0）
+_SWITCH_ON = threading.Event()
+
+# 系统开关关闭时的拒绝响应体，导入时序列化一次，每次请求只构造轻量 Response
+_SWITCH_OFF_BODY = dumps_json(
+    {"Messages": ["The system switch status is off, unable to perform control operations"]}
+)
 
 
 def get_switch_status():
     """
-    读取系统开关状态（0关，1开），默认1
+    读取系统开关状态（0关，1开），默认0
     """
-    global SYSTEM_SWITCH_STATUS
-    return SYSTEM_SWITCH_STATUS
+    return int(_SWITCH_ON.is_set())
 
 
 def set_switch_status(status: int):
     """
     设置系统开关状态
     """
-    global SYSTEM_SWITCH_STATUS
-    SYSTEM_SWITCH_STATUS = status
+    if status:
+        _SWITCH_ON.set()
+    else:
+        _SWITCH_ON.clear()
 
 
 def set_system_switch():
@@ -39,26 +50,14 @@ def set_system_switch():
     """
     data = request.get_json(force=True)
     status = data.get("Status")
-    if status not in [0, 1]:
+    if status not in _VALID_SWITCH_STATUS:
         return jsonify({"code": 1, "message": "Setting failed"}), 400
 
     if status == 0:
         # 关闭所有风扇和水泵
-        err_fan = set_all_fan_statuses([False] * 16)
-        err_fan_dc = set_all_fan_duty_cycles([0.0] * 16)
-        err_pump = set_all_pump_statuses([False] * 3)
-        err_pump_dc = set_all_pump_duty_cycles([0.0] * 3)
-        errors = []
-        if err_fan:
-            errors.append(f"Fan status error: {err_fan}")
-        if err_fan_dc:
-            errors.append(f"Fan duty cycle error: {err_fan_dc}")
-        if err_pump:
-            errors.append(f"Pump status error: {err_pump}")
-        if err_pump_dc:
-            errors.append(f"Pump duty cycle error: {err_pump_dc}")
-        if errors:
-            return jsonify({"code": 1, "message": "; ".join(errors)}), 500
+        err = shutdown_all()
+        if err:
+            return jsonify({"code": 1, "message": err}), 500
 
     try:
         set_switch_status(status)
@@ -84,11 +83,6 @@ def check_system_switch():
     控制前置条件检查，风扇/水泵控制接口需调用
     状态为0时返回提示JSON，否则返回None
     """
-    status = get_switch_status()
-    if status == 0:
-        return jsonify({
-            "Messages": [
-                "The system switch status is off, unable to perform control operations"
-            ]
-        }), 403
-    return None
+    if _SWITCH_ON.is_set():
+        return None
+    return static_json_response(_SWITCH_OFF_BODY, 403)
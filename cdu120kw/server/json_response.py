@@ -0,0 +1,37 @@
+"""
+JSON响应构造工具
+"""
+
+import json
+
+from flask import Response
+
+
+def dumps_json(result):
+    """
+    序列化为JSON字符串，可直接作为 Response 内容
+    """
+    return json.dumps(result, ensure_ascii=False)
+
+
+def json_response(result, status=None):
+    """
+    将结果序列化为JSON响应，保持字典字段顺序
+    :param result: 待序列化的字典
+    :param status: HTTP状态码，为None时只返回Response
+    :return: Response 或 (Response, status)
+    """
+    response = Response(dumps_json(result), mimetype="application/json")
+    if status is None:
+        return response
+    return response, status
+
+
+def static_json_response(body, status):
+    """
+    用导入时预先序列化好的固定内容构造响应
+    Response 对象会被 after_request（如 CORS）修改响应头，不能跨请求复用，每次只新建轻量对象
+    :param body: dumps_json 的结果
+    :param status: HTTP状态码
+    """
+    return Response(body, status=status, mimetype="application/json")
@@ -2,9 +2,16 @@
 读取所有风扇的状态、转速、占空比、电流和PWM幅值
 """
 
-from modbus_manager.batch_reader import ModbusBatchReader
-from modbus_manager.modbusrtu_manager import modbusrtu_manager
-from modbus_manager.modbustcp_manager import modbustcp_manager
+import threading
+import time
+
+from modbus_manager.batch_pool import get_reader
+
+# 风扇数据快照缓存有效期（秒）：同一时段内多个单风扇请求共用一次批量读取
+SNAPSHOT_TTL = 0.5
+# mode -> (读取时间, 数据快照)
+_snapshot_cache: dict[str, tuple[float, dict[str, list]]] = {}
+_snapshot_lock = threading.Lock()
 
 
 def get_all_fan_statuses(mode: str = "tcp") -> list[str]:
@@ -13,9 +20,8 @@ def get_all_fan_statuses(mode: str = "tcp") -> list[str]:
     :param mode: 工作模式，tcp 或 rtu
     :return: 状态列表
     """
-    # 根据模式选择对应的连接管理器
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    reader = ModbusBatchReader(client_manager)
+    # 根据模式选择对应的读取器
+    reader = get_reader(mode)
     statuses = []
     regs, err = reader.read_coils(41200, 8)
     if err:
@@ -36,42 +42,49 @@ def get_all_fan_duty_cycles(mode: str = "tcp") -> list[float | str]:
     :param mode: 工作模式，tcp 或 rtu
     :return: 占空比列表
     """
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    reader = ModbusBatchReader(client_manager)
+    reader = get_reader(mode)
     duty_cycles = []
     regs, err = reader.read_holding_registers(2576, 8)
     if err:
         duty_cycles.extend([err] * 8)
     else:
-        duty_cycles.extend([round(reg / 100.0, 2) for reg in regs])
+        duty_cycles.extend([reg / 100.0 for reg in regs])
     regs, err = reader.read_holding_registers(2608, 8)
     if err:
         duty_cycles.extend([err] * 8)
     else:
-        duty_cycles.extend([round(reg / 100.0, 2) for reg in regs])
+        duty_cycles.extend([reg / 100.0 for reg in regs])
     return duty_cycles
 
 
+def get_all_fan_speed_and_current(mode: str = "tcp") -> tuple[list[float | str], list[float | str]]:
+    """
+    读取所有风扇的转速和电流
+    转速与电流交错存放在同一段寄存器中（偶数偏移为转速，奇数偏移为电流），每组只读取一次
+    :param mode: 工作模式，tcp 或 rtu
+    :return: (转速列表, 电流列表)
+    """
+    reader = get_reader(mode)
+    speeds = []
+    currents = []
+    for start in (2064, 2096):
+        regs, err = reader.read_holding_registers(start, 16)
+        if err:
+            speeds.extend([err] * 8)
+            currents.extend([err] * 8)
+        else:
+            speeds.extend(regs[0::2])
+            currents.extend([reg / 1000.0 for reg in regs[1::2]])
+    return speeds, currents
+
+
 def get_all_fan_speeds(mode: str = "tcp") -> list[float | str]:
     """
     读取所有风扇的转速
     :param mode: 工作模式，tcp 或 rtu
     :return: 转速列表
     """
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    reader = ModbusBatchReader(client_manager)
-    speeds = []
-    regs, err = reader.read_holding_registers(2064, 16)
-    if err:
-        speeds.extend([err] * 8)
-    else:
-        speeds.extend([regs[i] for i in range(0, 16, 2)])
-    regs, err = reader.read_holding_registers(2096, 16)
-    if err:
-        speeds.extend([err] * 8)
-    else:
-        speeds.extend([regs[i] for i in range(0, 16, 2)])
-    return speeds
+    return get_all_fan_speed_and_current(mode)[0]
 
 
 def get_all_fan_currents(mode: str = "tcp") -> list[float | str]:
@@ -80,17 +93,45 @@ def get_all_fan_currents(mode: str = "tcp") -> list[float | str]:
     :param mode: 工作模式，tcp 或 rtu
     :return: 电流列表
     """
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    reader = ModbusBatchReader(client_manager)
-    currents = []
-    regs, err = reader.read_holding_registers(2065, 16)
-    if err:
-        currents.extend([err] * 8)
-    else:
-        currents.extend([round(regs[i] / 1000.0, 3) for i in range(0, 16, 2)])
-    regs, err = reader.read_holding_registers(2097, 16)
-    if err:
-        currents.extend([err] * 8)
-    else:
-        currents.extend([round(regs[i] / 1000.0, 3) for i in range(0, 16, 2)])
-    return currents
+    return get_all_fan_speed_and_current(mode)[1]
+
+
+def get_all_fan_bundle(mode: str = "tcp") -> dict[str, list]:
+    """
+    一次性读取所有风扇的开关状态、占空比、转速和电流
+    :param mode: 工作模式，tcp 或 rtu
+    :return: {"statuses": [...], "duty_cycles": [...], "speeds": [...], "currents": [...]}
+    """
+    speeds, currents = get_all_fan_speed_and_current(mode)
+    return {
+        "statuses": get_all_fan_statuses(mode),
+        "duty_cycles": get_all_fan_duty_cycles(mode),
+        "speeds": speeds,
+        "currents": currents,
+    }
+
+
+def get_fan_snapshot_cached(mode: str = "tcp") -> dict[str, list]:
+    """
+    获取所有风扇数据快照，SNAPSHOT_TTL 内复用上次读取结果
+    缓存过期时持锁读取，并发请求等待同一次读取完成，不重复访问设备
+    :param mode: 工作模式，tcp 或 rtu
+    :return: 与 get_all_fan_bundle 相同结构的字典
+    """
+    key = "tcp" if mode == "tcp" else "rtu"
+    with _snapshot_lock:
+        cached = _snapshot_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < SNAPSHOT_TTL:
+            return cached[1]
+        snapshot = get_all_fan_bundle(key)
+        _snapshot_cache[key] = (time.monotonic(), snapshot)
+        return snapshot
+
+
+def invalidate_fan_snapshot():
+    """
+    清空风扇数据快照缓存，写入风扇后调用，保证下次读取拿到最新数据
+    """
+    with _snapshot_lock:
+        _snapshot_cache.clear()
@@ -2,44 +2,76 @@
 控制所有风扇的启停和转速
 """
 
-from modbus_manager.batch_writer import ModbusBatchWriter
-from modbus_manager.modbusrtu_manager import modbusrtu_manager
-from modbus_manager.modbustcp_manager import modbustcp_manager
+from typing import Sequence
 
+from modbus_manager.batch_pool import get_writer
+from server.modbus_control.fan.read_fan import invalidate_fan_snapshot
 
-def set_all_fan_statuses(status_list: list[bool], mode: str = "tcp") -> str | None:
+
+def set_all_fan_statuses(status_list: Sequence[bool], mode: str = "tcp") -> str | None:
     """
     设置所有风扇的开关状态
     :param status_list: 16个风扇的开关状态
     :param mode: 工作模式，tcp 或 rtu
     :return: 错误信息或None
     """
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    writer = ModbusBatchWriter(client_manager)
+    writer = get_writer(mode)
     err = writer.write_coils(41200, status_list[:8])
-    if err:
-        return err
-    err = writer.write_coils(41712, status_list[8:])
-    if err:
-        return err
-    return None
+    if not err:
+        err = writer.write_coils(41712, status_list[8:])
+    invalidate_fan_snapshot()
+    return err or None
 
 
-def set_all_fan_duty_cycles(duty_cycle_list: list[float], mode: str = "tcp") -> str | None:
+def set_all_fan_duty_cycles(duty_cycle_list: Sequence[float], mode: str = "tcp") -> str | None:
     """
     设置所有风扇的占空比
     :param duty_cycle_list: 16个风扇的占空比
     :param mode: 工作模式，tcp 或 rtu
     :return: 错误信息或None
     """
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    writer = ModbusBatchWriter(client_manager)
+    writer = get_writer(mode)
     values_8 = [int((dc if dc is not None else 0) * 100) for dc in duty_cycle_list[:8]]
     err = writer.write_registers(2576, values_8)
-    if err:
-        return err
-    values_8 = [int((dc if dc is not None else 0) * 100) for dc in duty_cycle_list[8:]]
-    err = writer.write_registers(2608, values_8)
-    if err:
-        return err
-    return None
+    if not err:
+        values_8 = [int((dc if dc is not None else 0) * 100) for dc in duty_cycle_list[8:]]
+        err = writer.write_registers(2608, values_8)
+    invalidate_fan_snapshot()
+    return err or None
+
+
+def _fan_offset(idx: int) -> int:
+    """
+    风扇序号（0~15）在所属地址组内的偏移：前8个在第一组，后8个在第二组
+    """
+    return idx if idx < 8 else idx - 8
+
+
+def set_single_fan_status(idx: int, value: bool, mode: str = "tcp") -> str | None:
+    """
+    设置单个风扇的开关状态，只写入对应线圈
+    :param idx: 风扇序号（0~15）
+    :param value: 开关状态
+    :param mode: 工作模式，tcp 或 rtu
+    :return: 错误信息或None
+    """
+    writer = get_writer(mode)
+    address = (41200 if idx < 8 else 41712) + _fan_offset(idx)
+    err = writer.write_coil(address, value)
+    invalidate_fan_snapshot()
+    return err
+
+
+def set_single_fan_duty_cycle(idx: int, value: float, mode: str = "tcp") -> str | None:
+    """
+    设置单个风扇的占空比，只写入对应寄存器
+    :param idx: 风扇序号（0~15）
+    :param value: 占空比
+    :param mode: 工作模式，tcp 或 rtu
+    :return: 错误信息或None
+    """
+    writer = get_writer(mode)
+    address = (2576 if idx < 8 else 2608) + _fan_offset(idx)
+    err = writer.write_register(address, int(value * 100))
+    invalidate_fan_snapshot()
+    return err
@@ -1,9 +1,82 @@
 """
 读取所有水泵的状态、转速、占空比、电流和PWM幅值
 """
-from modbus_manager.batch_reader import ModbusBatchReader
-from modbus_manager.modbusrtu_manager import modbusrtu_manager
-from modbus_manager.modbustcp_manager import modbustcp_manager
+
+import threading
+import time
+
+from modbus_manager.batch_pool import get_reader
+
+PUMP_COUNT = 3
+# 水泵开关线圈起始地址
+PUMP_COIL_START = 784
+# 转速/电流交错存放于 2080~2085，占空比位于 2192~2194
+# 从 2080 连续读到 2194 共 115 个寄存器（未超过单帧 125 个的上限），一帧即可覆盖全部遥测数据
+PUMP_REG_START = 2080
+PUMP_DUTY_OFFSET = 2192 - PUMP_REG_START
+PUMP_REG_COUNT = PUMP_DUTY_OFFSET + PUMP_COUNT
+
+# 水泵遥测缓存有效期（秒）：同一请求内依次调用的四个读取函数共用一次读取
+TELEMETRY_TTL = 0.1
+# mode -> (读取时间, 遥测数据)
+_telemetry_cache: dict[str, tuple[float, dict[str, list]]] = {}
+_telemetry_lock = threading.Lock()
+
+
+def read_all_pump_telemetry(mode: str = "tcp") -> dict[str, list]:
+    """
+    一次性读取所有水泵的开关状态、占空比、转速和电流，只发送两帧请求（线圈一帧、保持寄存器一帧）
+    :param mode: 工作模式，tcp 或 rtu
+    :return: {"statuses": [...], "duty_cycles": [...], "speeds": [...], "currents": [...]}
+    """
+    reader = get_reader(mode)
+
+    bits, err = reader.read_coils(PUMP_COIL_START, PUMP_COUNT)
+    if err:
+        statuses = [err] * PUMP_COUNT
+    else:
+        statuses = ["On" if bit else "Off" for bit in bits[:PUMP_COUNT]]
+
+    regs, err = reader.read_holding_registers(PUMP_REG_START, PUMP_REG_COUNT)
+    if err:
+        speeds = [err] * PUMP_COUNT
+        currents = [err] * PUMP_COUNT
+        duty_cycles = [err] * PUMP_COUNT
+    else:
+        speeds = list(regs[0:2 * PUMP_COUNT:2])
+        currents = [reg / 1000.0 for reg in regs[1:2 * PUMP_COUNT:2]]
+        duty_cycles = [reg / 100.0 for reg in regs[PUMP_DUTY_OFFSET:PUMP_REG_COUNT]]
+
+    return {
+        "statuses": statuses,
+        "duty_cycles": duty_cycles,
+        "speeds": speeds,
+        "currents": currents,
+    }
+
+
+def get_pump_telemetry_cached(mode: str = "tcp") -> dict[str, list]:
+    """
+    获取水泵遥测数据，TELEMETRY_TTL 内复用上次读取结果
+    :param mode: 工作模式，tcp 或 rtu
+    :return: 与 read_all_pump_telemetry 相同结构的字典
+    """
+    key = "tcp" if mode == "tcp" else "rtu"
+    with _telemetry_lock:
+        cached = _telemetry_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < TELEMETRY_TTL:
+            return cached[1]
+        telemetry = read_all_pump_telemetry(key)
+        _telemetry_cache[key] = (time.monotonic(), telemetry)
+        return telemetry
+
+
+def invalidate_pump_telemetry():
+    """
+    清空水泵遥测缓存，写入水泵后调用，保证下次读取拿到最新数据
+    """
+    with _telemetry_lock:
+        _telemetry_cache.clear()
 
 
 def get_all_pump_statuses(mode: str = "tcp") -> list[str]:
@@ -12,16 +85,7 @@ def get_all_pump_statuses(mode: str = "tcp") -> list[str]:
     :param mode: 工作模式，tcp 或 rtu
     :return: 状态列表
     """
-    # 根据模式选择对应的连接管理器
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    reader = ModbusBatchReader(client_manager)
-    statuses = []
-    regs, err = reader.read_coils(784, 3)
-    if err:
-        statuses.extend([err] * 3)
-    else:
-        statuses.extend(["On" if bit else "Off" for bit in regs])
-    return statuses
+    return list(get_pump_telemetry_cached(mode)["statuses"])
 
 
 def get_all_pump_duty_cycles(mode: str = "tcp") -> list[float | str]:
@@ -30,15 +94,7 @@ def get_all_pump_duty_cycles(mode: str = "tcp") -> list[float | str]:
     :param mode: 工作模式，tcp 或 rtu
     :return: 占空比列表
     """
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    reader = ModbusBatchReader(client_manager)
-    duty_cycles = []
-    regs, err = reader.read_holding_registers(2192, 3)
-    if err:
-        duty_cycles.extend([err] * 3)
-    else:
-        duty_cycles.extend([round(reg / 100.0, 2) for reg in regs])
-    return duty_cycles
+    return list(get_pump_telemetry_cached(mode)["duty_cycles"])
 
 
 def get_all_pump_speeds(mode: str = "tcp") -> list[float | str]:
@@ -47,15 +103,7 @@ def get_all_pump_speeds(mode: str = "tcp") -> list[float | str]:
     :param mode: 工作模式，tcp 或 rtu
     :return: 转速列表
     """
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    reader = ModbusBatchReader(client_manager)
-    speeds = []
-    regs, err = reader.read_holding_registers(2080, 6)
-    if err:
-        speeds.extend([err] * 3)
-    else:
-        speeds.extend([regs[i] for i in range(0, 6, 2)])
-    return speeds
+    return list(get_pump_telemetry_cached(mode)["speeds"])
 
 
 def get_all_pump_currents(mode: str = "tcp") -> list[float | str]:
@@ -64,12 +112,4 @@ def get_all_pump_currents(mode: str = "tcp") -> list[float | str]:
     :param mode: 工作模式，tcp 或 rtu
     :return: 电流列表
     """
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    reader = ModbusBatchReader(client_manager)
-    currents = []
-    regs, err = reader.read_holding_registers(2081, 6)
-    if err:
-        currents.extend([err] * 3)
-    else:
-        currents.extend([round(regs[i] / 1000.0, 3) for i in range(0, 6, 2)])
-    return currents
+    return list(get_pump_telemetry_cached(mode)["currents"])
@@ -1,9 +1,8 @@
 """
 控制所有水泵的启停和转速
 """
-from modbus_manager.batch_writer import ModbusBatchWriter
-from modbus_manager.modbusrtu_manager import modbusrtu_manager
-from modbus_manager.modbustcp_manager import modbustcp_manager
+from modbus_manager.batch_pool import get_writer
+from server.modbus_control.pump.read_pump import invalidate_pump_telemetry
 
 
 def set_all_pump_statuses(status_list: list[bool], mode: str = "tcp") -> str | None:
@@ -13,12 +12,10 @@ def set_all_pump_statuses(status_list: list[bool], mode: str = "tcp") -> str | N
     :param mode: 工作模式，tcp 或 rtu
     :return: 错误信息或None
     """
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    writer = ModbusBatchWriter(client_manager)
+    writer = get_writer(mode)
     err = writer.write_coils(784, status_list[:3])
-    if err:
-        return err
-    return None
+    invalidate_pump_telemetry()
+    return err or None
 
 
 def set_all_pump_duty_cycles(duty_cycle_list: list[float], mode: str = "tcp") -> str | None:
@@ -28,10 +25,36 @@ def set_all_pump_duty_cycles(duty_cycle_list: list[float], mode: str = "tcp") ->
     :param mode: 工作模式，tcp 或 rtu
     :return: 错误信息或None
     """
-    client_manager = modbustcp_manager if mode == "tcp" else modbusrtu_manager
-    writer = ModbusBatchWriter(client_manager)
+    writer = get_writer(mode)
     values_3 = [int((dc if dc is not None else 0) * 100) for dc in duty_cycle_list[:3]]
     err = writer.write_registers(2192, values_3)
-    if err:
-        return err
-    return None
+    invalidate_pump_telemetry()
+    return err or None
+
+
+def set_single_pump_status(idx: int, value: bool, mode: str = "tcp") -> str | None:
+    """
+    设置单个水泵的开关状态，只写入对应线圈
+    :param idx: 水泵序号（0~2）
+    :param value: 开关状态
+    :param mode: 工作模式，tcp 或 rtu
+    :return: 错误信息或None
+    """
+    writer = get_writer(mode)
+    err = writer.write_coil(784 + idx, value)
+    invalidate_pump_telemetry()
+    return err
+
+
+def set_single_pump_duty_cycle(idx: int, value: float, mode: str = "tcp") -> str | None:
+    """
+    设置单个水泵的占空比，只写入对应寄存器
+    :param idx: 水泵序号（0~2）
+    :param value: 占空比
+    :param mode: 工作模式，tcp 或 rtu
+    :return: 错误信息或None
+    """
+    writer = get_writer(mode)
+    err = writer.write_register(2192 + idx, int(value * 100))
+    invalidate_pump_telemetry()
+    return err
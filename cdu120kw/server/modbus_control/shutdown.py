@@ -0,0 +1,40 @@
+"""
+一次性关闭所有风扇和水泵
+"""
+
+from modbus_manager.batch_pool import get_writer
+from server.modbus_control.fan.read_fan import invalidate_fan_snapshot
+from server.modbus_control.pump.read_pump import invalidate_pump_telemetry
+
+# 关闭时写入的线圈块：风扇两组各8个，水泵3个
+_OFF_COIL_BLOCKS = (
+    (41200, (False,) * 8),
+    (41712, (False,) * 8),
+    (784, (False,) * 3),
+)
+# 关闭时写入的占空比寄存器块：风扇两组各8个，水泵3个
+_OFF_DUTY_BLOCKS = (
+    (2576, (0,) * 8),
+    (2608, (0,) * 8),
+    (2192, (0,) * 3),
+)
+
+
+def shutdown_all(mode: str = "tcp") -> str | None:
+    """
+    关闭所有风扇和水泵并将占空比清零
+    每个连续地址块只发送一帧，先写开关线圈再写占空比，某块失败时仍尽量关闭其余设备
+    :param mode: 工作模式，tcp 或 rtu
+    :return: 错误信息或None
+    """
+    writer = get_writer(mode)
+    errors = []
+    err = writer.write_coils_multi(_OFF_COIL_BLOCKS)
+    if err:
+        errors.append(f"Status error: {err}")
+    err = writer.write_registers_multi(_OFF_DUTY_BLOCKS)
+    if err:
+        errors.append(f"Duty cycle error: {err}")
+    invalidate_fan_snapshot()
+    invalidate_pump_telemetry()
+    return "; ".join(errors) if errors else None
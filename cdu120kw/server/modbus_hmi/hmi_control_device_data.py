@@ -6,7 +6,7 @@ Modbus HMI 从站数据接口实现
 - 新增写入回调接口：可在写入前/后执行业务逻辑（预留扩展点）
 """
 
-import json
+import array
 import os
 import threading
 import time
@@ -16,8 +16,13 @@ from pymodbus.datastore import ModbusSlaveContext, ModbusServerContext
 from pymodbus.device import ModbusDeviceIdentification
 from pymodbus.server import StartSerialServer
 
+from cdu120kw.config.json_loader import load_json_file
 from cdu120kw.control_logic.device_data_manipulation import processed_reg_map
 
+# RTU 从站启动失败后的重试间隔（秒）：指数退避 1, 2, 4, ... 最长 30
+RTU_RETRY_MIN_DELAY = 1
+RTU_RETRY_MAX_DELAY = 30
+
 # 仅允许启动一次 Modbus HMI 线程，防止单例多开、重启
 _modbus_hmi_thread_started = False
 _modbus_hmi_thread_lock = threading.Lock()
@@ -25,8 +30,7 @@ _modbus_hmi_thread_lock = threading.Lock()
 # 配置加载（仅一次）
 def _load_modbus_settings() -> Tuple[dict, dict, dict]:
     config_path = os.path.join(os.path.dirname(__file__), "../../config/settings.json")
-    with open(config_path, "r", encoding="utf-8-sig") as f:
-        cfg = json.load(f)
+    cfg = load_json_file(config_path)
     hmi_cfg = cfg.get("modbus_hmi", {})
     return (
         hmi_cfg.get("rtu", {}) or {},
@@ -38,6 +42,44 @@ def _load_modbus_settings() -> Tuple[dict, dict, dict]:
 _RTU_CFG, _TCP_CFG, _IDENTITY_CFG = _load_modbus_settings()
 
 
+def _build_identity(identity_cfg: dict) -> ModbusDeviceIdentification:
+    """
+    根据配置构造从站设备标识
+    """
+    identity = ModbusDeviceIdentification()
+    identity.VendorName = identity_cfg.get("VendorName", "")
+    identity.ProductCode = identity_cfg.get("ProductCode", "")
+    identity.VendorUrl = identity_cfg.get("VendorUrl", "")
+    identity.ProductName = identity_cfg.get("ProductName", "")
+    identity.ModelName = identity_cfg.get("ModelName", "")
+    identity.MajorMinorRevision = identity_cfg.get("MajorMinorRevision", "")
+    return identity
+
+
+def _build_serial_kwargs(rtu_cfg: dict) -> dict:
+    """
+    根据配置构造串口参数
+    更积极的串口参数，降低卡顿：较短超时与无重试
+    """
+    return {
+        "port": rtu_cfg.get("port", "COM1"),
+        "baudrate": rtu_cfg.get("baud_rate", 9600),
+        "bytesize": rtu_cfg.get("byte_size", 8),
+        "parity": rtu_cfg.get("parity", "N"),
+        "stopbits": rtu_cfg.get("stop_bits", 1),
+        "timeout": float(rtu_cfg.get("timeout", 0.2)),  # 建议 0.2~0.5
+        # 额外 pyserial 参数（按需存在则传入）
+        "xonxoff": bool(rtu_cfg.get("xonxoff", False)),
+        "rtscts": bool(rtu_cfg.get("rtscts", False)),
+        "dsrdtr": bool(rtu_cfg.get("dsrdtr", False)),
+    }
+
+
+# 设备标识与串口参数在导入时构造一次，重试循环直接复用
+_IDENTITY = _build_identity(_IDENTITY_CFG)
+_SERIAL_KW = _build_serial_kwargs(_RTU_CFG)
+
+
 def _to_bit(value: int) -> int:
     """
     转为线圈位(0/1)，仅捕获可预期的类型/值错误。
@@ -65,60 +107,68 @@ class DynamicModbusSlaveContext(ModbusSlaveContext):
     - setValues 支持写入前/后回调，便于扩展业务逻辑
     """
 
-    __slots__ = ("_req_count", "_last_beat_ts", "_beat_interval")
+    __slots__ = ("_req_count", "_beat_interval")
 
-    def __init__(self, beat_interval: float = 5.0):
+    def __init__(self, beat_interval: float = 5.0, heartbeat: bool = False):
+        """
+        :param beat_interval: 心跳日志间隔（秒）
+        :param heartbeat: 是否启用心跳日志，启用时由独立守护线程定期输出，读取路径只做计数
+        """
         super().__init__()
         self._req_count = 0
-        self._last_beat_ts = time.time()
         self._beat_interval = beat_interval
-
-    def _heartbeat(self) -> None:
-        # 轻量级心跳日志（每 beat_interval 秒一次）
-        now = time.time()
-        elapsed = now - self._last_beat_ts
-        if elapsed >= self._beat_interval:
-            rps = self._req_count / elapsed if elapsed > 0 else 0.0
-            print(f"[HMI] INFO: HMI Read heartbeat: count={self._req_count}, rps={rps:.1f}")
+        if heartbeat:
+            threading.Thread(target=self._heartbeat_loop, name="HMI-Heartbeat", daemon=True).start()
+
+    def _heartbeat_loop(self) -> None:
+        # 轻量级心跳日志（每 beat_interval 秒一次），计数清零时偶尔丢失的几次累加对健康统计无影响
+        last = time.monotonic()
+        while True:
+            time.sleep(self._beat_interval)
+            now = time.monotonic()
+            count = self._req_count
             self._req_count = 0
-            self._last_beat_ts = now
+            elapsed = now - last
+            last = now
+            rps = count / elapsed if elapsed > 0 else 0.0
+            print(f"[HMI] INFO: HMI Read heartbeat: count={count}, rps={rps:.1f}")
 
     def getValues(self, fx, address, count=1):
         self._req_count += 1
-        try:
-            if fx == 1:
-                # 线圈区读取，返回 0/1
-                raw = processed_reg_map.get_coils(address, count)
-                values = [1 if v else 0 for v in raw]
-            elif fx == 3:
-                # 保持寄存器区读取
-                raw = processed_reg_map.get_registers(address, count)
-                values = [_to_u16(v) for v in raw]
-            else:
-                values = [0] * count
-            # DEBUG 日志可选
-            # print(f"[HMI] DEBUG: HMI read fx={fx} addr={address} cnt={count} -> {values}")
-            # self._heartbeat()
-            return values
-        except Exception as e:
-            print(f"[HMI] ERROR: HMI read error fx={fx} addr={address} cnt={count}: {e}")
-            return [0] * count
+        # processed_reg_map 的线圈存储为只含 0/1 的 bytearray，寄存器存储为 array('H')，
+        # 切片读取得到的已是 0/1 和无符号16位整数，无需逐个转换；越界部分由 _read_range 补0，不会抛异常
+        if fx == 1:
+            # 线圈区读取，返回 0/1
+            return processed_reg_map.get_coils(address, count)
+        if fx == 3:
+            # 保持寄存器区读取
+            return processed_reg_map.get_registers(address, count)
+        # DEBUG 日志可选
+        # print(f"[HMI] DEBUG: HMI read fx={fx} addr={address} cnt={count}")
+        return [0] * count
 
     def setValues(self, fx, address, values):
 
         # 线圈相关写入
         if fx in (1, 5, 15):
-            norm = [_to_bit(v) for v in values]
-            for i, v in enumerate(norm):
-                processed_reg_map.set_coil(address + i, v)
+            # 常见情况整批直接转换，出现非法值时再逐个容错转换
+            try:
+                norm = [1 if int(v) else 0 for v in values]
+            except (ValueError, TypeError):
+                norm = [_to_bit(v) for v in values]
+            # 一次加锁批量写入，再统一通知订阅者和触发回调
+            processed_reg_map.set_coils(range(address, address + len(norm)), norm)
             # print(f"[HMI] DEBUG: HMI write coils fx={fx} addr={address} values={norm}")
             return
 
         # 保持寄存器相关写入
         if fx in (3, 6, 16):
-            norm = [_to_u16(v) for v in values]
-            for i, v in enumerate(norm):
-                processed_reg_map.set_register(address + i, v)
+            try:
+                norm = array.array("H", [int(v) & 0xFFFF for v in values])
+            except (ValueError, TypeError):
+                norm = array.array("H", [_to_u16(v) for v in values])
+            # 连续地址一次切片写入存储，array('H') 由 set_registers 直接拷贝，不再重复转换
+            processed_reg_map.set_registers(address, norm)
             # print(f"[HMI] DEBUG: HMI write registers fx={fx} addr={address} values={norm}")
             return
         # print(f"[HMI] DEBUG: HMI write ignored fx={fx} addr={address} values={values}")
@@ -140,46 +190,20 @@ def _run_modbus_rtu_server():
     """
     context = _build_modbus_context(single=True)
 
-    identity = ModbusDeviceIdentification()
-    identity.VendorName = _IDENTITY_CFG.get("VendorName", "")
-    identity.ProductCode = _IDENTITY_CFG.get("ProductCode", "")
-    identity.VendorUrl = _IDENTITY_CFG.get("VendorUrl", "")
-    identity.ProductName = _IDENTITY_CFG.get("ProductName", "")
-    identity.ModelName = _IDENTITY_CFG.get("ModelName", "")
-    identity.MajorMinorRevision = _IDENTITY_CFG.get("MajorMinorRevision", "")
-
-    # 更积极的串口参数，降低卡顿：较短超时与无重试
-    port = _RTU_CFG.get("port", "COM1")
-    baudrate = _RTU_CFG.get("baud_rate", 9600)
-    bytesize = _RTU_CFG.get("byte_size", 8)
-    parity = _RTU_CFG.get("parity", "N")
-    stopbits = _RTU_CFG.get("stop_bits", 1)
-    timeout = float(_RTU_CFG.get("timeout", 0.2))  # 建议 0.2~0.5
-    # 额外 pyserial 参数（按需存在则传入）
-    xonxoff = bool(_RTU_CFG.get("xonxoff", False))
-    rtscts = bool(_RTU_CFG.get("rtscts", False))
-    dsrdtr = bool(_RTU_CFG.get("dsrdtr", False))
-
+    delay = RTU_RETRY_MIN_DELAY
     while True:
+        started = time.monotonic()
         try:
-            StartSerialServer(
-                context,
-                identity=identity,
-                port=port,
-                baudrate=baudrate,
-                bytesize=bytesize,
-                parity=parity,
-                stopbits=stopbits,
-                timeout=timeout,
-                xonxoff=xonxoff,
-                rtscts=rtscts,
-                dsrdtr=dsrdtr,
-            )
+            StartSerialServer(context, identity=_IDENTITY, **_SERIAL_KW)
             # 正常退出（一般不会发生）
             return
         except Exception as e:
-            print(f"[HMI] WARNING: RTU slave startup failed: {e}, will retry in 5 seconds...")
-            time.sleep(5)
+            # 运行过一段时间后才失败（如串口运行中被拔出），从最短间隔重新开始退避
+            if time.monotonic() - started >= RTU_RETRY_MAX_DELAY:
+                delay = RTU_RETRY_MIN_DELAY
+            print(f"[HMI] WARNING: RTU slave startup failed: {e}, will retry in {delay} seconds...")
+            time.sleep(delay)
+            delay = min(delay * 2, RTU_RETRY_MAX_DELAY)
 
 
 def start_modbus_hmi_server():
@@ -1,205 +1,266 @@
-import json
-from collections import OrderedDict
+import copy
+import threading
+import time
 
-from flask import Response
+from cdu120kw.control_logic.device_data_manipulation import CONFIG_CACHE, get_all_fan_states, get_all_pump_states
+from cdu120kw.server.json_response import json_response
 
-from cdu120kw.control_logic.device_data_manipulation import get_all_fan_states, get_all_pump_states
+_THERMAL_CONTEXT = "/redfish/v1/$metadata#Thermal.v1_7_0.Thermal"
+_THERMAL_TYPE = "#Thermal.v1_7_0.Thermal"
+_FANS_ID = "/redfish/v1/Chassis/1/Thermal/Fans"
+_PUMPS_ID = "/redfish/v1/Chassis/1/Thermal/Pumps"
+_POWER_VALUES = ("On", "Off")
 
-def get_redfish_all_fans(mapping_task_manager, component_config_path="config/cdu_120kw_component.json"):
+# 状态值 -> (State, Health)：0未运行，1运行，2故障，未知值按未运行处理
+_STATE_MAP = {
+    0: ("Disabled", "OK"),
+    1: ("Enabled", "OK"),
+    2: ("Enabled", "Critical"),
+}
+_STATE_DEFAULT = _STATE_MAP[0]
+
+
+def _duty_ranges(component_cfg, kind):
+    """
+    计算各设备的 (min_duty, max_duty)，缺省为0
+    :param component_cfg: 已解析的组件配置字典
+    :param kind: "fans" 或 "pumps"
+    """
+    ranges = []
+    for item in component_cfg.get(kind, []):
+        cfg = item.get("config", {})
+        ranges.append((cfg.get("min_duty", 0), cfg.get("max_duty", 0)))
+    return tuple(ranges)
+
+
+# 状态数据来自 device_data_manipulation 导入时加载的 CONFIG_CACHE，上下限也取自同一份配置，导入时计算一次
+_FAN_DUTY_RANGES = _duty_ranges(CONFIG_CACHE, "fans")
+_PUMP_DUTY_RANGES = _duty_ranges(CONFIG_CACHE, "pumps")
+
+# 风扇/水泵状态快照有效期（秒）：仪表盘通常先后请求 Fans 和 Pumps，两次请求共用一次状态计算
+THERMAL_TTL = 0.2
+# (计算时间, 风扇状态列表, 水泵状态列表)
+_thermal_cache = None
+_thermal_lock = threading.Lock()
+
+
+def _get_thermal_states(mapping_task_manager):
+    """
+    一次计算风扇和水泵状态，THERMAL_TTL 内复用上次结果
+    get_register_map() 返回的是轮询任务持续更新的同一个映射对象，需要去重的是基于它的状态计算
+    :param mapping_task_manager: 映射轮询任务管理器
+    :return: (风扇状态列表, 水泵状态列表)
+    """
+    global _thermal_cache
+    with _thermal_lock:
+        cached = _thermal_cache
+        if cached is not None and time.monotonic() - cached[0] < THERMAL_TTL:
+            return cached[1], cached[2]
+        reg_map = mapping_task_manager.get_register_map()
+        fans = get_all_fan_states(reg_map)
+        pumps = get_all_pump_states(reg_map)
+        _thermal_cache = (time.monotonic(), fans, pumps)
+        return fans, pumps
+
+
+def _item_template(collection_id, label, i):
+    """
+    单个设备条目的固定部分（地址、类型、Id、默认名称）
+    :param collection_id: _FANS_ID 或 _PUMPS_ID
+    :param label: "Fan" 或 "Pump"
+    :param i: 设备序号（从0开始）
+    """
+    return {
+        "@odata.id": f"{collection_id}/{i + 1}",
+        "@odata.type": _THERMAL_TYPE,
+        "Id": str(i + 1),
+        "Name": f"{label} {i + 1}",
+    }
+
+
+def _item_actions(collection_id, label, i, min_duty, max_duty):
+    """
+    单个设备的 Actions，只随序号和占空比上下限变化
+    """
+    item_id = f"{collection_id}/{i + 1}"
+    return {
+        f"#{label}.ResetMetrics": {
+            "target": f"{item_id}/Actions/{label}.ResetMetrics",
+            "title": f"Reset {label} Metrics"
+        },
+        f"#Cdu.{label}Control": {
+            "target": f"{item_id}/Actions/Cdu.{label}Control",
+            "title": f"Control {label} Operation",
+            "PowerControl@Redfish.AllowableValues": _POWER_VALUES,
+            "DutyCycleControl@Redfish.AllowableRange": {
+                "From": min_duty,
+                "To": max_duty
+            }
+        }
+    }
+
+
+# 设备数量与上下限均来自 CONFIG_CACHE，条目固定部分和 Actions 导入时构造一次
+# 使用时复制，避免响应之间共享同一份可变对象
+_FAN_TEMPLATES = tuple(_item_template(_FANS_ID, "Fan", i) for i in range(len(_FAN_DUTY_RANGES)))
+_PUMP_TEMPLATES = tuple(_item_template(_PUMPS_ID, "Pump", i) for i in range(len(_PUMP_DUTY_RANGES)))
+_FAN_ACTIONS = tuple(
+    _item_actions(_FANS_ID, "Fan", i, min_duty, max_duty)
+    for i, (min_duty, max_duty) in enumerate(_FAN_DUTY_RANGES)
+)
+_PUMP_ACTIONS = tuple(
+    _item_actions(_PUMPS_ID, "Pump", i, min_duty, max_duty)
+    for i, (min_duty, max_duty) in enumerate(_PUMP_DUTY_RANGES)
+)
+
+
+def get_redfish_all_fans(mapping_task_manager, component_cfg=None):
     """
     Redfish风扇路由，DutyCycle上下限根据配置文件动态输出
+    :param mapping_task_manager: 映射轮询任务管理器
+    :param component_cfg: 已解析的组件配置字典，为None时使用已加载的组件配置
     """
     try:
-        reg_map = mapping_task_manager.get_register_map()
         # 获取处理后的风扇数据
-        fans_data = get_all_fan_states(reg_map, component_config_path)
+        fans_data = _get_thermal_states(mapping_task_manager)[0]
 
-        # 加载配置文件，获取min_duty/max_duty
-        with open(component_config_path, "r", encoding="utf-8-sig") as f:
-            config = json.load(f)
-        fans_cfg = config.get("fans", [])
+        # 获取min_duty/max_duty：未传入配置时使用导入时预计算的结果，不再读取文件
+        if component_cfg is None:
+            fans_ranges = _FAN_DUTY_RANGES
+        else:
+            fans_ranges = _duty_ranges(component_cfg, "fans")
 
         fans_list = []
         for i, fan in enumerate(fans_data):
             # 获取min_duty/max_duty，若无则为0
-            min_duty = 0
-            max_duty = 0
-            if i < len(fans_cfg):
-                cfg = fans_cfg[i].get("config", {})
-                min_duty = cfg.get("min_duty", 0)
-                max_duty = cfg.get("max_duty", 0)
-
+            min_duty, max_duty = fans_ranges[i] if i < len(fans_ranges) else (0, 0)
             # 状态映射
-            state_val = fan.get("state", 0)
-            if state_val == 1:
-                state_str = "Enabled"
-                health_str = "OK"
-            elif state_val == 2:
-                state_str = "Enabled"
-                health_str = "Critical"
+            state_str, health_str = _STATE_MAP.get(fan.get("state", 0), _STATE_DEFAULT)
+            if i < len(_FAN_TEMPLATES):
+                item = _FAN_TEMPLATES[i].copy()
             else:
-                state_str = "Disabled"
-                health_str = "OK"
-
-            fan_item = OrderedDict([
-                ("@odata.id", f"/redfish/v1/Chassis/1/Thermal/Fans/{i+1}"),
-                ("@odata.type", "#Thermal.v1_7_0.Thermal"),
-                ("Id", str(i+1)),
-                ("Name", fan.get("name", f"Fan {i+1}")),
-                ("Status", {
-                    "State": state_str,
-                    "Health": health_str
-                }),
-                ("DutyCycle", {
-                    "Reading": fan.get("duty_cycle", 0),
-                    "Min": min_duty,
-                    "Max": max_duty,
-                    "Units": "%"
-                }),
-                ("Speed", {
-                    "Reading": fan.get("speed", 0),
-                    "Desired": 0,
-                    "Min": 0,
-                    "Max": 0,
-                    "Units": "RPM"
-                }),
-                ("ElectricalCurrent", {
-                    "Reading": fan.get("current", 0),
-                    "Min": 0,
-                    "Max": 6,
-                    "Units": "A"
-                }),
-                ("Actions", {
-                    "#Fan.ResetMetrics": {
-                        "target": f"/redfish/v1/Chassis/1/Thermal/Fans/{i+1}/Actions/Fan.ResetMetrics",
-                        "title": "Reset Fan Metrics"
-                    },
-                    "#Cdu.FanControl": {
-                        "target": f"/redfish/v1/Chassis/1/Thermal/Fans/{i+1}/Actions/Cdu.FanControl",
-                        "title": "Control Fan Operation",
-                        "PowerControl@Redfish.AllowableValues": ["On", "Off"],
-                        "DutyCycleControl@Redfish.AllowableRange": {
-                            "From": min_duty,
-                            "To": max_duty
-                        }
-                    }
-                })
-            ])
-            fans_list.append(fan_item)
-
-        result = OrderedDict([
-            ("@odata.context", "/redfish/v1/$metadata#Thermal.v1_7_0.Thermal"),
-            ("@odata.id", "/redfish/v1/Chassis/1/Thermal/Fans"),
-            ("@odata.type", "#Thermal.v1_7_0.Thermal"),
-            ("Id", "Fans"),
-            ("Name", "Fans"),
-            ("Fans", fans_list)
-        ])
-        return Response(json.dumps(result, ensure_ascii=False), mimetype="application/json")
+                item = _item_template(_FANS_ID, "Fan", i)
+            item["Name"] = fan.get("name", item["Name"])
+            item["Status"] = {
+                "State": state_str,
+                "Health": health_str
+            }
+            item["DutyCycle"] = {
+                "Reading": fan.get("duty_cycle", 0),
+                "Min": min_duty,
+                "Max": max_duty,
+                "Units": "%"
+            }
+            item["Speed"] = {
+                "Reading": fan.get("speed", 0),
+                "Desired": 0,
+                "Min": 0,
+                "Max": 0,
+                "Units": "RPM"
+            }
+            item["ElectricalCurrent"] = {
+                "Reading": fan.get("current", 0),
+                "Min": 0,
+                "Max": 6,
+                "Units": "A"
+            }
+            if component_cfg is None and i < len(_FAN_ACTIONS):
+                item["Actions"] = copy.deepcopy(_FAN_ACTIONS[i])
+            else:
+                item["Actions"] = _item_actions(_FANS_ID, "Fan", i, min_duty, max_duty)
+            fans_list.append(item)
+
+        result = {
+            "@odata.context": _THERMAL_CONTEXT,
+            "@odata.id": _FANS_ID,
+            "@odata.type": _THERMAL_TYPE,
+            "Id": "Fans",
+            "Name": "Fans",
+            "Fans": fans_list
+        }
+        return json_response(result)
 
     except Exception as e:
         print(f"[Redfish] CRITICAL: Failed to get redfish fans: {str(e)}")
-        result = OrderedDict([
-            ("code", 1),
-            ("message", f"InternalError: {str(e)}"),
-            ("data", [])
-        ])
-        return Response(json.dumps(result, ensure_ascii=False), mimetype="application/json"), 500
-
-def get_redfish_all_pumps(mapping_task_manager, component_config_path="config/cdu_120kw_component.json"):
+        result = {
+            "code": 1,
+            "message": f"InternalError: {str(e)}",
+            "data": []
+        }
+        return json_response(result, 500)
+
+
+def get_redfish_all_pumps(mapping_task_manager, component_cfg=None):
     """
     Redfish水泵路由，DutyCycle上下限根据配置文件动态输出
+    :param mapping_task_manager: 映射轮询任务管理器
+    :param component_cfg: 已解析的组件配置字典，为None时使用已加载的组件配置
     """
     try:
-        reg_map = mapping_task_manager.get_register_map()
         # 获取处理后的水泵数据
-        pumps_data = get_all_pump_states(reg_map, component_config_path)
-        # 加载配置文件，获取min_duty/max_duty
-        with open(component_config_path, "r", encoding="utf-8-sig") as f:
-            config = json.load(f)
-        pumps_cfg = config.get("pumps", [])
+        pumps_data = _get_thermal_states(mapping_task_manager)[1]
+
+        # 获取min_duty/max_duty：未传入配置时使用导入时预计算的结果，不再读取文件
+        if component_cfg is None:
+            pumps_ranges = _PUMP_DUTY_RANGES
+        else:
+            pumps_ranges = _duty_ranges(component_cfg, "pumps")
 
         pumps_list = []
         for i, pump in enumerate(pumps_data):
             # 获取min_duty/max_duty，若无则为0
-            min_duty = 0
-            max_duty = 0
-            if i < len(pumps_cfg):
-                cfg = pumps_cfg[i].get("config", {})
-                min_duty = cfg.get("min_duty", 0)
-                max_duty = cfg.get("max_duty", 0)
+            min_duty, max_duty = pumps_ranges[i] if i < len(pumps_ranges) else (0, 0)
             # 状态映射
-            state_val = pump.get("state", 0)
-            if state_val == 1:
-                state_str = "Enabled"
-                health_str = "OK"
-            elif state_val == 2:
-                state_str = "Enabled"
-                health_str = "Critical"
+            state_str, health_str = _STATE_MAP.get(pump.get("state", 0), _STATE_DEFAULT)
+            if i < len(_PUMP_TEMPLATES):
+                item = _PUMP_TEMPLATES[i].copy()
             else:
-                state_str = "Disabled"
-                health_str = "OK"
-            pump_item = OrderedDict([
-                ("@odata.id", f"/redfish/v1/Chassis/1/Thermal/Pumps/{i+1}"),
-                ("@odata.type", "#Thermal.v1_7_0.Thermal"),
-                ("Id", str(i+1)),
-                ("Name", pump.get("name", f"Pump {i+1}")),
-                ("Status", {
-                    "State": state_str,
-                    "Health": health_str
-                }),
-                ("DutyCycle", {
-                    "Reading": pump.get("duty_cycle", 0),
-                    "Min": min_duty,
-                    "Max": max_duty,
-                    "Units": "%"
-                }),
-                ("Speed", {
-                    "Reading": pump.get("speed", 0),
-                    "Desired": 0,
-                    "Min": 0,
-                    "Max": 0,
-                    "Units": "RPM"
-                }),
-                ("ElectricalCurrent", {
-                    "Reading": pump.get("current", 0),
-                    "Min": 0,
-                    "Max": 6,
-                    "Units": "A"
-                }),
-                ("Actions", {
-                    "#Pump.ResetMetrics": {
-                        "target": f"/redfish/v1/Chassis/1/Thermal/Pumps/{i+1}/Actions/Pump.ResetMetrics",
-                        "title": "Reset Pump Metrics"
-                    },
-                    "#Cdu.PumpControl": {
-                        "target": f"/redfish/v1/Chassis/1/Thermal/Pumps/{i+1}/Actions/Cdu.PumpControl",
-                        "title": "Control Pump Operation",
-                        "PowerControl@Redfish.AllowableValues": ["On", "Off"],
-                        "DutyCycleControl@Redfish.AllowableRange": {
-                            "From": min_duty,
-                            "To": max_duty
-                        }
-                    }
-                })
-            ])
-            pumps_list.append(pump_item)
-
-        result = OrderedDict([
-            ("@odata.context", "/redfish/v1/$metadata#Thermal.v1_7_0.Thermal"),
-            ("@odata.id", "/redfish/v1/Chassis/1/Thermal/Pumps"),
-            ("@odata.type", "#Thermal.v1_7_0.Thermal"),
-            ("Id", "Pumps"),
-            ("Name", "Pumps"),
-            ("Pumps", pumps_list)
-        ])
-        return Response(json.dumps(result, ensure_ascii=False), mimetype="application/json")
+                item = _item_template(_PUMPS_ID, "Pump", i)
+            item["Name"] = pump.get("name", item["Name"])
+            item["Status"] = {
+                "State": state_str,
+                "Health": health_str
+            }
+            item["DutyCycle"] = {
+                "Reading": pump.get("duty_cycle", 0),
+                "Min": min_duty,
+                "Max": max_duty,
+                "Units": "%"
+            }
+            item["Speed"] = {
+                "Reading": pump.get("speed", 0),
+                "Desired": 0,
+                "Min": 0,
+                "Max": 0,
+                "Units": "RPM"
+            }
+            item["ElectricalCurrent"] = {
+                "Reading": pump.get("current", 0),
+                "Min": 0,
+                "Max": 6,
+                "Units": "A"
+            }
+            if component_cfg is None and i < len(_PUMP_ACTIONS):
+                item["Actions"] = copy.deepcopy(_PUMP_ACTIONS[i])
+            else:
+                item["Actions"] = _item_actions(_PUMPS_ID, "Pump", i, min_duty, max_duty)
+            pumps_list.append(item)
+
+        result = {
+            "@odata.context": _THERMAL_CONTEXT,
+            "@odata.id": _PUMPS_ID,
+            "@odata.type": _THERMAL_TYPE,
+            "Id": "Pumps",
+            "Name": "Pumps",
+            "Pumps": pumps_list
+        }
+        return json_response(result)
 
     except Exception as e:
         print(f"[Redfish] CRITICAL: Failed to get redfish pumps: {str(e)}")
-        result = OrderedDict([
-            ("code", 1),
-            ("message", f"InternalError: {str(e)}"),
-            ("data", [])
-        ])
-        return Response(json.dumps(result, ensure_ascii=False), mimetype="application/json"), 500
\ No newline at end of file
+        result = {
+            "code": 1,
+            "message": f"InternalError: {str(e)}",
+            "data": []
+        }
+        return json_response(result, 500)
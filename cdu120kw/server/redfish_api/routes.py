@@ -4,12 +4,27 @@
 """
 
 import os
+import re
 import sys
+import time
 
-from flask import Flask, current_app, send_from_directory, request
+from flask import Blueprint, Flask, send_from_directory, request
+from werkzeug.exceptions import NotFound
 
 from cdu120kw.server.redfish_api.redfish_gain_fan_pump_state import get_redfish_all_fans, get_redfish_all_pumps
 
+# 前端构建产物文件名带 8 位内容哈希（如 index-BRPcrgw_.js），内容变化时文件名随之变化，可长期缓存
+# 哈希须含数字或大写字母，避免把 app-settings.js、user-profile.css 这类普通文件名误判为带哈希
+_HASHED_ASSET_RE = re.compile(r"-(?=[A-Za-z0-9_-]{0,7}[0-9A-Z])[A-Za-z0-9_-]{8}\.[A-Za-z0-9.]+$")
+# 普通静态资源缓存时间（秒）
+ASSET_MAX_AGE = 3600
+# 带哈希静态资源缓存时间（秒）
+HASHED_ASSET_MAX_AGE = 31536000
+# 404 时返回 JSON 而不是前端入口页面的路径前缀
+_API_PREFIXES = ("/api/", "/redfish/")
+# index.html 存在性检查间隔（秒），替换前端文件后无需重启即可生效
+INDEX_CHECK_INTERVAL = 5.0
+
 
 def get_resource_path(relative_path):
     """
@@ -44,24 +59,30 @@ def get_resource_path(relative_path):
 def configure_api_routes(app: Flask):
     """
     注册所有 API 路由
+    Redfish 热管理路由挂在同一个蓝图下，末尾带不带斜杠都直接匹配，不产生 308 重定向
     """
+    thermal_bp = Blueprint("redfish_thermal", __name__, url_prefix="/redfish/v1/Chassis/1/Thermal")
+    # 直接引用应用配置字典，避免每次请求经 current_app 代理查找
+    app_config = app.config
 
     # 获取所有风扇信息
-    @app.route("/redfish/v1/Chassis/1/Thermal/Fans", methods=["GET"])
+    @thermal_bp.route("/Fans", methods=["GET"], strict_slashes=False)
     def fans_api():
-        controller = current_app.config.get("CONTROLLER")
+        controller = app_config.get("CONTROLLER")
         if controller is None:
             return {"code": 1, "message": "Controller not initialized", "data": []}, 500
         return get_redfish_all_fans(controller.mapping_task_manager)
 
     # 获取所有水泵信息
-    @app.route("/redfish/v1/Chassis/1/Thermal/Pumps", methods=["GET"])
+    @thermal_bp.route("/Pumps", methods=["GET"], strict_slashes=False)
     def pumps_api():
-        controller = current_app.config.get("CONTROLLER")
+        controller = app_config.get("CONTROLLER")
         if controller is None:
             return {"code": 1, "message": "Controller not initialized", "data": []}, 500
         return get_redfish_all_pumps(controller.mapping_task_manager)
 
+    app.register_blueprint(thermal_bp)
+
 
 def find_static_directory():
     """
@@ -103,25 +124,40 @@ def configure_web_routes(app: Flask):
 
     # print(f"INFO: Using static resource directory: {static_dir}")
 
+    # 前端入口页面路径只计算一次，存在性检查结果缓存 INDEX_CHECK_INTERVAL 秒，避免每次 SPA/404 分发都 stat
+    index_path = os.path.join(static_dir, "index.html")
+    index_checked_at = time.monotonic()
+    index_found = os.path.exists(index_path)
+
+    def index_exists():
+        nonlocal index_checked_at, index_found
+        now = time.monotonic()
+        if now - index_checked_at >= INDEX_CHECK_INTERVAL:
+            index_checked_at = now
+            index_found = os.path.exists(index_path)
+        return index_found
+
     # 提供静态资源文件 (如JS、CSS、图片等)
+    assets_dir = os.path.join(static_dir, "assets")
+
     @app.route("/assets/<path:filename>")
     def serve_assets(filename):
         """
         提供 assets 目录下的静态资源文件
+        send_from_directory 通过 safe_join 防止目录遍历，文件不存在时抛出 NotFound，
+        并附带 ETag/Last-Modified，客户端可用条件请求得到 304
         """
-        assets_dir = os.path.join(static_dir, "assets")
-
-        # 安全检查：防止目录遍历攻击
-        if '..' in filename or filename.startswith('/'):
-            print(f"WARNING: Potential directory traversal attempt: {filename}")
-            return "Invalid filename", 400
-
-        file_path = os.path.join(assets_dir, filename)
-        if not os.path.exists(file_path) or not os.path.isfile(file_path):
+        try:
+            response = send_from_directory(assets_dir, filename, max_age=ASSET_MAX_AGE)
+        except NotFound:
             print(f"WARNING: Asset not found: {filename}")
             return "Asset not found", 404
 
-        return send_from_directory(assets_dir, filename)
+        if _HASHED_ASSET_RE.search(filename):
+            response.cache_control.public = True
+            response.cache_control.max_age = HASHED_ASSET_MAX_AGE
+            response.cache_control.immutable = True
+        return response
 
     # 提供SPA入口，处理所有非API的GET请求
     @app.route("/", defaults={"path": ""})
@@ -135,8 +171,7 @@ def configure_web_routes(app: Flask):
             return "Method Not Allowed", 405
 
         # 检查 index.html 是否存在
-        index_path = os.path.join(static_dir, "index.html")
-        if not os.path.exists(index_path):
+        if not index_exists():
             print(f"ERROR: index.html not found in static resource directory: {static_dir}")
 
             # 返回一个简单的错误页面，而不是 500 错误
@@ -176,7 +211,7 @@ def configure_web_routes(app: Flask):
         - 如果是API路由，返回JSON错误信息
         - 其他路由返回SPA入口页面
         """
-        if request.path.startswith("/api/") or request.path.startswith("/redfish/"):
+        if request.path.startswith(_API_PREFIXES):
             print(f"WARNING: API resource not found: {request.path}")
             return {
                 "error": "Not found",
@@ -187,8 +222,7 @@ def configure_web_routes(app: Flask):
         print(f"INFO: Route not found, serving SPA entry: {request.path}")
 
         # 检查 index.html 是否存在
-        index_path = os.path.join(static_dir, "index.html")
-        if not os.path.exists(index_path):
+        if not index_exists():
             print(f"ERROR: index.html not found in static resource directory: {static_dir}")
             return "Web interface not available", 500
 
@@ -6,12 +6,69 @@
 获取制冷量
 """
 
-import json
-from collections import OrderedDict
+from cdu120kw.server.json_response import json_response
 
-from flask import Response
+
+def _item_template(name, label, unit, item_type, is_original):
+    """
+    构造参数条目模板，字段顺序固定；请求时 copy() 后只修改 value
+    """
+    return {
+        "name": name,
+        "label": label,
+        "value": 0.0,
+        "unit": unit,
+        "type": item_type,
+        "is_original": is_original,
+        "state": 1,
+    }
+
+
+# 各参数条目模板，导入时构造一次
+_PRESSURE_TEMPLATES = tuple(
+    _item_template(name, "", "Psi", "pressure", 1) for name in ("P1", "P2", "P3", "P4")
+)
+_PRESSURE_DIFF_TEMPLATE = _item_template("P4-P1", "Differential Pressure", "Psi", "pressure", 0)
+_TEMP_TEMPLATES = tuple(
+    _item_template(name, "", "°C", "temperature", 1) for name in ("T1", "T2", "T3", "T4", "T5")
+)
+_TEMP_DELTA_TEMPLATE = _item_template("T3-T4", "Approach Temperature", "°C", "temperature", 0)
+_FLOW_TEMPLATE = _item_template("F1", "Total Flow", "L/Min", "flow", 1)
+_CAPACITY_TEMPLATE = _item_template("Cooling Capacity", "", "kW", "capacity", 0)
+
+
+# 压力/温度/流量寄存器地址，一次批量读取得到同一时刻的快照
+_PRESSURE_ADDRS = (3304, 3405, 3406, 3407)
+_TEMP_ADDRS = (3328, 3329, 3330, 3360, 3361)
+_FLOW_ADDR = 3395
+_STATE_ADDRS = _PRESSURE_ADDRS + _TEMP_ADDRS + (_FLOW_ADDR,)
+_TEMP_OFFSET = len(_PRESSURE_ADDRS)
+_FLOW_OFFSET = _TEMP_OFFSET + len(_TEMP_ADDRS)
+
+
+def _pressure_from_raw(raw_value):
+    """
+    ADC原始值转mA（最低按4mA计），再转百分比
+    """
+    return round(100.0 * (max(raw_value / 1000.0, 4.0) - 4.0) / 16.0, 2)
+
+
+def _temp_from_raw(raw_value):
+    """
+    原始值/10 得到温度
+    """
+    return round(raw_value / 10.0, 1)
 
 
+def _convert_all(raw_values, names, convert):
+    """
+    批量换算，非整数值生成错误信息
+    """
+    return [
+        convert(raw) if isinstance(raw, int) else f"Error: Non integer ADC value({name}) ({name})"
+        for raw, name in zip(raw_values, names)
+    ]
+
 
 def get_register_value(registers, address, default=0):
     """安全获取寄存器值，未读到则返回默认值"""
@@ -26,7 +83,7 @@ def get_all_system_states(mapping_task_manager):
     try:
         # 获取本地寄存器映射
         reg_map = mapping_task_manager.get_register_map()
-        registers = reg_map.registers
+        raw_values = reg_map.get_registers_at(_STATE_ADDRS)
 
         data = []  # 所有参数数据列表
         errors = []  # 错误信息列表
@@ -34,36 +91,11 @@ def get_all_system_states(mapping_task_manager):
         message = ""  # 错误信息
 
         #  压力参数处理
-        pressure_addrs = [3304, 3405, 3406, 3407]
         pressure_names = ["P1", "P2", "P3", "P4"]
-        pressure_labels = ["", "", "", ""]
-        pressures = []
-        for i, addr in enumerate(pressure_addrs):
-            raw_value = registers.get(addr, 0)
-            try:
-                # ADC原始值转mA，再转百分比
-                if not isinstance(raw_value, int):
-                    raise ValueError(f"Non integer ADC value({pressure_names[i]})")
-                current_ma = raw_value / 1000.0
-                clamped_ma = max(current_ma, 4.0)
-                pressure_percent = 100.0 * (clamped_ma - 4.0) / 16.0
-                pressure = round(pressure_percent, 2)
-            except Exception as e:
-                pressure = f"Error: {str(e)} ({pressure_names[i]})"
-            pressures.append(pressure)
+        pressures = _convert_all(raw_values[:_TEMP_OFFSET], pressure_names, _pressure_from_raw)
 
         for i, value in enumerate(pressures):
-            item = OrderedDict(
-                [
-                    ("name", pressure_names[i]),
-                    ("label", pressure_labels[i] if i < len(pressure_labels) else ""),
-                    ("value", 0.0),
-                    ("unit", "Psi"),
-                    ("type", "pressure"),
-                    ("is_original", 1),
-                    ("state", 1),
-                ]
-            )
+            item = _PRESSURE_TEMPLATES[i].copy()
             if isinstance(value, str) and "Error" in value:
                 code = 1
                 errors.append(f"{pressure_names[i]}: {value}")
@@ -81,17 +113,7 @@ def get_all_system_states(mapping_task_manager):
             diff = f"Error: Invalid data type (P1: {type(pressures[0])}, P4: {type(pressures[3])})"
         else:
             diff = round(pressures[3] - pressures[0], 2)
-        diff_item = OrderedDict(
-            [
-                ("name", "P4-P1"),
-                ("label", "Differential Pressure"),
-                ("value", 0.0),
-                ("unit", "Psi"),
-                ("type", "pressure"),
-                ("is_original", 0),
-                ("state", 1),
-            ]
-        )
+        diff_item = _PRESSURE_DIFF_TEMPLATE.copy()
         if isinstance(diff, str) and "Error" in diff:
             code = 1
             errors.append(f"P4-P1: {diff}")
@@ -100,33 +122,12 @@ def get_all_system_states(mapping_task_manager):
         data.append(diff_item)
 
         #  温度参数处理
-        temp_addrs = [3328, 3329, 3330, 3360, 3361]
         temp_names = ["T1", "T2", "T3", "T4", "T5"]
-        temp_labels = ["", "", "", "", ""]
-        temps = []
-        for i, addr in enumerate(temp_addrs):
-            raw_value = registers.get(addr, 0)
-            try:
-                # 原始值/10 得到温度
-                if not isinstance(raw_value, int):
-                    raise ValueError(f"Non integer ADC value({temp_names[i]})")
-                temp = round(raw_value / 10.0, 1)
-            except Exception as e:
-                temp = f"Error: {str(e)} ({temp_names[i]})"
-            temps.append(temp)
+        # 原始值/10 得到温度
+        temps = _convert_all(raw_values[_TEMP_OFFSET:_FLOW_OFFSET], temp_names, _temp_from_raw)
 
         for i, value in enumerate(temps):
-            item = OrderedDict(
-                [
-                    ("name", temp_names[i]),
-                    ("label", temp_labels[i] if i < len(temp_labels) else ""),
-                    ("value", 0.0),
-                    ("unit", "°C"),
-                    ("type", "temperature"),
-                    ("is_original", 1),
-                    ("state", 1),
-                ]
-            )
+            item = _TEMP_TEMPLATES[i].copy()
             if isinstance(value, str) and "Error" in value:
                 code = 1
                 errors.append(f"{temp_names[i]}: {value}")
@@ -145,17 +146,7 @@ def get_all_system_states(mapping_task_manager):
             )
         else:
             delta = round(temps[2] - temps[3], 1)
-        delta_item = OrderedDict(
-            [
-                ("name", "T3-T4"),
-                ("label", "Approach Temperature"),
-                ("value", 0.0),
-                ("unit", "°C"),
-                ("type", "temperature"),
-                ("is_original", 0),
-                ("state", 1),
-            ]
-        )
+        delta_item = _TEMP_DELTA_TEMPLATE.copy()
         if isinstance(delta, str) and "Error" in delta:
             code = 1
             errors.append(f"T3-T4: {delta}")
@@ -164,7 +155,7 @@ def get_all_system_states(mapping_task_manager):
         data.append(delta_item)
 
         #  流量参数处理
-        raw_flow = registers.get(3395, 0)
+        raw_flow = raw_values[_FLOW_OFFSET]
         try:
             # 流量公式：5.313 * (mA - 4.0)
             if not isinstance(raw_flow, int):
@@ -176,17 +167,7 @@ def get_all_system_states(mapping_task_manager):
             flow = round(flow_value, 2)
         except Exception as e:
             flow = f"Error: {str(e)} (F1)"
-        flow_item = OrderedDict(
-            [
-                ("name", "F1"),
-                ("label", "Total Flow"),
-                ("value", 0.0),
-                ("unit", "L/Min"),
-                ("type", "flow"),
-                ("is_original", 1),
-                ("state", 1),
-            ]
-        )
+        flow_item = _FLOW_TEMPLATE.copy()
         if isinstance(flow, str) and "Error" in flow:
             code = 1
             errors.append(f"F1: {flow}")
@@ -196,8 +177,8 @@ def get_all_system_states(mapping_task_manager):
 
         #  制冷量参数处理
         # 读取温度T1和T3（用于制冷量计算）
-        raw_t1 = registers.get(3328, 0)
-        raw_t3 = registers.get(3330, 0)
+        raw_t1 = raw_values[_TEMP_OFFSET]
+        raw_t3 = raw_values[_TEMP_OFFSET + 2]
         try:
             if not isinstance(raw_t1, int):
                 raise ValueError("Non integer ADC value(T1)")
@@ -230,17 +211,7 @@ def get_all_system_states(mapping_task_manager):
         else:
             cap = ((flow / 60) * 1.01163) * 3.972 * (t1 - t3)
             cooling_capacity = round(max(cap, 0.0), 2)
-        cap_item = OrderedDict(
-            [
-                ("name", "Cooling Capacity"),
-                ("label", ""),
-                ("value", 0.0),
-                ("unit", "kW"),
-                ("type", "capacity"),
-                ("is_original", 0),
-                ("state", 1),
-            ]
-        )
+        cap_item = _CAPACITY_TEMPLATE.copy()
         if isinstance(cooling_capacity, str) and "Error" in cooling_capacity:
             code = 1
             errors.append(f"CoolingCapacity: {cooling_capacity}")
@@ -252,19 +223,10 @@ def get_all_system_states(mapping_task_manager):
         if errors:
             message = "; ".join(errors)
 
-        result = OrderedDict([("code", code), ("message", message), ("data", data)])
-        return Response(
-            json.dumps(result, ensure_ascii=False), mimetype="application/json"
-        )
+        result = {"code": code, "message": message, "data": data}
+        return json_response(result)
 
     except Exception as e:
         print(f"[SystemState] CRITICAL: Failed to get all system states: {str(e)}")
-        result = OrderedDict(
-            [("code", 1), ("message", f"InternalError: {str(e)}"), ("data", [])]
-        )
-        return (
-            Response(
-                json.dumps(result, ensure_ascii=False), mimetype="application/json"
-            ),
-            500,
-        )
+        result = {"code": 1, "message": f"InternalError: {str(e)}", "data": []}
+        return json_response(result, 500)
@@ -149,7 +149,7 @@ class AppController:
             # 初始化自动控制逻辑
             from cdu120kw.control_logic.auto_control import initialize_auto_control
             initialize_auto_control()
-            start_io_control(interval=0.5)
+            start_io_control(interval=5.0)
 
             self.start_flask_server()
             self.service_stopped = False
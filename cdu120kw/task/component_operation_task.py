@@ -88,6 +88,44 @@ class ComponentOperationTaskManager(BasePollingTaskManager):
                 return field, write_type, address, decimals, rng, value
         return None, None, None, None, (None, None), None
 
+    @staticmethod
+    def _normalize_write_value(param: "ComponentTaskParam", field, write_type, decimals, rng, value) -> int:
+        """
+        写入值规整：占空比按小数位放大、按配置范围夹取，线圈归一为0/1，寄存器转U16
+        """
+        # 占空比/范围夹取（若配置提供 min/max）
+        min_v, max_v = rng if isinstance(rng, tuple) else (None, None)
+        try:
+            ivalue = int(value)
+        except (ValueError, TypeError):
+            ivalue = 0
+
+        # 根据占空比的小数位进行动态放大（仅对 duty 字段生效）
+        scale = 1
+        duty_decimals = int(decimals or 0)
+        # 识别占空比字段：rw_d_duty*
+        if write_type == "register" and isinstance(field, str) and "rw_d_duty" in field:
+            if duty_decimals == 0:
+                # 预映射未取到时，回退到配置中的 rw_d_duty_decimals
+                try:
+                    duty_decimals = int(param.config.get("rw_d_duty_decimals", 0) or 0)
+                except (ValueError, TypeError):
+                    duty_decimals = 0
+            if duty_decimals > 0:
+                scale = 10 ** duty_decimals
+
+        # 进行按 scale 后的范围夹取
+        if min_v is not None:
+            ivalue = max(ivalue, int(min_v * scale))
+        if max_v is not None:
+            ivalue = min(ivalue, int(max_v * scale))
+        # 写入值规整
+        if write_type == "coil":
+            write_value = 1 if int(ivalue) else 0
+        else:
+            write_value = to_u16(ivalue)
+        return write_value
+
     def _start_mode_watchdog(self):
         """
         启动模式监视线程
@@ -169,37 +207,7 @@ class ComponentOperationTaskManager(BasePollingTaskManager):
             if write_type is None or address is None:
                 return "No valid writable address"
 
-            # 占空比/范围夹取（若配置提供 min/max）
-            min_v, max_v = rng if isinstance(rng, tuple) else (None, None)
-            try:
-                ivalue = int(value)
-            except (ValueError, TypeError):
-                ivalue = 0
-
-            # 根据占空比的小数位进行动态放大（仅对 duty 字段生效）
-            scale = 1
-            duty_decimals = int(decimals or 0)
-            # 识别占空比字段：rw_d_duty*
-            if write_type == "register" and isinstance(field, str) and "rw_d_duty" in field:
-                if duty_decimals == 0:
-                    # 预映射未取到时，回退到配置中的 rw_d_duty_decimals
-                    try:
-                        duty_decimals = int(param.config.get("rw_d_duty_decimals", 0) or 0)
-                    except (ValueError, TypeError):
-                        duty_decimals = 0
-                if duty_decimals > 0:
-                    scale = 10 ** duty_decimals
-
-            # 进行按 scale 后的范围夹取
-            if min_v is not None:
-                ivalue = max(ivalue, int(min_v * scale))
-            if max_v is not None:
-                ivalue = min(ivalue, int(max_v * scale))
-            # 写入值规整
-            if write_type == "coil":
-                write_value = 1 if int(ivalue) else 0
-            else:
-                write_value = to_u16(ivalue)
+            write_value = self._normalize_write_value(param, field, write_type, decimals, rng, value)
 
             # 去重：相同地址与相同值则跳过
             last_key = (write_type, address, int(slave), self.current_mode)
@@ -217,10 +225,69 @@ class ComponentOperationTaskManager(BasePollingTaskManager):
             )
             return "Write task submitted"
 
+    def batch_operate(self, items: list, slave: int = 1, priority: int = 0):
+        """
+        批量触发写入
+        items: [(name, value_dict), ...]，value_dict 含义同 operate_component
+        所有组件字段只解析一次，按写入类型与连续地址分组，每组提交一次多线圈(FC15)/多寄存器(FC16)写入
+        """
+        self.update_mode()
+        with self.lock:
+            if not self.accept_new_task:
+                print("[ComponentOperationTask] WARNING: Communication offline, reject new write task")
+                return "Communication offline, reject new write task"
+            if not self.param_mgr:
+                return "Param manager not initialized"
+
+            entries = []
+            for name, value_dict in items:
+                param = self.param_mgr.get_param(name)
+                if not param or not param.enabled:
+                    continue
+                field, write_type, address, decimals, rng, value = self._pick_first_writable(param, value_dict)
+                if write_type is None or address is None:
+                    continue
+                write_value = self._normalize_write_value(param, field, write_type, decimals, rng, value)
+
+                # 去重：相同地址与相同值则跳过
+                last_key = (write_type, address, int(slave), self.current_mode)
+                if self.last_write_values.get(last_key) == write_value:
+                    continue
+                self.last_write_values[last_key] = write_value
+                entries.append((write_type, address, write_value, param))
+
+            if not entries:
+                return "Skip write: value not changed"
+
+            # 按类型与地址排序后合并连续地址
+            entries.sort(key=lambda e: (e[0], e[1]))
+            groups = []
+            for write_type, address, write_value, param in entries:
+                last = groups[-1] if groups else None
+                if last and last[0] == write_type and last[1] + len(last[2]) == address:
+                    last[2].append(write_value)
+                    last[3].append(param.name)
+                else:
+                    groups.append((write_type, address, [write_value], [param.name]))
+
+            for write_type, address, values, names in groups:
+                self.task_queue.put_task(
+                    func=self.execute_batch_write,
+                    args=(",".join(names), values, slave, address, write_type),
+                    priority=priority if isinstance(priority, int) else 0,
+                )
+            return "Write task submitted"
+
     def execute_write(self, param: ComponentTaskParam, value: int, slave: int, address: int, write_type: str):
         """
         实际写入PCBA寄存器，失败内部重试3次；无可用连接返回False交由调度层等待恢复
         """
+        return self.execute_batch_write(param.name, [value], slave, address, write_type)
+
+    def execute_batch_write(self, label: str, values: list, slave: int, address: int, write_type: str):
+        """
+        从起始地址连续写入多个线圈/保持寄存器，失败内部重试3次；无可用连接返回False交由调度层等待恢复
+        """
         try:
             retry = 0
             while retry < 3:
@@ -234,17 +301,17 @@ class ComponentOperationTaskManager(BasePollingTaskManager):
                     return False
 
                 if write_type == "coil":
-                    err = writer.write_coils(address, [value], slave=slave)
+                    err = writer.write_coils(address, list(values), slave=slave)
                 else:
                     # 保持寄存器确保为U16
-                    err = writer.write_registers(address, [to_u16(value)], slave=slave)
+                    err = writer.write_registers(address, [to_u16(v) for v in values], slave=slave)
 
                 # 检查写入结果，无错误则退出重试
                 if not err:
-                    # print(f"[ComponentOperationTask] INFO: Write success: {param.name}, addr {address}, value={value}")
+                    # print(f"[ComponentOperationTask] INFO: Write success: {label}, addr {address}, values={values}")
                     break
                 else:
-                    print(f"[ComponentOperationTask] WARNING: Write {write_type} failed: {param.name}, addr {address}, error: {err}")
+                    print(f"[ComponentOperationTask] WARNING: Write {write_type} failed: {label}, addr {address}, error: {err}")
                     if manager and hasattr(manager, "connection_lock"):
                         with manager.connection_lock:
                             manager.connected = False
@@ -254,7 +321,7 @@ class ComponentOperationTaskManager(BasePollingTaskManager):
                     retry += 1
                     time.sleep(1)
             else:
-                print(f"[ComponentOperationTask] ERROR: Write {write_type} failed after 3 retries: {param.name}, addr {address}")
+                print(f"[ComponentOperationTask] ERROR: Write {write_type} failed after 3 retries: {label}, addr {address}")
         finally:
             pass
 
@@ -6,6 +6,7 @@ import json
 import threading
 import time
 import os
+from itertools import repeat
 
 from cdu120kw.modbus_manager.batch_reader import ModbusBatchReader
 from cdu120kw.task.task_queue import BasePollingTaskManager
@@ -94,6 +95,21 @@ class RegisterMap:
         with self.lock:
             return self.registers.get(address)
 
+    def get_registers_at(self, addresses, default=0):
+        """
+        按地址序列批量读取寄存器，未读到的地址返回默认值
+        在锁内用 map 一次性取值，得到同一时刻的一致快照
+        """
+        with self.lock:
+            return list(map(self.registers.get, addresses, repeat(default, len(addresses))))
+
+    def get_coils_at(self, addresses, default=False):
+        """
+        按地址序列批量读取线圈，未读到的地址返回默认值
+        """
+        with self.lock:
+            return list(map(self.coils.get, addresses, repeat(default, len(addresses))))
+
 
 class MappingPollingTaskManager(BasePollingTaskManager):
     """